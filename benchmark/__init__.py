@@ -0,0 +1,22 @@
+from .benchmark_util import run_case, save_results, format_results
+from .point_util_benchmark import run_point_util_benchmarks
+from .geometry_benchmark import run_geometry_benchmarks, run_hdf5_benchmarks
+from .codec_benchmark import run_codec_benchmarks, CODECS
+from .startup_benchmark import run_startup_benchmark, STARTUP_BUDGET_SECONDS
+from .consistency_check import check_batch, check_generation, format_checks
+
+__all__ = [
+    "run_case",
+    "save_results",
+    "format_results",
+    "run_point_util_benchmarks",
+    "run_geometry_benchmarks",
+    "run_hdf5_benchmarks",
+    "run_codec_benchmarks",
+    "CODECS",
+    "run_startup_benchmark",
+    "STARTUP_BUDGET_SECONDS",
+    "check_batch",
+    "check_generation",
+    "format_checks"
+]
@@ -0,0 +1,64 @@
+import argparse
+import logging
+import sys
+
+from benchmark import run_point_util_benchmarks, run_geometry_benchmarks, run_hdf5_benchmarks, save_results, \
+    format_results, run_startup_benchmark, STARTUP_BUDGET_SECONDS, run_codec_benchmarks, CODECS, check_batch, \
+    check_generation, format_checks
+from strokes_generator import StrokesGenerator
+from utils import generate_point_util
+
+
+def get_config_densities(strokes_generator: StrokesGenerator) -> list[float]:
+    """
+    Get density values of all geometries config.
+    :param strokes_generator: Strokes generator.
+    :return: Sorted density values.
+    """
+    return sorted({strokes_generator.get_geometry(name).get_config()["density"]
+                   for name in strokes_generator.list_geometries_name()})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark point primitives, geometry handlers and hdf5 saving.")
+    parser.add_argument("--config", default="config.toml", help="config file path.")
+    parser.add_argument("--densities", type=float, nargs="*", help="density values (config densities if empty).")
+    parser.add_argument("--repeat", type=int, default=10, help="sample nums of each case.")
+    parser.add_argument("--seed", type=int, default=0, help="seed of random generator.")
+    parser.add_argument("--output", default=None, help="json result file path.")
+    parser.add_argument("--codecs", nargs="*", default=list(CODECS),
+                        help="hdf5 codecs (such as none, lzf, gzip-4 or gzip-1+shuffle).")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="row nums of each hdf5 chunk (auto if empty).")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="startup budget (in seconds) of StrokesGenerator, fail the run if it is exceeded.")
+    parser.add_argument("--checks-only", action="store_true", help="run the consistency checks only.")
+    args = parser.parse_args()
+
+    strokes_generator = StrokesGenerator(args.config)
+    logging.getLogger().setLevel(logging.WARNING)
+    checks = check_batch(strokes_generator, seed=args.seed)
+    checks += check_generation(strokes_generator, seed=args.seed)
+    print(format_checks(checks))
+    failed = [check["name"] for check in checks if not check["passed"]]
+    if failed:
+        sys.exit(f"consistency checks failed: {', '.join(failed)}.")
+    if args.checks_only:
+        sys.exit()
+    densities = args.densities if args.densities else get_config_densities(strokes_generator)
+
+    startup_result = run_startup_benchmark(args.config, args.repeat, args.startup_budget)
+    results = [startup_result]
+    results += run_point_util_benchmarks(densities, args.repeat, args.seed)
+    results += run_geometry_benchmarks(strokes_generator, densities, args.repeat, args.seed)
+    results += run_hdf5_benchmarks(strokes_generator, args.repeat, args.seed)
+    results += run_codec_benchmarks(strokes_generator, args.codecs, args.repeat, args.seed, chunk_rows=args.chunk_rows)
+
+    print(format_results(results))
+    print(f"bernstein cache: {generate_point_util.get_bernstein_cache_info()}")
+    if args.output is not None:
+        save_results(args.output, results)
+
+    print(f"startup: {startup_result['median_seconds']:.3f}s (budget: {args.startup_budget:.3f}s, "
+          f"lazy modules imported: {startup_result['lazy_modules_imported']})")
+    if not startup_result["passed"]:
+        sys.exit("startup budget exceeded.")
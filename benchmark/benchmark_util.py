@@ -0,0 +1,102 @@
+import json
+import os.path
+import platform
+import subprocess
+import time
+from typing import Callable, Any
+
+import numpy as np
+
+
+def run_case(
+        group: str,
+        name: str,
+        function: Callable[[], Any],
+        repeat: int = 10,
+        warmup: int = 1,
+        get_points: Callable[[Any], int] = len,
+        **params: Any
+) -> dict[str, Any]:
+    """
+    Time a benchmark case, and report samples/s and points/s.
+    :param group: Benchmark group.
+    :param name: Benchmark case name.
+    :param function: Function of one sample (called without arguments).
+    :param repeat: Timed call nums.
+    :param warmup: Untimed call nums before timing.
+    :param get_points: Get point nums of the function result.
+    :param params: Case params (such as density) reported with the result.
+    :return: Benchmark result.
+    """
+    for _ in range(0, warmup):
+        function()
+
+    points = 0
+    durations = []
+    for _ in range(0, repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+        points += get_points(result)
+
+    seconds = float(np.sum(durations))
+    return {
+        "group": group,
+        "name": name,
+        "params": params,
+        "samples": repeat,
+        "points": int(points),
+        "seconds": seconds,
+        "median_seconds": float(np.median(durations)),
+        "samples_per_second": repeat / seconds if seconds > 0 else float("inf"),
+        "points_per_second": points / seconds if seconds > 0 else float("inf")
+    }
+
+
+def get_environment() -> dict[str, Any]:
+    """
+    Get environment of the benchmark run (versions and git revision).
+    :return: Environment info.
+    """
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        revision = ""
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+
+def save_results(
+        file_path: str,
+        results: list[dict[str, Any]]
+) -> None:
+    """
+    Save benchmark results as json.
+    :param file_path: Json file path.
+    :param results: Benchmark results.
+    """
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump({"environment": get_environment(), "results": results}, file, indent=2)
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    """
+    Format benchmark results as text table.
+    :param results: Benchmark results.
+    :return: Text table.
+    """
+    lines = [f"{'group':<12}{'name':<40}{'params':<36}{'samples/s':>14}{'points/s':>16}{'MB/s':>10}{'ratio':>8}"]
+    for result in results:
+        params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        line = (f"{result['group']:<12}{result['name']:<40}{params:<36}"
+                f"{result['samples_per_second']:>14.1f}{result['points_per_second']:>16.1f}")
+        if "compression_ratio" in result:
+            line += f"{result['bytes_per_second'] / 1e6:>10.1f}{result['compression_ratio']:>8.2f}"
+        lines.append(line)
+    return "\n".join(lines)
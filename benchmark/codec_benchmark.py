@@ -0,0 +1,110 @@
+import os.path
+import tempfile
+import time
+from typing import Any
+
+import h5py
+import numpy as np
+
+from strokes_generator import StrokesGenerator
+from utils import hdf5_util
+from utils.hdf5_util import Codec
+
+CODECS = ("none", "lzf", "lzf+shuffle", "gzip-1", "gzip-1+shuffle", "gzip-4", "gzip-4+shuffle", "gzip-9")
+
+
+def _get_result_(
+        name: str,
+        codec: Codec,
+        output_format: str,
+        samples: int,
+        points: int,
+        raw_bytes: int,
+        seconds: float,
+        file_bytes: int,
+        storage_bytes: int
+) -> dict[str, Any]:
+    """
+    Get codec benchmark result.
+    :param name: Benchmark case name ('write' or 'read').
+    :param codec: Dataset codec.
+    :param output_format: Output format ('file' or 'shard').
+    :param samples: Sample nums.
+    :param points: Point nums.
+    :param raw_bytes: Uncompressed data bytes.
+    :param seconds: Duration of all samples.
+    :param file_bytes: Bytes of hdf5 files (with metadata).
+    :param storage_bytes: Stored bytes of datasets.
+    :return: Benchmark result.
+    """
+    return {
+        "group": "codec",
+        "name": name,
+        "params": {"codec": str(codec), "format": output_format},
+        "samples": samples,
+        "points": points,
+        "seconds": seconds,
+        "median_seconds": seconds / samples,
+        "samples_per_second": samples / seconds if seconds > 0 else float("inf"),
+        "points_per_second": points / seconds if seconds > 0 else float("inf"),
+        "bytes_per_second": raw_bytes / seconds if seconds > 0 else float("inf"),
+        "file_bytes": file_bytes,
+        "compression_ratio": raw_bytes / file_bytes if file_bytes > 0 else float("inf"),
+        "storage_ratio": raw_bytes / storage_bytes if storage_bytes > 0 else float("inf")
+    }
+
+
+def run_codec_benchmarks(
+        strokes_generator: StrokesGenerator,
+        codecs: list[str] = CODECS,
+        repeat: int = 20,
+        seed: int = 0,
+        geometry_name: str = "cuboid",
+        chunk_rows: int = None
+) -> list[dict[str, Any]]:
+    """
+    Benchmark write and read throughput (of raw bytes) and compression ratio of each codec with generated samples,
+    saved as one file each sample and as one shard.
+    :param strokes_generator: Strokes generator (with loaded geometries).
+    :param codecs: Codec texts (such as 'none', 'lzf', 'gzip-4' or 'gzip-1+shuffle').
+    :param repeat: Sample nums of each case.
+    :param seed: Seed of random generator.
+    :param geometry_name: Geometry of saved samples.
+    :param chunk_rows: Row nums of each chunk (auto if None).
+    :return: Benchmark results.
+    """
+    rng = np.random.default_rng(seed)
+    samples = [strokes_generator.get_strokes_datas(strokes_generator.get_geometry_strokes(geometry_name, rng=rng))
+               for _ in range(0, repeat)]
+    points = sum(len(datas[0]) for datas, _, _ in samples)
+    raw_bytes = sum(np.asarray(data, dtype=dtype).nbytes
+                    for datas, _, dtypes in samples for data, dtype in zip(datas, dtypes))
+
+    results = []
+    for text in codecs:
+        codec = Codec.parse(text, chunk_rows)
+        for output_format in ("file", "shard"):
+            with tempfile.TemporaryDirectory() as directory_path:
+                output_path = os.path.join(directory_path, "output")
+                start = time.perf_counter()
+                with hdf5_util.get_writer(output_format, output_path, shard_size=repeat, codec=codec) as writer:
+                    for i, (datas, data_names, dtypes) in enumerate(samples):
+                        writer.write(datas, data_names, dtypes, str(i + 1))
+                write_seconds = time.perf_counter() - start
+
+                file_paths = [os.path.join(output_path, file_name) for file_name in os.listdir(output_path)]
+                file_bytes = sum(os.path.getsize(file_path) for file_path in file_paths)
+                storage_bytes = 0
+                start = time.perf_counter()
+                for file_path in file_paths:
+                    with h5py.File(file_path, "r") as file:
+                        for data_name in samples[0][1]:
+                            dataset = file[data_name]
+                            dataset[()]
+                            storage_bytes += dataset.id.get_storage_size()
+                read_seconds = time.perf_counter() - start
+
+                for name, seconds in (("write", write_seconds), ("read", read_seconds)):
+                    results.append(_get_result_(name, codec, output_format, repeat, points, raw_bytes, seconds,
+                                                file_bytes, storage_bytes))
+    return results
@@ -0,0 +1,209 @@
+import glob
+import json
+import os.path
+import tempfile
+from typing import Any
+
+import numpy as np
+
+from geometry import BaseGeometryHandler
+from strokes_generator import StrokesGenerator
+from utils import generate_point_util, hdf5_util, manifest_util
+
+# axis orders of batched curves (cone and pyramid sort along (2, 1, 0))
+SORT_AXIS_ARRS = ((0, 1, 2), (2, 1, 0))
+STATS_TOLERANCE = 0.05
+
+
+def get_check_result(
+        name: str,
+        passed: bool,
+        detail: str = "",
+        **params: Any
+) -> dict[str, Any]:
+    """
+    Get result of a consistency check.
+    :param name: Check name.
+    :param passed: Whether the check is passed.
+    :param detail: Detail of the check (such as compared values).
+    :param params: Check params reported with the result.
+    :return: Check result.
+    """
+    return {"group": "check", "name": name, "params": params, "passed": bool(passed), "detail": detail}
+
+
+def format_checks(results: list[dict[str, Any]]) -> str:
+    """
+    Format consistency check results as text table.
+    :param results: Check results.
+    :return: Text table.
+    """
+    lines = [f"{'check':<40}{'params':<36}{'result':<8}detail"]
+    for result in results:
+        params = ", ".join(f"{key}={value}" for key, value in result["params"].items())
+        lines.append(f"{result['name']:<40}{params:<36}{'pass' if result['passed'] else 'FAIL':<8}{result['detail']}")
+    return "\n".join(lines)
+
+
+def _get_strokes_stats_(strokes_list: list) -> dict[str, float]:
+    """
+    Get mean shape stats of strokes: point nums, stroke nums, max distance between adjacent points inside one stroke,
+    and size (bounding box diagonal) and height of points.
+    :param strokes_list: Strokes list.
+    :return: Mean stats.
+    """
+    stats = {"points": [], "strokes": [], "max jump": [], "size": [], "height": []}
+    for strokes in strokes_list:
+        value = strokes.get_value()
+        distances = np.linalg.norm(np.diff(value[:, 0: 3], axis=0), axis=1)
+        same_stroke = value[1:, 3] == value[:-1, 3]
+        extent = value[:, 0: 3].max(axis=0) - value[:, 0: 3].min(axis=0)
+        stats["points"].append(len(value))
+        stats["strokes"].append(len(np.unique(value[:, 3])))
+        stats["max jump"].append(distances[same_stroke].max() if same_stroke.any() else 0.0)
+        stats["size"].append(np.linalg.norm(extent))
+        stats["height"].append(extent[2])
+    return {key: float(np.mean(values)) for key, values in stats.items()}
+
+
+def check_batch(
+        strokes_generator: StrokesGenerator,
+        k: int = 1000,
+        seed: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Check that the batched control point sort is the same as sort_points3d, and that generate_batch(k) of every
+    geometry handler overriding it is equivalent in distribution (mean shape stats within tolerance) to k calls of
+    generate_strokes with a fixed seed.
+    :param strokes_generator: Strokes generator (with loaded geometries).
+    :param k: Sample (and control point group) nums.
+    :param seed: Seed of random generator.
+    :return: Check results.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for axis_arr in SORT_AXIS_ARRS:
+        points = rng.uniform(-1, 1, (k, 3, 3))
+        reverse_arr = rng.uniform(size=(k, 3)) < 0.5
+        batch = generate_point_util.sort_points3d_batch(points, axis_arr, reverse_arr)
+        mismatches = sum(not np.array_equal(batch[i], generate_point_util.sort_points3d(points[i], axis_arr,
+                                                                                       tuple(reverse_arr[i])))
+                         for i in range(0, k))
+        results.append(get_check_result("sort_points3d_batch", mismatches == 0, f"{mismatches} mismatches",
+                                        axis_arr=axis_arr))
+
+    for name in strokes_generator.list_geometries_name():
+        geometry = strokes_generator.get_geometry(name)
+        if type(geometry).generate_batch is BaseGeometryHandler.generate_batch:
+            continue
+        geometry.compile()
+        batch_stats = _get_strokes_stats_(geometry.generate_batch(k, np.random.default_rng(seed)).to_strokes_list())
+        strokes_rng = np.random.default_rng(seed)
+        strokes_stats = _get_strokes_stats_([geometry.generate_strokes(strokes_rng) for _ in range(0, k)])
+        differences = {key: abs(batch_stats[key] - value) / value if value > 0 else abs(batch_stats[key])
+                       for key, value in strokes_stats.items()}
+        worst = max(differences, key=differences.get)
+        results.append(get_check_result(f"{name} generate_batch", differences[worst] <= STATS_TOLERANCE,
+                                        f"max difference {differences[worst]:.1%} ({worst}: {batch_stats[worst]:.3f} "
+                                        f"vs {strokes_stats[worst]:.3f})", k=k))
+    return results
+
+
+def _get_checksums_(directory_path: str) -> dict[str, str]:
+    """
+    Get checksum of each hdf5 file of output directory.
+    :param directory_path: Output directory path.
+    :return: Dict of file name -> checksum.
+    """
+    return {os.path.basename(file_path): manifest_util.get_file_checksum(file_path)
+            for file_path in glob.glob(os.path.join(directory_path, "*.hdf5"))}
+
+
+def _get_index_(entries: list[dict[str, Any]]) -> list[tuple]:
+    """
+    Get the (id, count, file, checksum) of manifest entries in the order of sample id.
+    :param entries: Manifest entries.
+    :return: Sorted entry index.
+    """
+    return sorted((entry["id"], entry["count"], entry["file"], entry["checksum"]) for entry in entries)
+
+
+def _tear_manifest_(directory_path: str) -> dict[str, Any]:
+    """
+    Simulate a crash while appending the last manifest entry: the last line is partially written and the file of
+    it is truncated.
+    :param directory_path: Output directory path.
+    :return: The torn entry.
+    """
+    manifest_path = manifest_util.get_manifest_path(directory_path)
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        lines = file.read().splitlines(keepends=True)
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        file.write("".join(lines[:-1]) + lines[-1][: len(lines[-1]) // 2])
+    entry = json.loads(lines[-1])
+    file_path = os.path.join(directory_path, entry["file"])
+    with open(file_path, "r+b") as file:
+        file.truncate(os.path.getsize(file_path) // 2)
+    return entry
+
+
+def check_generation(
+        strokes_generator: StrokesGenerator,
+        geometry_name: str = "cone",
+        count: int = 40,
+        chunk_size: int = 8,
+        seed: int = 0,
+        workers: int = 2,
+        node_count: int = 3
+) -> list[dict[str, Any]]:
+    """
+    Check generate_dataset of each output format against a serial single-node run with the same seed:
+    a parallel run gives byte-equal files, a resumed run after a torn manifest line (and a truncated file)
+    regenerates only that file and gives byte-equal files, and merged node manifests give the same dataset index.
+    :param strokes_generator: Strokes generator (with loaded geometries).
+    :param geometry_name: Geometry of dataset.
+    :param count: Sample nums of dataset.
+    :param chunk_size: Sample nums of each chunk (and shard).
+    :param seed: Base seed of dataset.
+    :param workers: Worker process nums of parallel run.
+    :param node_count: Node nums of multi-node run.
+    :return: Check results.
+    """
+    results = []
+    for output_format in hdf5_util.OUTPUT_FORMATS:
+        with tempfile.TemporaryDirectory() as directory_path:
+            def generate(name: str, **options: Any) -> dict[str, int]:
+                options = {"workers": 1, "seed": seed, **options}
+                return strokes_generator.generate_dataset(geometry_name, count, os.path.join(directory_path, name),
+                                                          chunk_size=chunk_size, output_format=output_format,
+                                                          shard_size=chunk_size, **options)
+
+            generate("serial")
+            serial_path = os.path.join(directory_path, "serial")
+            checksums = _get_checksums_(serial_path)
+            index = _get_index_(manifest_util.load_manifest(serial_path))
+
+            generate("parallel", workers=workers)
+            parallel_checksums = _get_checksums_(os.path.join(directory_path, "parallel"))
+            results.append(get_check_result("serial vs parallel", parallel_checksums == checksums,
+                                            f"{len(checksums)} files", format=output_format, workers=workers))
+
+            generate("resume")
+            resume_path = os.path.join(directory_path, "resume")
+            torn = _tear_manifest_(resume_path)
+            stats = generate("resume", seed=None)
+            resumed = _get_index_(manifest_util.load_manifest(resume_path))
+            passed = (stats["samples"] == torn["count"] and _get_checksums_(resume_path) == checksums
+                      and resumed == index)
+            results.append(get_check_result("resume after torn manifest line", passed,
+                                            f"{stats['samples']} regenerated, {stats['skipped']} skipped",
+                                            format=output_format))
+
+            for node_id in range(0, node_count):
+                generate("nodes", node_id=node_id, node_count=node_count)
+            nodes_path = os.path.join(directory_path, "nodes")
+            merged = _get_index_(manifest_util.merge_manifests([nodes_path], nodes_path, count))
+            passed = merged == index and _get_checksums_(nodes_path) == checksums
+            results.append(get_check_result("merge vs single-node", passed, f"{len(merged)} entries",
+                                            format=output_format, nodes=node_count))
+    return results
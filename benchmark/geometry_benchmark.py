@@ -0,0 +1,102 @@
+import os.path
+import tempfile
+from typing import Any
+
+import numpy as np
+
+from benchmark.benchmark_util import run_case
+from strokes_generator import StrokesGenerator
+from utils import hdf5_util
+
+
+def run_geometry_benchmarks(
+        strokes_generator: StrokesGenerator,
+        densities: list[float],
+        repeat: int = 10,
+        seed: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Benchmark generate_strokes of every geometry handler of each density.
+    :param strokes_generator: Strokes generator (with loaded geometries).
+    :param densities: Density values.
+    :param repeat: Sample nums of each case.
+    :param seed: Seed of random generator.
+    :return: Benchmark results.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for name in strokes_generator.list_geometries_name():
+        geometry = strokes_generator.get_geometry(name)
+        config_density = geometry.get_config()["density"]
+        try:
+            for density in densities:
+                geometry.set_config({"density": density})
+                geometry.compile()
+                results.append(run_case("geometry", name, lambda: geometry.generate_strokes(rng), repeat,
+                                        get_points=lambda strokes: len(strokes.get_value()), density=density))
+        finally:
+            geometry.set_config({"density": config_density})
+            geometry.compile()
+    return results
+
+
+def run_hdf5_benchmarks(
+        strokes_generator: StrokesGenerator,
+        repeat: int = 20,
+        seed: int = 0,
+        geometry_name: str = "cuboid"
+) -> list[dict[str, Any]]:
+    """
+    Benchmark the hdf5 save path (one file each sample and shard) and the shard read path (gzip shard and
+    memory-mapped ragged shard) with generated samples.
+    :param strokes_generator: Strokes generator (with loaded geometries).
+    :param repeat: Sample nums of each case.
+    :param seed: Seed of random generator.
+    :param geometry_name: Geometry of saved samples.
+    :return: Benchmark results.
+    """
+    rng = np.random.default_rng(seed)
+    samples = [strokes_generator.get_strokes_datas(strokes_generator.get_geometry_strokes(geometry_name, rng=rng))
+               for _ in range(0, repeat)]
+    results = []
+    with tempfile.TemporaryDirectory() as directory_path:
+        file_writer = hdf5_util.FileWriter(os.path.join(directory_path, "file"))
+        shard_writer = hdf5_util.ShardWriter(os.path.join(directory_path, "shard"), shard_size=repeat)
+        file_index = iter(range(0, repeat + 1))
+        shard_index = iter(range(0, repeat))
+
+        def write_file() -> int:
+            """
+            Save next sample as one file.
+            :return: Point nums of sample.
+            """
+            i = next(file_index)
+            datas = samples[i % repeat]
+            file_writer.write(*datas, file_name=str(i + 1))
+            return len(datas[0][0])
+
+        def write_shard() -> int:
+            """
+            Append next sample into shard (the shard is saved with the last sample).
+            :return: Point nums of sample.
+            """
+            i = next(shard_index)
+            shard_writer.write(*samples[i], file_name=str(i + 1))
+            return len(samples[i][0][0])
+
+        results.append(run_case("hdf5", "save_file", write_file, repeat, get_points=int, geometry=geometry_name))
+        results.append(run_case("hdf5", "shard_writer", write_shard, repeat, warmup=0, get_points=int,
+                                geometry=geometry_name))
+
+        with hdf5_util.RaggedWriter(os.path.join(directory_path, "ragged"), shard_size=repeat) as ragged_writer:
+            for i, datas in enumerate(samples):
+                ragged_writer.write(*datas, file_name=str(i + 1))
+        with hdf5_util.read_file(shard_writer.get_shard_path(0)) as shard_file, \
+                hdf5_util.RaggedReader(ragged_writer.get_shard_path(0)) as ragged_reader:
+            shard_read_index = iter(range(0, repeat + 1))
+            ragged_read_index = iter(range(0, repeat + 1))
+            results.append(run_case("hdf5", "shard_read", lambda: hdf5_util.get_shard_value_2ndarray(
+                shard_file, next(shard_read_index) % repeat), repeat, geometry=geometry_name))
+            results.append(run_case("hdf5", "ragged_read", lambda: ragged_reader.get_value(
+                next(ragged_read_index) % repeat), repeat, geometry=geometry_name))
+    return results
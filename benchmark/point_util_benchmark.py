@@ -0,0 +1,55 @@
+from typing import Any
+
+import numpy as np
+
+from benchmark.benchmark_util import run_case
+from utils import generate_point_util
+
+ENDPOINTS = (np.array([0.0, 0.0, 0.0]), np.array([80.0, 40.0, 30.0]))
+BATCH_NUMS = 64
+CONTROL_POINTS = np.array([[80.0, 40.0, 30.0], [70.0, 20.0, 25.0], [40.0, 30.0, 10.0], [20.0, 5.0, 8.0], [0.0, 0.0, 0.0]])
+
+
+def run_point_util_benchmarks(
+        densities: list[float],
+        repeat: int = 20,
+        seed: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Benchmark generate_point_util primitives of each density.
+    :param densities: Density values.
+    :param repeat: Call nums of each case.
+    :param seed: Seed of random generator.
+    :return: Benchmark results.
+    """
+    rng = np.random.default_rng(seed)
+    results = []
+    for density in densities:
+        t_nums = int(generate_point_util.get_point_distance_3d(ENDPOINTS) / density)
+        t_arr = np.linspace(0.0, 1.0, t_nums)
+        dither_points = generate_point_util.get_bezier_curve3d(CONTROL_POINTS, t_arr, rng=rng)
+        cases = {
+            "get_curve3d": lambda: generate_point_util.get_curve3d(
+                endpoints=ENDPOINTS, density=density, equinox_range=(0.3, 0.7), endpoint_dithering=(0, 3),
+                point_dithering=(0, 0.2), rng=rng),
+            "get_bezier_curve3d": lambda: generate_point_util.get_bezier_curve3d(
+                CONTROL_POINTS, t_arr, dithering=(0, 0.2), rng=rng),
+            "get_bezier_curve3d(cached basis)": lambda: generate_point_util.get_bezier_curve3d(
+                CONTROL_POINTS, t_nums, dithering=(0, 0.2), rng=rng),
+            "get_bezier_curve3d(uniform_velocity)": lambda: generate_point_util.get_bezier_curve3d(
+                CONTROL_POINTS, t_arr, dithering=(0, 0.2), uniform_velocity=True, rng=rng),
+            "get_vertical_arc": lambda: generate_point_util.get_vertical_arc(
+                density=density, r_range=(10, 30), th_degree_range=(20, 90), point_dithering=(0, 0.2), rng=rng),
+            "get_ellipse_curve3d": lambda: generate_point_util.get_ellipse_curve3d(
+                a_range=(20, 50), b_range=(10, 30), density=density, point_dithering=(0, 0.2), rng=rng),
+            f"get_vertical_arcs(x{BATCH_NUMS})": lambda: generate_point_util.get_vertical_arcs(
+                BATCH_NUMS, density=density, r_range=(10, 30), th_degree_range=(20, 90), point_dithering=(0, 0.2),
+                rng=rng),
+            f"get_ellipse_curves3d(x{BATCH_NUMS})": lambda: generate_point_util.get_ellipse_curves3d(
+                BATCH_NUMS, a_range=(20, 50), b_range=(10, 30), density=density, point_dithering=(0, 0.2), rng=rng),
+            "dither_points3d": lambda: generate_point_util.dither_points3d(dither_points, (0, 0.2), rng=rng)
+        }
+        for name, function in cases.items():
+            get_points = (lambda result: len(result[0])) if name.endswith(f"(x{BATCH_NUMS})") else len
+            results.append(run_case("point_util", name, function, repeat, get_points=get_points, density=density))
+    return results
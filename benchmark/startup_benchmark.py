@@ -0,0 +1,64 @@
+import json
+import os.path
+import subprocess
+import sys
+from typing import Any
+
+import numpy as np
+
+STARTUP_BUDGET_SECONDS = 0.5
+LAZY_MODULES = ("matplotlib", "mpl_toolkits")
+
+_STARTUP_SCRIPT_ = """
+import json, sys, time
+start = time.perf_counter()
+from strokes_generator import StrokesGenerator
+imported = time.perf_counter()
+StrokesGenerator(sys.argv[1])
+loaded = time.perf_counter()
+print(json.dumps({"import": imported - start, "startup": loaded - start,
+                  "modules": [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+
+def run_startup_benchmark(
+        config_file_path: str = "config.toml",
+        repeat: int = 5,
+        budget: float = STARTUP_BUDGET_SECONDS
+) -> dict[str, Any]:
+    """
+    Time StrokesGenerator import and startup (with config loaded) in fresh interpreters, as a worker process pays it.
+    The budget is passed only if the median startup is within it and no lazy (plotting) module is imported.
+    :param config_file_path: Config file path.
+    :param repeat: Interpreter nums.
+    :param budget: Startup budget (in seconds).
+    :return: Benchmark result.
+    """
+    root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    import_durations = []
+    startup_durations = []
+    modules = set()
+    for _ in range(0, repeat):
+        output = subprocess.run([sys.executable, "-c", _STARTUP_SCRIPT_, os.path.abspath(config_file_path),
+                                 *LAZY_MODULES],
+                                capture_output=True, text=True, check=True, cwd=root_path).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        import_durations.append(result["import"])
+        startup_durations.append(result["startup"])
+        modules.update(result["modules"])
+
+    median_seconds = float(np.median(startup_durations))
+    return {
+        "group": "startup",
+        "name": "StrokesGenerator",
+        "params": {"budget": budget},
+        "samples": repeat,
+        "points": 0,
+        "seconds": float(np.sum(startup_durations)),
+        "median_seconds": median_seconds,
+        "median_import_seconds": float(np.median(import_durations)),
+        "samples_per_second": 1 / median_seconds if median_seconds > 0 else float("inf"),
+        "points_per_second": 0.0,
+        "lazy_modules_imported": sorted(modules),
+        "passed": median_seconds <= budget and len(modules) == 0
+    }
@@ -1,8 +1,11 @@
 from typing import Tuple
 
+import numpy as np
+from numpy.random import Generator
+
 from geometry import BaseGeometryHandler
-from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from meta import Strokes, BuiltinGeometry, StrokesBatch
+from utils import generate_point_util, random_util
 
 
 class ConeHandler(BaseGeometryHandler):
@@ -34,39 +37,84 @@ class ConeHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Cone
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate cone strokes.
-        :return: Cone strokes.
+        Generate cone strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed cone strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        point1 = generate_point_util.get_point3d(x_range=self.radius_range, z=0, y=0)
+        with self.trace_stage("sample"):
+            point1 = generate_point_util.get_point3d(x_range=self.radius_range, z=0, y=0, rng=rng)
+            point2 = -point1
+            peak = generate_point_util.get_point3d(x=0, z=0, y_range=self.height_range,
+                                                   dithering=self.endpoint_dithering, rng=rng)
+        with self.trace_stage("curve"):
+            line_axis_arr = (2, 1, 0)
+            line1 = generate_point_util.get_line3d(
+                endpoints=(point1, peak),
+                density=self.density,
+                axis_arr=line_axis_arr,
+                equinox_range=self.equinox_range,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
+            line2 = generate_point_util.get_line3d(
+                endpoints=(point2, peak),
+                density=self.density,
+                axis_arr=line_axis_arr,
+                equinox_range=self.equinox_range,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
+
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                line1, line2
+            )
+        return strokes
+
+    def generate_batch(
+            self,
+            k: int,
+            rng: Generator = None
+    ) -> StrokesBatch:
+        """
+        Generate batch of cone strokes with array operations.
+        :param k: Strokes nums.
+        :param rng: Random generator of batch.
+        :return: Cone strokes batch.
+        """
+        rng = random_util.get_generator(rng)
+
+        # generate
+        point1 = generate_point_util.get_points3d(k, x_range=self.radius_range, z=0, y=0, rng=rng)
         point2 = -point1
-        peak = generate_point_util.get_point3d(x=0, z=0, y_range=self.height_range, dithering=self.endpoint_dithering)
+        peak = generate_point_util.get_points3d(k, x=0, z=0, y_range=self.height_range,
+                                                dithering=self.endpoint_dithering, rng=rng)
         line_axis_arr = (2, 1, 0)
-        line1 = generate_point_util.get_line3d(
-            endpoints=(point1, peak),
-            density=self.density,
-            axis_arr=line_axis_arr,
-            equinox_range=self.equinox_range,
-            point_dithering=self.point_dithering
-        )
-        line2 = generate_point_util.get_line3d(
-            endpoints=(point2, peak),
+        points, offsets = generate_point_util.get_curves3d(
+            endpoints=(np.stack((point1, point2), axis=1).reshape(-1, 3), np.repeat(peak, 2, axis=0)),
             density=self.density,
             axis_arr=line_axis_arr,
             equinox_range=self.equinox_range,
-            point_dithering=self.point_dithering
+            point_dithering=self.point_dithering,
+            rng=rng
         )
 
         # transform
-        return Strokes.load_points(
-            line1, line2
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
+        return StrokesBatch.load_points(
+            points, offsets, np.full(k, 2)
+        ).transform_points3d(
+            degree_range=self.plane_rotate_degree_range,
             dx_range=self.move_plane_range,
             dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
+            dy_range=self.move_y_range,
+            rng=rng
         )
@@ -1,11 +1,11 @@
-import random
 from typing import Tuple
 
 from numpy import ndarray
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler
 from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from utils import generate_point_util, random_util
 
 
 class CuboidHandler(BaseGeometryHandler):
@@ -43,69 +43,77 @@ class CuboidHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Cuboid
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate cuboid strokes.
-        :return: Cuboid strokes.
+        Generate cuboid strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed cuboid strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        dx = [1, -1, -1, 1]
-        dz = [1, 1, -1, -1]
-        top_line_axis = ((0, 1, 2), (1, 0, 2))
-        point = generate_point_util.get_point3d(
-            x_range=self.point_plane_range,
-            z_range=self.point_plane_range,
-            y_range=self.height_range
-        )
+        with self.trace_stage("sample"):
+            dx = [1, -1, -1, 1]
+            dz = [1, 1, -1, -1]
+            top_line_axis = ((0, 1, 2), (1, 0, 2))
+            point = generate_point_util.get_point3d(
+                x_range=self.point_plane_range,
+                z_range=self.point_plane_range,
+                y_range=self.height_range,
+                rng=rng
+            )
 
-        endpoints = [generate_point_util.get_point3d(
-            x=float(dx[i] * point[0]),
-            z=float(dz[i] * point[1]),
-            y=float(point[2]),
-            dithering=self.endpoint_dithering
-        ) for i in range(0, 4)]
+            endpoints = [generate_point_util.get_point3d(
+                x=float(dx[i] * point[0]),
+                z=float(dz[i] * point[1]),
+                y=float(point[2]),
+                dithering=self.endpoint_dithering,
+                rng=rng
+            ) for i in range(0, 4)]
 
-        top_line = [generate_point_util.get_line3d(
-            endpoints=(endpoints[i], endpoints[(i + 1) % 4]),
-            density=self.density,
-            axis_arr=top_line_axis[i % 2],
-            equinox_range=self.equinox_range,
-            point_dithering=self.point_dithering
-        ) for i in range(0, 4)]
-        top_line = generate_point_util.concatenate_points(*tuple(top_line))
-
-        vertical_nums = random.randint(0, 4)
-        if vertical_nums == 0:
-            index = random.randint(0, 3)
-            vertical_lines = [generate_point_util.get_vertical_line3d_by_endpoint(
-                endpoint=endpoints[index],
-                bottom_y_range=self.bottom_y_range,
-                density=self.density,
-                equinox_range=self.equinox_range,
-                endpoint_dithering=self.endpoint_dithering,
-                point_dithering=self.point_dithering
-            )]
-        else:
-            vertical_lines = [generate_point_util.get_vertical_line3d_by_line(
+        with self.trace_stage("curve"):
+            top_line = [generate_point_util.get_line3d(
                 endpoints=(endpoints[i], endpoints[(i + 1) % 4]),
-                bottom_y_range=self.bottom_y_range,
-                degree_range=self.dip_degree_range,
                 density=self.density,
-                endpoint_equinox_range=self.endpoint_equinox_range,
+                axis_arr=top_line_axis[i % 2],
                 equinox_range=self.equinox_range,
-                endpoint_dithering=self.endpoint_dithering,
-                point_dithering=self.point_dithering
-            ) for i in range(0, vertical_nums)]
+                point_dithering=self.point_dithering,
+                rng=rng
+            ) for i in range(0, 4)]
+            top_line = generate_point_util.concatenate_points(*tuple(top_line))
+
+            vertical_nums = int(rng.integers(0, 4, endpoint=True))
+            if vertical_nums == 0:
+                index = int(rng.integers(0, 3, endpoint=True))
+                vertical_lines = [generate_point_util.get_vertical_line3d_by_endpoint(
+                    endpoint=endpoints[index],
+                    bottom_y_range=self.bottom_y_range,
+                    density=self.density,
+                    equinox_range=self.equinox_range,
+                    endpoint_dithering=self.endpoint_dithering,
+                    point_dithering=self.point_dithering,
+                    rng=rng
+                )]
+            else:
+                vertical_lines = [generate_point_util.get_vertical_line3d_by_line(
+                    endpoints=(endpoints[i], endpoints[(i + 1) % 4]),
+                    bottom_y_range=self.bottom_y_range,
+                    degree_range=self.dip_degree_range,
+                    density=self.density,
+                    endpoint_equinox_range=self.endpoint_equinox_range,
+                    equinox_range=self.equinox_range,
+                    endpoint_dithering=self.endpoint_dithering,
+                    point_dithering=self.point_dithering,
+                    rng=rng
+                ) for i in range(0, vertical_nums)]
 
-        # transform
-        return Strokes.load_points(
-            top_line,
-            *tuple(vertical_lines)
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
-            dx_range=self.move_plane_range,
-            dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
-        )
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                top_line,
+                *tuple(vertical_lines)
+            )
+        return strokes
@@ -1,8 +1,10 @@
 from typing import Tuple
 
+from numpy.random import Generator
+
 from geometry import BaseGeometryHandler
 from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from utils import generate_point_util, random_util
 
 
 class CylinderHandler(BaseGeometryHandler):
@@ -40,37 +42,41 @@ class CylinderHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Cylinder
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate cylinder strokes.
-        :return: Cylinder strokes.
+        Generate cylinder strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed cylinder strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        ellipse = generate_point_util.get_ellipse_curve3d(
-            a_range=self.a_range,
-            b_range=self.b_range,
-            y_range=self.height_range,
-            density=self.density,
-            point_dithering=self.point_dithering
-        )
-        line = generate_point_util.get_vertical_line3d_by_curve(
-            points=ellipse,
-            bottom_y_range=self.bottom_y_range,
-            degree_range=self.dip_degree_range,
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
+        with self.trace_stage("curve"):
+            ellipse = generate_point_util.get_ellipse_curve3d(
+                a_range=self.a_range,
+                b_range=self.b_range,
+                y_range=self.height_range,
+                density=self.density,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
+            line = generate_point_util.get_vertical_line3d_by_curve(
+                points=ellipse,
+                bottom_y_range=self.bottom_y_range,
+                degree_range=self.dip_degree_range,
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        # transform
-        return Strokes.load_points(
-            ellipse, line
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
-            dx_range=self.move_plane_range,
-            dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
-        )
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                ellipse, line
+            )
+        return strokes
@@ -1,13 +1,12 @@
 import math
-import random
 from typing import Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler
 from meta import FreeformStrokes, BuiltinGeometry
-from utils import generate_point_util
+from utils import generate_point_util, random_util
 
 
 class FreeformHandler(BaseGeometryHandler):
@@ -49,79 +48,87 @@ class FreeformHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Freeform
 
-    def generate_strokes(self) -> FreeformStrokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> FreeformStrokes:
         """
-        Generate freeform strokes.
-        :return: Freeform strokes.
+        Generate freeform strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed freeform strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        endpoint_nums = random.randint(*self.point_num_range)
-        height = random.uniform(*self.height_range)
-        top_endpoints = np.array([generate_point_util.get_point3d(
-            x_range=self.point_plane_range,
-            z_range=self.point_plane_range,
-            y=height
-        ) for _ in range(0, endpoint_nums)])
-        mean_top_points = np.array([np.mean(top_endpoints[:, 0]), np.mean(top_endpoints[:, 1]), 0])
-        top_endpoints -= mean_top_points
-        top_endpoints = list(top_endpoints)
-        top_endpoints.sort(key=lambda p: math.atan2(p[1], p[0]))
-        top_endpoints = np.array(top_endpoints)
+        with self.trace_stage("sample"):
+            endpoint_nums = int(rng.integers(*self.point_num_range, endpoint=True))
+            height = rng.uniform(*self.height_range)
+            top_endpoints = np.array([generate_point_util.get_point3d(
+                x_range=self.point_plane_range,
+                z_range=self.point_plane_range,
+                y=height,
+                rng=rng
+            ) for _ in range(0, endpoint_nums)])
+            mean_top_points = np.array([np.mean(top_endpoints[:, 0]), np.mean(top_endpoints[:, 1]), 0])
+            top_endpoints -= mean_top_points
+            top_endpoints = list(top_endpoints)
+            top_endpoints.sort(key=lambda p: math.atan2(p[1], p[0]))
+            top_endpoints = np.array(top_endpoints)
 
-        top_points = []
-        top_points_types = []
-        endpoint_ditherings = [self.curve_endpoint_dithering, self.line_endpoint_dithering]
-        for i in range(0, endpoint_nums):
-            line_type = 0 if random.uniform(0, 1) <= self.curve_poss else 1
-            points = generate_point_util.get_curve3d(
-                endpoints=(top_endpoints[i], top_endpoints[(i + 1) % endpoint_nums]),
-                density=self.density,
-                equinox_range=self.equinox_range,
-                endpoint_dithering=endpoint_ditherings[line_type],
-                point_dithering=self.point_dithering
-            )
-            point_list = list(points)
-            top_points.extend(point_list)
-            top_points_types.extend([(line_type + 1) if j != 0 else 0 for j, _ in enumerate(points)])
+        with self.trace_stage("curve"):
+            top_points = []
+            top_points_types = []
+            endpoint_ditherings = [self.curve_endpoint_dithering, self.line_endpoint_dithering]
+            for i in range(0, endpoint_nums):
+                line_type = 0 if rng.uniform(0, 1) <= self.curve_poss else 1
+                points = generate_point_util.get_curve3d(
+                    endpoints=(top_endpoints[i], top_endpoints[(i + 1) % endpoint_nums]),
+                    density=self.density,
+                    equinox_range=self.equinox_range,
+                    endpoint_dithering=endpoint_ditherings[line_type],
+                    point_dithering=self.point_dithering,
+                    rng=rng
+                )
+                point_list = list(points)
+                top_points.extend(point_list)
+                top_points_types.extend([(line_type + 1) if j != 0 else 0 for j, _ in enumerate(points)])
 
-        top_points = np.array(top_points)
+            top_points = np.array(top_points)
 
-        top_endpoints_index = []
-        for i, v in enumerate(top_points_types):
-            if v == 0:
-                top_endpoints_index.append(i)
+            top_endpoints_index = []
+            for i, v in enumerate(top_points_types):
+                if v == 0:
+                    top_endpoints_index.append(i)
 
-        vertical_nums = random.randint(0, endpoint_nums)
-        if vertical_nums == 0:
-            vert_points = [generate_point_util.get_vertical_line3d_by_endpoint(
-                endpoint=top_endpoints[top_endpoints_index[0]],
-                bottom_y_range=self.bottom_y_range,
-                density=self.density,
-                equinox_range=self.equinox_range,
-                endpoint_dithering=self.line_endpoint_dithering,
-                point_dithering=self.point_dithering
-            )]
-        else:
-            vert_points = [generate_point_util.get_vertical_line3d_by_curve(
-                points=top_points[top_endpoints_index[i]: top_endpoints_index[i + 1] if i + 1 < endpoint_nums else -1],
-                bottom_y_range=self.bottom_y_range,
-                degree_range=self.dip_degree_range,
-                density=self.density,
-                equinox_range=self.equinox_range,
-                endpoint_dithering=self.line_endpoint_dithering,
-                point_dithering=self.point_dithering
-            ) for i in range(0, vertical_nums)]
+            vertical_nums = int(rng.integers(0, endpoint_nums, endpoint=True))
+            if vertical_nums == 0:
+                vert_points = [generate_point_util.get_vertical_line3d_by_endpoint(
+                    endpoint=top_endpoints[top_endpoints_index[0]],
+                    bottom_y_range=self.bottom_y_range,
+                    density=self.density,
+                    equinox_range=self.equinox_range,
+                    endpoint_dithering=self.line_endpoint_dithering,
+                    point_dithering=self.point_dithering,
+                    rng=rng
+                )]
+            else:
+                vert_points = [generate_point_util.get_vertical_line3d_by_curve(
+                    points=top_points[top_endpoints_index[i]:
+                                      top_endpoints_index[i + 1] if i + 1 < endpoint_nums else -1],
+                    bottom_y_range=self.bottom_y_range,
+                    degree_range=self.dip_degree_range,
+                    density=self.density,
+                    equinox_range=self.equinox_range,
+                    endpoint_dithering=self.line_endpoint_dithering,
+                    point_dithering=self.point_dithering,
+                    rng=rng
+                ) for i in range(0, vertical_nums)]
 
-        # transform
-        return FreeformStrokes.load_points(
-            top_points, *tuple(vert_points)
-        ).load_plane_strokes_types(
-            top_points_types
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
-            dx_range=self.move_plane_range,
-            dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
-        )
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = FreeformStrokes.load_points(
+                top_points, *tuple(vert_points)
+            ).load_plane_strokes_types(
+                top_points_types
+            )
+        return strokes
@@ -1,10 +1,12 @@
 from typing import Tuple
 
+import numpy as np
 from numpy import ndarray
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler
-from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from meta import Strokes, BuiltinGeometry, StrokesBatch
+from utils import generate_point_util, random_util
 
 
 class HemisphereHandler(BaseGeometryHandler):
@@ -36,28 +38,66 @@ class HemisphereHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Hemisphere
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate hemisphere strokes.
-        :return: Hemisphere strokes.
+        Generate hemisphere strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed hemisphere strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        arc = generate_point_util.get_vertical_arc(
+        with self.trace_stage("curve"):
+            arc = generate_point_util.get_vertical_arc(
+                density=self.density,
+                r_range=self.r_range,
+                th_degree_range=self.th_degree_range,
+                y_range=self.bottom_y_range,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
+
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                arc
+            )
+        return strokes
+
+    def generate_batch(
+            self,
+            k: int,
+            rng: Generator = None
+    ) -> StrokesBatch:
+        """
+        Generate batch of hemisphere strokes with array operations.
+        :param k: Strokes nums.
+        :param rng: Random generator of batch.
+        :return: Hemisphere strokes batch.
+        """
+        rng = random_util.get_generator(rng)
+
+        # generate
+        points, offsets = generate_point_util.get_vertical_arcs(
+            k,
             density=self.density,
             r_range=self.r_range,
             th_degree_range=self.th_degree_range,
             y_range=self.bottom_y_range,
-            point_dithering=self.point_dithering
+            point_dithering=self.point_dithering,
+            rng=rng
         )
 
         # transform
-        return Strokes.load_points(
-            arc
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
+        return StrokesBatch.load_points(
+            points, offsets, np.ones(k, dtype=int)
+        ).transform_points3d(
+            degree_range=self.plane_rotate_degree_range,
             dx_range=self.move_plane_range,
             dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
+            dy_range=self.move_y_range,
+            rng=rng
         )
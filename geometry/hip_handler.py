@@ -1,10 +1,11 @@
 from typing import Tuple
 
 from numpy import ndarray
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler
 from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from utils import generate_point_util, random_util
 
 
 class HipHandler(BaseGeometryHandler):
@@ -42,64 +43,73 @@ class HipHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Hip
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate hip strokes.
-        :return: Hip strokes.
+        Generate hip strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed hip strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        dx = [1, -1, -1, 1]
-        dz = [1, 1, -1, -1]
-        bottom_points = generate_point_util.get_point3d(
-            x_range=self.point_bottom_plane_range,
-            z_range=self.point_bottom_plane_range,
-            y_range=self.bottom_y_range
-        )
-        top_point = generate_point_util.get_point3d(
-            x_range=self.point_top_x_range,
-            z_range=self.point_top_z_range,
-            y_range=self.height_range
-        )
+        with self.trace_stage("sample"):
+            dx = [1, -1, -1, 1]
+            dz = [1, 1, -1, -1]
+            bottom_points = generate_point_util.get_point3d(
+                x_range=self.point_bottom_plane_range,
+                z_range=self.point_bottom_plane_range,
+                y_range=self.bottom_y_range,
+                rng=rng
+            )
+            top_point = generate_point_util.get_point3d(
+                x_range=self.point_top_x_range,
+                z_range=self.point_top_z_range,
+                y_range=self.height_range,
+                rng=rng
+            )
 
-        top_endpoints = [generate_point_util.get_point3d(
-            x=float(dx[i] * top_point[0]),
-            z=float(dz[i] * top_point[1]),
-            y=float(top_point[2]),
-            dithering=self.endpoint_dithering
-        ) for i in range(0, 2)]
-        bottom_endpoints = [generate_point_util.get_point3d(
-            x=float(dx[i] * bottom_points[0]),
-            z=float(dz[i] * bottom_points[1]),
-            y=float(bottom_points[2]),
-            dithering=self.endpoint_dithering
-        ) for i in range(0, 4)]
+            top_endpoints = [generate_point_util.get_point3d(
+                x=float(dx[i] * top_point[0]),
+                z=float(dz[i] * top_point[1]),
+                y=float(top_point[2]),
+                dithering=self.endpoint_dithering,
+                rng=rng
+            ) for i in range(0, 2)]
+            bottom_endpoints = [generate_point_util.get_point3d(
+                x=float(dx[i] * bottom_points[0]),
+                z=float(dz[i] * bottom_points[1]),
+                y=float(bottom_points[2]),
+                dithering=self.endpoint_dithering,
+                rng=rng
+            ) for i in range(0, 4)]
 
-        vertical_line_axis_arr = (2, 1, 0)
-        top_index = [0, 1, 1, 0]
-        vertical_lines = [generate_point_util.get_line3d(
-            endpoints=(top_endpoints[top_index[i]], bottom_endpoints[i]),
-            axis_arr=vertical_line_axis_arr,
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        ) for i in range(0, 4)]
-        line = generate_point_util.get_line3d(
-            endpoints=(top_endpoints[0], top_endpoints[1]),
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
+        with self.trace_stage("curve"):
+            vertical_line_axis_arr = (2, 1, 0)
+            top_index = [0, 1, 1, 0]
+            vertical_lines = [generate_point_util.get_line3d(
+                endpoints=(top_endpoints[top_index[i]], bottom_endpoints[i]),
+                axis_arr=vertical_line_axis_arr,
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            ) for i in range(0, 4)]
+            line = generate_point_util.get_line3d(
+                endpoints=(top_endpoints[0], top_endpoints[1]),
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        # transform
-        return Strokes.load_points(
-            *tuple(vertical_lines), line
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
-            dx_range=self.move_plane_range,
-            dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
-        )
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                *tuple(vertical_lines), line
+            )
+        return strokes
@@ -1,11 +1,11 @@
-import random
 from typing import Tuple
 
 from numpy import ndarray
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler
 from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from utils import generate_point_util, random_util
 
 
 class PlatformHandler(BaseGeometryHandler):
@@ -41,81 +41,92 @@ class PlatformHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Platform
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate platform strokes.
-        :return: Platform strokes.
+        Generate platform strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed platform strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        dx = [1, -1, -1, 1]
-        dz = [1, 1, -1, -1]
-        bottom_points = generate_point_util.get_point3d(
-            x_range=self.point_bottom_plane_range,
-            z_range=self.point_bottom_plane_range,
-            y_range=self.bottom_y_range
-        )
+        with self.trace_stage("sample"):
+            dx = [1, -1, -1, 1]
+            dz = [1, 1, -1, -1]
+            bottom_points = generate_point_util.get_point3d(
+                x_range=self.point_bottom_plane_range,
+                z_range=self.point_bottom_plane_range,
+                y_range=self.bottom_y_range,
+                rng=rng
+            )
 
-        top_points = generate_point_util.get_point3d(
-            x_range=self.point_top_plane_range,
-            z_range=self.point_top_plane_range,
-            y_range=self.height_range
-        )
+            top_points = generate_point_util.get_point3d(
+                x_range=self.point_top_plane_range,
+                z_range=self.point_top_plane_range,
+                y_range=self.height_range,
+                rng=rng
+            )
 
-        top_endpoints = [generate_point_util.get_point3d(
-            x=float(dx[i] * top_points[0]),
-            z=float(dz[i] * top_points[1]),
-            y=float(top_points[2]),
-            dithering=self.endpoint_dithering
-        ) for i in range(0, 4)]
-        bottom_endpoints = [generate_point_util.get_point3d(
-            x=float(dx[i] * bottom_points[0]),
-            z=float(dz[i] * bottom_points[1]),
-            y=float(bottom_points[2]),
-            dithering=self.endpoint_dithering
-        ) for i in range(0, 4)]
+            top_endpoints = [generate_point_util.get_point3d(
+                x=float(dx[i] * top_points[0]),
+                z=float(dz[i] * top_points[1]),
+                y=float(top_points[2]),
+                dithering=self.endpoint_dithering,
+                rng=rng
+            ) for i in range(0, 4)]
+            bottom_endpoints = [generate_point_util.get_point3d(
+                x=float(dx[i] * bottom_points[0]),
+                z=float(dz[i] * bottom_points[1]),
+                y=float(bottom_points[2]),
+                dithering=self.endpoint_dithering,
+                rng=rng
+            ) for i in range(0, 4)]
 
-        vertical_line_axis_arr = (2, 1, 0)
-        vertical_lines = [generate_point_util.get_line3d(
-            endpoints=(top_endpoints[i], bottom_endpoints[i]),
-            axis_arr=vertical_line_axis_arr,
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
-                          for i in range(0, 4)]
-        line1 = generate_point_util.get_line3d(
-            endpoints=(top_endpoints[0], top_endpoints[1]),
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
+        with self.trace_stage("curve"):
+            vertical_line_axis_arr = (2, 1, 0)
+            vertical_lines = [generate_point_util.get_line3d(
+                endpoints=(top_endpoints[i], bottom_endpoints[i]),
+                axis_arr=vertical_line_axis_arr,
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
+                              for i in range(0, 4)]
+            line1 = generate_point_util.get_line3d(
+                endpoints=(top_endpoints[0], top_endpoints[1]),
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        line2 = generate_point_util.get_line3d(
-            endpoints=(top_endpoints[2], top_endpoints[3]),
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
+            line2 = generate_point_util.get_line3d(
+                endpoints=(top_endpoints[2], top_endpoints[3]),
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        line3 = generate_point_util.get_connect_line3d(
-            lines=(line1, line2),
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
+            line3 = generate_point_util.get_connect_line3d(
+                lines=(line1, line2),
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        # transform
-        return Strokes.load_points(
-            *tuple(vertical_lines), line1, line2, line3
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
-            dx_range=self.move_plane_range,
-            dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
-        )
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                *tuple(vertical_lines), line1, line2, line3
+            )
+        return strokes
@@ -1,9 +1,11 @@
-import random
 from typing import Tuple
 
+import numpy as np
+from numpy.random import Generator
+
 from geometry import BaseGeometryHandler
-from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from meta import Strokes, BuiltinGeometry, StrokesBatch
+from utils import generate_point_util, random_util
 
 
 class PyramidHandler(BaseGeometryHandler):
@@ -39,37 +41,89 @@ class PyramidHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Pyramid
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate pyramid strokes.
-        :return: Pyramid strokes.
+        Generate pyramid strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed pyramid strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        peak = generate_point_util.get_point3d(x=0, z=0, y_range=self.height_range, dithering=self.endpoint_dithering)
-        nums = random.randint(*self.point_num_range)
-        bottom_points = [generate_point_util.get_point3d(
+        with self.trace_stage("sample"):
+            peak = generate_point_util.get_point3d(x=0, z=0, y_range=self.height_range,
+                                                   dithering=self.endpoint_dithering, rng=rng)
+            nums = int(rng.integers(*self.point_num_range, endpoint=True))
+            bottom_points = [generate_point_util.get_point3d(
+                x_range=self.point_plane_range,
+                z_range=self.point_plane_range,
+                y_range=self.bottom_y_range,
+                dithering=self.endpoint_dithering,
+                rng=rng
+            ) for _ in range(0, nums)]
+        with self.trace_stage("curve"):
+            line_axis_arr = (2, 1, 0)
+            lines = [generate_point_util.get_line3d(
+                endpoints=(peak, bottom_points[i]),
+                axis_arr=line_axis_arr,
+                density=self.density,
+                equinox_range=self.equinox_range,
+                point_dithering=self.point_dithering,
+                rng=rng
+            ) for i in range(0, nums)]
+
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                *tuple(lines)
+            )
+        return strokes
+
+    def generate_batch(
+            self,
+            k: int,
+            rng: Generator = None
+    ) -> StrokesBatch:
+        """
+        Generate batch of pyramid strokes with array operations.
+        :param k: Strokes nums.
+        :param rng: Random generator of batch.
+        :return: Pyramid strokes batch.
+        """
+        rng = random_util.get_generator(rng)
+
+        # generate
+        peak = generate_point_util.get_points3d(k, x=0, z=0, y_range=self.height_range,
+                                                dithering=self.endpoint_dithering, rng=rng)
+        nums = rng.integers(*self.point_num_range, k, endpoint=True)
+        bottom_points = generate_point_util.get_points3d(
+            int(np.sum(nums)),
             x_range=self.point_plane_range,
             z_range=self.point_plane_range,
             y_range=self.bottom_y_range,
-            dithering=self.endpoint_dithering
-        ) for _ in range(0, nums)]
+            dithering=self.endpoint_dithering,
+            rng=rng
+        )
         line_axis_arr = (2, 1, 0)
-        lines = [generate_point_util.get_line3d(
-            endpoints=(peak, bottom_points[i]),
+        points, offsets = generate_point_util.get_curves3d(
+            endpoints=(np.repeat(peak, nums, axis=0), bottom_points),
             axis_arr=line_axis_arr,
             density=self.density,
             equinox_range=self.equinox_range,
-            point_dithering=self.point_dithering
-        ) for i in range(0, nums)]
+            point_dithering=self.point_dithering,
+            rng=rng
+        )
 
         # transform
-        return Strokes.load_points(
-            *tuple(lines)
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
+        return StrokesBatch.load_points(
+            points, offsets, nums
+        ).transform_points3d(
+            degree_range=self.plane_rotate_degree_range,
             dx_range=self.move_plane_range,
             dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
+            dy_range=self.move_y_range,
+            rng=rng
         )
@@ -1,12 +1,12 @@
-import random
 from typing import Tuple
 
 import numpy as np
 from numpy import ndarray
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler
 from meta import Strokes, BuiltinGeometry
-from utils import generate_point_util
+from utils import generate_point_util, random_util
 
 
 class ShedHandler(BaseGeometryHandler):
@@ -44,47 +44,53 @@ class ShedHandler(BaseGeometryHandler):
         """
         return BuiltinGeometry.Shed
 
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate shed strokes.
-        :return: Shed strokes.
+        Generate shed strokes before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed shed strokes.
         """
+        rng = random_util.get_generator(rng)
 
         # generate
-        base = generate_point_util.get_point3d(x_range=self.point_x_range, y=0, z=0, dithering=self.point_dithering)
-        r = random.uniform(*self.r_range)
-        th = np.deg2rad(random.uniform(*self.th_degree_range))
-        arc1 = generate_point_util.get_vertical_arc(
-            density=self.density,
-            r=r, th=th, y_range=self.bottom_y_range,
-            rot_degree_range=self.arc_rot_degree_range,
-            base=base, point_dithering=self.point_dithering
-        )
-        arc2 = generate_point_util.get_vertical_arc(
-            density=self.density,
-            r=r,
-            th=th,
-            y_range=self.bottom_y_range,
-            rot_degree_range=self.arc_rot_degree_range,
-            base=-base,
-            point_dithering=self.point_dithering
-        )
+        with self.trace_stage("sample"):
+            base = generate_point_util.get_point3d(x_range=self.point_x_range, y=0, z=0, dithering=self.point_dithering,
+                                                   rng=rng)
+            r = rng.uniform(*self.r_range)
+            th = np.deg2rad(rng.uniform(*self.th_degree_range))
+        with self.trace_stage("curve"):
+            arc1 = generate_point_util.get_vertical_arc(
+                density=self.density,
+                r=r, th=th, y_range=self.bottom_y_range,
+                rot_degree_range=self.arc_rot_degree_range,
+                base=base, point_dithering=self.point_dithering, rng=rng
+            )
+            arc2 = generate_point_util.get_vertical_arc(
+                density=self.density,
+                r=r,
+                th=th,
+                y_range=self.bottom_y_range,
+                rot_degree_range=self.arc_rot_degree_range,
+                base=-base,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        line = generate_point_util.get_connect_line3d(
-            lines=(arc1, arc2),
-            density=self.density,
-            equinox_range=self.equinox_range,
-            endpoint_dithering=self.endpoint_dithering,
-            point_dithering=self.point_dithering
-        )
+            line = generate_point_util.get_connect_line3d(
+                lines=(arc1, arc2),
+                density=self.density,
+                equinox_range=self.equinox_range,
+                endpoint_dithering=self.endpoint_dithering,
+                point_dithering=self.point_dithering,
+                rng=rng
+            )
 
-        # transform
-        return Strokes.load_points(
-            arc1, arc2, line
-        ).rotate_points3d(
-            degree_range=self.plane_rotate_degree_range
-        ).move_points3d(
-            dx_range=self.move_plane_range,
-            dz_range=self.move_plane_range,
-            dy_range=self.move_y_range
-        )
+        # assemble
+        with self.trace_stage("assembly"):
+            strokes = Strokes.load_points(
+                arc1, arc2, line
+            )
+        return strokes
@@ -1,9 +1,11 @@
 from .strokes import Strokes
 from .freeform_strokes import FreeformStrokes
 from .builtin_geometry import BuiltinGeometry
+from .strokes_batch import StrokesBatch
 
 __all__ = [
     "Strokes",
     "FreeformStrokes",
-    "BuiltinGeometry"
+    "BuiltinGeometry",
+    "StrokesBatch"
 ]
\ No newline at end of file
@@ -1,11 +1,29 @@
 import os.path
 from abc import abstractmethod, ABCMeta
-from typing import Any, Tuple
+from types import MappingProxyType
+from typing import Any, Tuple, ContextManager, Mapping
 
 import toml
+from numpy.random import Generator
 
-from meta import Strokes, BuiltinGeometry
-from utils import assert_util
+from meta import Strokes, BuiltinGeometry, StrokesBatch
+from utils import assert_util, random_util, trace_util
+from utils.trace_util import Tracer
+
+_RULE_TYPES_: dict[str, type] = {"int": int, "float": float, "tuple": tuple}
+_rules_cache_: dict[tuple[str, float], dict[str, Any]] = {}
+
+
+def _load_geometries_rules_(rules_path: str) -> dict[str, Any]:
+    """
+    Load geometries rules file, parsed once (until the file is modified) for all geometry handlers.
+    :param rules_path: Rules file path.
+    :return: Rules of all geometries.
+    """
+    key = (os.path.abspath(rules_path), os.path.getmtime(rules_path))
+    if key not in _rules_cache_:
+        _rules_cache_[key] = toml.load(rules_path)
+    return _rules_cache_[key]
 
 
 class BaseGeometryHandler(metaclass=ABCMeta):
@@ -19,8 +37,10 @@ class BaseGeometryHandler(metaclass=ABCMeta):
         """
         super().__init__()
         self.__RULES_PATH__: str = "./geometry/rules.toml"
-        self.__rules__: dict = {}
+        self.__rules__: dict[str, type] = {}
         self._config_: dict = {}
+        self.__params__: Mapping[str, Any] | None = None
+        self.tracer: Tracer = trace_util.NULL_TRACER
 
         self.density: float | None = None
         self.equinox_range: Tuple[float, float] | None = None
@@ -28,6 +48,7 @@ class BaseGeometryHandler(metaclass=ABCMeta):
         self.move_plane_range: Tuple[float, float] | None = None
         self.move_y_range: Tuple[float, float] | None = None
         self.plane_rotate_degree_range: Tuple[float, float] | None = None
+        self.variants: int = 1
 
         self.__load_rules__()
 
@@ -58,9 +79,9 @@ class BaseGeometryHandler(metaclass=ABCMeta):
 
             config_value = self._config_[key]
             assert_util.same_type(
-                type(config_value), eval(value),
+                type(config_value), value,
                 "'{0}' of geometry '{1}' config is not the type: '{2}'.",
-                config_value, name, value
+                config_value, name, value.__name__
             )
 
     def set_config(
@@ -69,12 +90,26 @@ class BaseGeometryHandler(metaclass=ABCMeta):
     ) -> None:
         """
         Set geometry configuration. And transform list to tuple.
+        The compiled params are dropped if any value is changed, so the next compile validates the config again.
         :param config: Config dict of geometry handler.
         """
         for key, value in config.items():
             value = tuple(value) if isinstance(value, list) else value
+            if key not in self._config_ or self._config_[key] != value:
+                self.__params__ = None
             self._config_[key] = value
 
+    def compile(self) -> Mapping[str, Any]:
+        """
+        Validate and load the config once, and reuse it until the config is changed.
+        :return: Compiled (read-only) params of geometry handler.
+        """
+        if self.__params__ is None or self.__params__ != self._config_:
+            self.validate()
+            self.load_config()
+            self.__params__ = MappingProxyType(dict(self._config_))
+        return self.__params__
+
     def load_base_config(self) -> None:
         """
         Load base general config of geometry handler.
@@ -85,6 +120,11 @@ class BaseGeometryHandler(metaclass=ABCMeta):
         self.plane_rotate_degree_range = self._config_["plane_rotate_degree_range"]
         self.density = self._config_["density"]
         self.equinox_range = self._config_["equinox_range"]
+        # optional, one sample of each base shape if not configured
+        self.variants = self._config_.get("variants", 1)
+        assert_util.is_true(type(self.variants) is int and self.variants >= 1,
+                            "variants '{0}' of geometry '{1}' should be a positive int.",
+                            self.variants, self.prototype().get_name())
 
     @abstractmethod
     def load_config(self) -> None:
@@ -93,6 +133,27 @@ class BaseGeometryHandler(metaclass=ABCMeta):
         """
         pass
 
+    def set_tracer(
+            self,
+            tracer: Tracer = None
+    ) -> None:
+        """
+        Set the tracer of generation stages (disable tracing if None).
+        :param tracer: Stage tracer.
+        """
+        self.tracer = trace_util.NULL_TRACER if tracer is None else tracer
+
+    def trace_stage(
+            self,
+            name: str
+    ) -> ContextManager:
+        """
+        Record the duration of generation stage (sample, curve, assembly or transform) inside the context.
+        :param name: Stage name.
+        :return: Stage context.
+        """
+        return self.tracer.stage(name)
+
     def get_config(self) -> dict[str, Any]:
         """
         Get geometry configuration.
@@ -109,7 +170,7 @@ class BaseGeometryHandler(metaclass=ABCMeta):
 
         assert_util.is_true(
             os.path.exists(self.__RULES_PATH__), "rules file: '{0}' is not exist.", self.__RULES_PATH__)
-        geometries_rules = toml.load(self.__RULES_PATH__)
+        geometries_rules = _load_geometries_rules_(self.__RULES_PATH__)
         assert_util.is_true(
             name in geometries_rules.keys() and isinstance(geometries_rules[name], dict),
             "geometry rules of '{0}' is not exist.",
@@ -117,19 +178,94 @@ class BaseGeometryHandler(metaclass=ABCMeta):
         )
 
         rules = geometries_rules[name]
-        supported_type = ("int", "float", "tuple")
         for key, value in rules.items():
             assert_util.is_true(
-                value in supported_type,
+                value in _RULE_TYPES_,
                 "geometry rule '{0}' has not support the type: {1}.",
                 key, value
             )
-        self.__rules__ = rules
+        self.__rules__ = {key: _RULE_TYPES_[value] for key, value in rules.items()}
 
     @abstractmethod
-    def generate_strokes(self) -> Strokes:
+    def generate_shape(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
         """
-        Generate strokes.
-        :return: Strokes or freeform strokes.
+        Generate base shape strokes, before the rigid transform (rotation and move) of sample.
+        :param rng: Random generator of sample.
+        :return: Untransformed strokes or freeform strokes.
         """
         pass
+
+    def transform_strokes(
+            self,
+            strokes: Strokes,
+            rng: Generator = None
+    ) -> Strokes:
+        """
+        Rotate strokes in plane and move it by the random rotation and move of config.
+        :param strokes: Base shape strokes.
+        :param rng: Random generator of sample.
+        :return: Transformed strokes.
+        """
+        with self.trace_stage("transform"):
+            return strokes.transform_points3d(
+                degree_range=self.plane_rotate_degree_range,
+                dx_range=self.move_plane_range,
+                dz_range=self.move_plane_range,
+                dy_range=self.move_y_range,
+                rng=rng
+            )
+
+    def generate_strokes(
+            self,
+            rng: Generator = None
+    ) -> Strokes:
+        """
+        Generate strokes (base shape with its rigid transform).
+        :param rng: Random generator of sample.
+        :return: Strokes or freeform strokes.
+        """
+        rng = random_util.get_generator(rng)
+        return self.transform_strokes(self.generate_shape(rng), rng)
+
+    def generate_variants(
+            self,
+            k: int = None,
+            rng: Generator = None
+    ) -> StrokesBatch:
+        """
+        Generate one base shape, and k rigid variants of it with their own rotation and move in one batched transform.
+        The curve generation is paid once for k strokes.
+        :param k: Variant nums (variants of config if None).
+        :param rng: Random generator of base shape.
+        :return: Strokes batch of variants.
+        """
+        rng = random_util.get_generator(rng)
+        k = self.variants if k is None else k
+        batch = StrokesBatch.load_strokes_list([self.generate_shape(rng)] * k)
+        with self.trace_stage("transform"):
+            return batch.transform_points3d(
+                degree_range=self.plane_rotate_degree_range,
+                dx_range=self.move_plane_range,
+                dz_range=self.move_plane_range,
+                dy_range=self.move_y_range,
+                rng=rng
+            )
+
+    def generate_batch(
+            self,
+            k: int,
+            rng: Generator = None
+    ) -> StrokesBatch:
+        """
+        Generate batch of k strokes. Handlers could override it to generate all strokes with array operations
+        (cone, pyramid and hemisphere do, the other builtin geometries draw a random number of strokes of different
+        kinds each sample and keep this loop over generate_strokes).
+        :param k: Strokes nums.
+        :param rng: Random generator of batch.
+        :return: Strokes batch.
+        """
+        rng = random_util.get_generator(rng)
+        return StrokesBatch.load_strokes_list([self.generate_strokes(rng) for _ in range(0, k)])
@@ -1,9 +1,10 @@
+import numpy as np
 from typing_extensions import Self
 
 from meta import Strokes
 from numpy import ndarray
 
-from utils import assert_util
+from utils import assert_util, resample_util
 
 
 class FreeformStrokes(Strokes):
@@ -29,8 +30,7 @@ class FreeformStrokes(Strokes):
         :return: Freeform stroke instance.
         """
         strokes = FreeformStrokes()
-        strokes.set_value(cls.mark_points3d(points[0], 1))
-        strokes.append_points(*points[1:])
+        strokes.append_points(*points)
         return strokes
 
     def load_plane_strokes_types(
@@ -52,3 +52,37 @@ class FreeformStrokes(Strokes):
         :return: Strokes types.
         """
         return self.types
+
+    def resample_points(
+            self,
+            nums: int,
+            method: str = "arc_length"
+    ) -> Self:
+        """
+        Resample freeform strokes to exactly nums points, keeping the stroke id of points.
+        The point types (of the leading plane strokes) are taken from the nearest source point of each point.
+        :param nums: Point nums of resampled strokes.
+        :param method: Resample method ('arc_length' for uniform along arc length, or 'farthest_point').
+        :return: Resampled freeform strokes.
+        """
+        assert_util.is_not_none(self.value, "Freeform strokes could not be blank.")
+        if self.types is None:
+            self.value, _ = resample_util.resample_value(self.value, nums, method)
+            return self
+
+        # type of each source point (-1 of the points of other strokes)
+        types = np.asarray(self.types)
+        plane_stroke_ids = np.unique(self.value[: len(types), 3])
+        is_plane = np.isin(self.value[:, 3], plane_stroke_ids)
+        assert_util.is_true(np.count_nonzero(is_plane) == len(types),
+                            "types nums '{0}' do not match the point nums '{1}' of plane strokes.",
+                            len(types), np.count_nonzero(is_plane))
+        point_types = np.full(len(self.value), -1, dtype=types.dtype)
+        point_types[is_plane] = types
+
+        self.value, indices = resample_util.resample_value(self.value, nums, method)
+        is_plane = np.isin(self.value[:, 3], plane_stroke_ids)
+        self.types = point_types[indices][is_plane]
+        assert_util.is_true(len(self.types) == np.count_nonzero(is_plane) and np.all(self.types >= 0),
+                            "resampled types do not match the resampled points of plane strokes.")
+        return self
@@ -1,12 +1,12 @@
 import math
-import random
 from typing import Any
 
 import numpy as np
 from numpy import ndarray, dtype
+from numpy.random import Generator
 from typing_extensions import Self
 
-from utils import assert_util, generate_point_util
+from utils import assert_util, generate_point_util, random_util, resample_util
 
 
 class Strokes:
@@ -22,11 +22,9 @@ class Strokes:
 
     def __sort_value__(self) -> None:
         """
-        Sort strokes value by stroke index.
+        Sort strokes value by stroke index (stable).
         """
-        value = list(self.value)
-        value.sort(key=lambda p: p[-1])
-        self.value = np.array(value)
+        self.value = self.value[np.argsort(self.value[:, -1], kind="stable")]
 
     @classmethod
     def __validate_strokes__(
@@ -84,16 +82,13 @@ class Strokes:
             self.__validate_strokes__(value)
 
         self.nums += 1
+        marked_values = [] if self.value is None else [self.value]
         for value in values:
-            cur_strokes = value[0][-1]
-            for point in value:
-                if point[-1] != cur_strokes:
-                    self.nums += 1
-                    cur_strokes = point[-1]
-                point[-1] = self.nums
-            self.value = generate_point_util.concatenate_points(self.value, value)
-
-        self.__sort_value__()
+            value = value.copy()
+            value[:, -1] = self.nums + np.concatenate(([0], np.cumsum(value[1:, -1] != value[:-1, -1])))
+            self.nums = value[-1][-1] if len(value) > 0 else self.nums
+            marked_values.append(value)
+        self.value = generate_point_util.concatenate_points(*marked_values)
         return self
 
     def append_points(
@@ -108,12 +103,12 @@ class Strokes:
         for points in points_arr:
             self.__validate_points__(points)
 
-        for points in points_arr:
-            self.nums += 1
-            value = np.insert(points, 3, [self.nums for _ in points], axis=1)
-            self.value = generate_point_util.concatenate_points(self.value, value)
-
-        self.__sort_value__()
+        tags = np.repeat(np.arange(self.nums + 1, self.nums + len(points_arr) + 1),
+                         [len(points) for points in points_arr])
+        marked_points = [] if self.value is None else [self.value]
+        marked_points.append(np.column_stack((generate_point_util.concatenate_points(*points_arr), tags)))
+        self.value = generate_point_util.concatenate_points(*marked_points)
+        self.nums += len(points_arr)
         return self
 
     @classmethod
@@ -137,13 +132,12 @@ class Strokes:
             *points: ndarray[ndarray] | ndarray
     ) -> Self:
         """
-        Load strokes value by points.
+        Load strokes value by points, the strokes are marked and concatenated once in order.
         :param points: Strokes points.
         :return: Strokes.
         """
         strokes = Strokes()
-        strokes.set_value(cls.mark_points3d(points[0], 1))
-        strokes.append_points(*points[1:])
+        strokes.append_points(*points)
         return strokes
 
     @classmethod
@@ -158,8 +152,27 @@ class Strokes:
         :param tag: Stroke tag (which stroke).
         :return: Marked strokes value.
         """
-        stroke_points = [np.array(list(point) + [tag]) for point in points]
-        return np.array(stroke_points)
+        return np.column_stack((points, np.full(len(points), tag)))
+
+    @classmethod
+    def __get_rotate_matrix3d__(
+            cls,
+            radian: float,
+            axis: int = 2
+    ) -> ndarray[ndarray]:
+        """
+        Get 3x3 rotate matrix around axis(x = 0, y = 1, z = 2).
+        :param radian: Rotate radian.
+        :param axis: Rotate axis.
+        :return: Rotate matrix.
+        """
+        i, j = [k for k in range(0, 3) if k != axis]
+        rotate_matrix = np.eye(3)
+        rotate_matrix[i, i] = math.cos(radian)
+        rotate_matrix[i, j] = -math.sin(radian)
+        rotate_matrix[j, i] = math.sin(radian)
+        rotate_matrix[j, j] = math.cos(radian)
+        return rotate_matrix
 
     def rotate_points3d(
             self,
@@ -167,7 +180,8 @@ class Strokes:
             radian_range: tuple = None,
             degree_range: tuple = (0, 0),
             base: ndarray[ndarray] = np.array([0, 0, 0]),
-            axis: int = 2
+            axis: int = 2,
+            rng: Generator = None
     ) -> Self:
         """
         Rotate pointset around axis(x = 0, y = 1, z = 2) in order x, y, z.
@@ -176,37 +190,14 @@ class Strokes:
         :param degree_range: Rotate degree range (convert to radian).
         :param base: Base point.
         :param axis: Rotate axis.
+        :param rng: Random generator.
         :return: Rotated strokes.
         """
-        def rotate_point3d(
-                point: ndarray[ndarray],
-                rad: float = None,
-                rad_range: tuple = (0, 0),
-                base_point: ndarray[ndarray] = np.array([0, 0, 0]),
-                axis: int = 2
-        ) -> ndarray[ndarray]:
-            """
-            Rotate point around axis(x = 0, y = 1, z = 2) in order x, y, z.
-            :param point: Rotate point.
-            :param rad: Rotate radian.
-            :param rad_range: Rotate radian range.
-            :param base_point: Base point.
-            :param axis: Rotate axis.
-            :return: Rotated point.
-            """
-            rad = random.uniform(*rad_range) if rad is None else rad
-            flags = np.array([i != axis for i in range(0, 3)])
-            rotate_matrix = np.array([[math.cos(rad), -math.sin(rad)], [math.sin(rad), math.cos(rad)]])
-            rotate_point = point[0: 3][flags]
-            base_point = base_point[flags]
-
-            point[0: 3][flags] = np.matmul(rotate_matrix, rotate_point - base_point) + base_point
-            return point
-
-        strokes = self.value
+        rng = random_util.get_generator(rng)
         radian_range = tuple(np.deg2rad(degree_range)) if radian_range is None else radian_range
-        radian = random.uniform(*radian_range) if radian is None else radian
-        self.value = np.array([rotate_point3d(point, rad=radian, base_point=base, axis=axis) for point in strokes])
+        radian = rng.uniform(*radian_range) if radian is None else radian
+        rotate_matrix = self.__get_rotate_matrix3d__(radian, axis)
+        self.value[:, 0: 3] = np.matmul(self.value[:, 0: 3] - base, rotate_matrix.T) + base
         return self
 
     def move_points3d(
@@ -217,7 +208,8 @@ class Strokes:
             dz_range: tuple = (0, 0),
             dx: float = 0,
             dy: float = 0,
-            dz: float = 0
+            dz: float = 0,
+            rng: Generator = None
     ) -> Self:
         """
         Move points with vector or dx(y/z).
@@ -228,30 +220,74 @@ class Strokes:
         :param dx: Move x range.
         :param dy: Move y range.
         :param dz: Move z range.
+        :param rng: Random generator.
         :return: Moved Strokes.
         """
-        def move_point3d(
-                point: ndarray[ndarray],
-                vector: ndarray[ndarray] = None,
-                dx: float = 0,
-                dy: float = 0,
-                dz: float = 0
-        ) -> ndarray[ndarray]:
-            """
-            Move point with vector or dx(y/z)
-            :param point: Point be moved.
-            :param vector: Move vector.
-            :param dx: Move dx.
-            :param dy: Move dy.
-            :param dz: Move dz.
-            :return: Moved point.
-            """
-            vector = np.array([dx, dz, dy]) if vector is None else vector
-            point[0: 3] = point[0: 3] + vector
-            return point
+        rng = random_util.get_generator(rng)
+        dx = rng.uniform(*dx_range) if vector is None else dx
+        dy = rng.uniform(*dy_range) if vector is None else dy
+        dz = rng.uniform(*dz_range) if vector is None else dz
+        vector = np.array([dx, dz, dy]) if vector is None else vector
+        self.value[:, 0: 3] += vector
+        return self
+
+    def transform_points3d(
+            self,
+            radian: float = None,
+            radian_range: tuple = None,
+            degree_range: tuple = (0, 0),
+            base: ndarray[ndarray] = np.array([0, 0, 0]),
+            axis: int = 2,
+            vector: ndarray[ndarray] = None,
+            dx_range: tuple = (0, 0),
+            dy_range: tuple = (0, 0),
+            dz_range: tuple = (0, 0),
+            dx: float = 0,
+            dy: float = 0,
+            dz: float = 0,
+            rng: Generator = None
+    ) -> Self:
+        """
+        Rotate pointset around axis and then move it with vector or dx(y/z) in one pass.
+        Same as rotate_points3d followed by move_points3d.
+        :param radian: Rotate radian.
+        :param radian_range: Rotate radian range.
+        :param degree_range: Rotate degree range (convert to radian).
+        :param base: Base point of rotation.
+        :param axis: Rotate axis.
+        :param vector: Move vector.
+        :param dx_range: Move x range.
+        :param dy_range: Move y range.
+        :param dz_range: Move z range.
+        :param dx: Move x range.
+        :param dy: Move y range.
+        :param dz: Move z range.
+        :param rng: Random generator.
+        :return: Transformed strokes.
+        """
+        rng = random_util.get_generator(rng)
+        radian_range = tuple(np.deg2rad(degree_range)) if radian_range is None else radian_range
+        radian = rng.uniform(*radian_range) if radian is None else radian
+        dx = rng.uniform(*dx_range) if vector is None else dx
+        dy = rng.uniform(*dy_range) if vector is None else dy
+        dz = rng.uniform(*dz_range) if vector is None else dz
+        vector = np.array([dx, dz, dy]) if vector is None else vector
 
-        dx = random.uniform(*dx_range) if vector is None else dx
-        dy = random.uniform(*dy_range) if vector is None else dy
-        dz = random.uniform(*dz_range) if vector is None else dz
-        self.value = np.array([move_point3d(point, vector, dx, dy, dz) for point in self.value])
+        rotate_matrix = self.__get_rotate_matrix3d__(radian, axis)
+        self.value[:, 0: 3] = np.matmul(self.value[:, 0: 3] - base, rotate_matrix.T) + base + vector
+        return self
+
+    def resample_points(
+            self,
+            nums: int,
+            method: str = "arc_length"
+    ) -> Self:
+        """
+        Resample strokes to exactly nums points, keeping the stroke id of points.
+        :param nums: Point nums of resampled strokes.
+        :param method: Resample method ('arc_length' for uniform along arc length, or 'farthest_point').
+        :return: Resampled strokes.
+        """
+        assert_util.is_not_none(self.value, "Strokes could not be blank.")
+        self.value, _ = resample_util.resample_value(self.value, nums, method)
         return self
@@ -0,0 +1,151 @@
+import numpy as np
+from numpy import ndarray
+from numpy.random import Generator
+from typing_extensions import Self
+
+from meta import Strokes, FreeformStrokes
+from utils import assert_util, random_util
+
+
+class StrokesBatch:
+    """
+    Ragged batch of strokes. Values of all strokes are concatenated, and offsets index the values of each strokes.
+    """
+
+    def __init__(
+            self,
+            values: ndarray[ndarray],
+            offsets: ndarray[int],
+            types: ndarray[int] | None = None,
+            types_offsets: ndarray[int] | None = None
+    ) -> None:
+        """
+        Init strokes batch.
+        :param values: Concatenated strokes values.
+        :param offsets: Offsets of strokes values (strokes nums + 1).
+        :param types: Concatenated freeform strokes types.
+        :param types_offsets: Offsets of freeform strokes types (strokes nums + 1).
+        """
+        assert_util.is_true(values.ndim == 2 and values.shape[1] == 4, "Strokes batch value invalid.")
+        assert_util.is_true(offsets[-1] == len(values), "Strokes batch offsets invalid.")
+        self.values: ndarray[ndarray] = values
+        self.offsets: ndarray[int] = offsets
+        self.types: ndarray[int] | None = types
+        self.types_offsets: ndarray[int] | None = types_offsets
+
+    def __len__(self) -> int:
+        """
+        Get strokes nums of batch.
+        :return: Strokes nums.
+        """
+        return len(self.offsets) - 1
+
+    def get_value(
+            self,
+            index: int
+    ) -> ndarray[ndarray]:
+        """
+        Get strokes value of index (a view of batch values).
+        :param index: Strokes index.
+        :return: Strokes value.
+        """
+        return self.values[self.offsets[index]: self.offsets[index + 1]]
+
+    def get_strokes(
+            self,
+            index: int
+    ) -> Strokes:
+        """
+        Get strokes of index.
+        :param index: Strokes index.
+        :return: Strokes or freeform strokes.
+        """
+        if self.types is None:
+            return Strokes().set_value(self.get_value(index).copy())
+        strokes = FreeformStrokes().set_value(self.get_value(index).copy())
+        return strokes.load_plane_strokes_types(self.types[self.types_offsets[index]: self.types_offsets[index + 1]])
+
+    def to_strokes_list(self) -> list[Strokes]:
+        """
+        Get all strokes of batch.
+        :return: Strokes list.
+        """
+        return [self.get_strokes(i) for i in range(0, len(self))]
+
+    @classmethod
+    def load_strokes_list(
+            cls,
+            strokes_list: list[Strokes]
+    ) -> Self:
+        """
+        Load strokes batch by strokes list.
+        :param strokes_list: Strokes (or freeform strokes) list.
+        :return: Strokes batch.
+        """
+        values = [strokes.get_value() for strokes in strokes_list]
+        offsets = np.concatenate(([0], np.cumsum([len(value) for value in values]))).astype(int)
+        if len(strokes_list) == 0 or not all(isinstance(strokes, FreeformStrokes) for strokes in strokes_list):
+            return StrokesBatch(np.concatenate(values) if len(values) > 0 else np.empty((0, 4)), offsets)
+
+        types = [np.asarray(strokes.get_types()) for strokes in strokes_list]
+        types_offsets = np.concatenate(([0], np.cumsum([len(t) for t in types]))).astype(int)
+        return StrokesBatch(np.concatenate(values), offsets, np.concatenate(types), types_offsets)
+
+    @classmethod
+    def load_points(
+            cls,
+            points: ndarray[ndarray],
+            points_offsets: ndarray[int],
+            strokes_nums: ndarray[int]
+    ) -> Self:
+        """
+        Load strokes batch by points of each stroke, marking every stroke in its strokes from 1.
+        :param points: Concatenated points of all strokes (grouped by strokes in order).
+        :param points_offsets: Offsets of points of each stroke.
+        :param strokes_nums: Stroke nums of each strokes.
+        :return: Strokes batch.
+        """
+        stroke_starts = np.cumsum(strokes_nums) - strokes_nums
+        tags = np.arange(len(points_offsets) - 1) - np.repeat(stroke_starts, strokes_nums) + 1
+        values = np.column_stack((points, np.repeat(tags, np.diff(points_offsets))))
+        return StrokesBatch(values, points_offsets[np.concatenate(([0], np.cumsum(strokes_nums)))])
+
+    def transform_points3d(
+            self,
+            radian_range: tuple = None,
+            degree_range: tuple = (0, 0),
+            axis: int = 2,
+            dx_range: tuple = (0, 0),
+            dy_range: tuple = (0, 0),
+            dz_range: tuple = (0, 0),
+            rng: Generator = None
+    ) -> Self:
+        """
+        Rotate each strokes around axis and then move it, with its own random radian and vector, in one pass.
+        Same as Strokes.transform_points3d of each strokes.
+        :param radian_range: Rotate radian range.
+        :param degree_range: Rotate degree range (convert to radian).
+        :param axis: Rotate axis.
+        :param dx_range: Move x range.
+        :param dy_range: Move y range.
+        :param dz_range: Move z range.
+        :param rng: Random generator.
+        :return: Transformed strokes batch.
+        """
+        rng = random_util.get_generator(rng)
+        nums = len(self)
+        radian_range = tuple(np.deg2rad(degree_range)) if radian_range is None else radian_range
+        radians = rng.uniform(*radian_range, nums)
+        vectors = np.column_stack((rng.uniform(*dx_range, nums), rng.uniform(*dz_range, nums),
+                                   rng.uniform(*dy_range, nums)))
+
+        counts = np.diff(self.offsets)
+        cos = np.repeat(np.cos(radians), counts)
+        sin = np.repeat(np.sin(radians), counts)
+        i, j = [k for k in range(0, 3) if k != axis]
+        point_i = self.values[:, i].copy()
+        point_j = self.values[:, j].copy()
+        self.values[:, i] = cos * point_i - sin * point_j
+        self.values[:, j] = sin * point_i + cos * point_j
+        self.values[:, 0: 3] += np.repeat(vectors, counts, axis=0)
+        return self
@@ -1,10 +1,92 @@
+import argparse
+import logging
+import os
+
 from strokes_generator import StrokesGenerator
+from utils import hdf5_util, manifest_util, progress_util, resample_util
+from utils.hdf5_util import Codec
+from utils.progress_util import ProgressReporter
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Get command-line parser of dataset generation.
+    :return: Argument parser.
+    """
+    parser = argparse.ArgumentParser(description="Generate strokes datasets of geometries.")
+    parser.add_argument("--geometries", nargs="*", default=None, help="geometry names (all geometries if empty).")
+    parser.add_argument("--count", type=int, default=None,
+                        help="sample nums of each geometry (1 if empty on generating, required by --merge).")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed (the seed of manifest on resume, or a new one if empty).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker process nums (1 for serial).")
+    parser.add_argument("--format", default="file", choices=hdf5_util.OUTPUT_FORMATS,
+                        help="output format (one file each sample, shard or ragged shard).")
+    parser.add_argument("--output", default="output",
+                        help="output directory path (geometry datasets are saved into '{output}/{geometry}').")
+    parser.add_argument("--config", default="config.toml", help="config file path.")
+    parser.add_argument("--shard-size", type=int, default=1024, help="sample nums of each shard.")
+    parser.add_argument("--chunk-size", type=int, default=64, help="sample nums of each worker task in file format.")
+    parser.add_argument("--codec", default=None, help="hdf5 codec (such as none, lzf, gzip-4 or gzip-1+shuffle).")
+    parser.add_argument("--precision", default="float64", choices=hdf5_util.PRECISIONS, help="storage precision.")
+    parser.add_argument("--resample-nums", type=int, default=None,
+                        help="point nums of each sample resampled to (not resampled if empty).")
+    parser.add_argument("--resample-method", default="arc_length", choices=resample_util.RESAMPLE_METHODS,
+                        help="resample method (uniform along arc length, or farthest point sampling).")
+    parser.add_argument("--node-id", type=int, default=0, help="node id (from 0) of multi-node run.")
+    parser.add_argument("--node-count", type=int, default=1, help="node nums of multi-node run.")
+    parser.add_argument("--merge", action="store_true",
+                        help="merge the node manifests of each geometry into one manifest instead of generating.")
+    parser.add_argument("--no-resume", action="store_true", help="start over instead of skipping finished files.")
+    parser.add_argument("--verify", action="store_true", help="verify checksum of finished files on resume.")
+    parser.add_argument("--interval", type=float, default=1.0, help="min interval (in seconds) of progress reports.")
+    parser.add_argument("--verbose", action="store_true", help="log each generated sample.")
+    return parser
+
+
+if __name__ == "__main__":
+    args = get_parser().parse_args()
+    strokes_generator = StrokesGenerator(args.config)
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    logger = logging.getLogger("progress")
+    logger.setLevel(logging.INFO)
+    names = strokes_generator.list_geometries_name() if not args.geometries else args.geometries
+
+    if args.merge:
+        if args.count is None:
+            get_parser().error("--count is required by --merge, to find the missing samples at the end.")
+        for name in names:
+            output_path = os.path.join(args.output, name)
+            entries = manifest_util.merge_manifests([output_path], output_path, args.count, args.verify)
+            logger.info(f"{name}: merged {len(entries)} files of {args.count} samples.")
+    else:
+        count = 1 if args.count is None else args.count
+        codec = None if args.codec is None else Codec.parse(args.codec)
+        os.makedirs(args.output, exist_ok=True)
+        total = ProgressReporter("total", args.interval, logger)
+        totals = {"samples": 0, "points": 0, "bytes": 0}
+        for index, name in enumerate(names):
+            reporter = ProgressReporter(name, args.interval, logger)
 
-OUTPUT_PATH = "D:\\ResearchProjects\\BuildingSketch\\Datasets\\TrainHDF5\\freeform"
-STROKES_NUMS = 3700
-strokes_generator = StrokesGenerator()
-# strokes_generator.get_all_geometries_strokes(f"{OUTPUT_PATH}", STROKES_NUMS)
-for i in range(1, STROKES_NUMS):
-    print(i)
-    strokes_generator.get_geometry_strokes("freeform", f"{OUTPUT_PATH}\\{i + 1}.hdf5")
+            def report(stats: dict[str, int], pending: int) -> None:
+                """
+                Report progress of geometry and total progress after each finished chunk, the pending sample nums of
+                the rest geometries are estimated as the same as the current geometry.
+                :param stats: Generated sample, point and byte nums of geometry.
+                :param pending: Sample nums to generate of geometry.
+                """
+                reporter.update(stats, pending)
+                total.update({key: totals[key] + stats[key] for key in totals},
+                             totals["samples"] + pending * (len(names) - index))
 
+            stats = strokes_generator.generate_dataset(
+                name, count, os.path.join(args.output, name), workers=args.workers, seed=args.seed,
+                chunk_size=args.chunk_size, output_format=args.format, shard_size=args.shard_size, codec=codec,
+                precision=args.precision, resample_nums=args.resample_nums, resample_method=args.resample_method,
+                resume=not args.no_resume, verify=args.verify, node_id=args.node_id, node_count=args.node_count,
+                progress=report)
+            if stats["skipped"] > 0:
+                logger.info(f"{name}: skipped {stats['skipped']} samples generated before.")
+            for key in totals:
+                totals[key] += stats[key]
+        logger.info(f"total: {progress_util.format_bytes(totals['bytes'])} written.")
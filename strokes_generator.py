@@ -1,16 +1,18 @@
 import logging
 import os.path
 import re
-from typing import Dict, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Iterator, Callable, Mapping
 
 import toml
-from matplotlib import pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+from numpy.random import Generator
 
 from geometry import BaseGeometryHandler, ConeHandler, CuboidHandler, CylinderHandler, HemisphereHandler, \
     PyramidHandler, ShedHandler, PlatformHandler, HipHandler, FreeformHandler
-from meta import Strokes, FreeformStrokes
-from utils import assert_util, hdf5_util
+from meta import Strokes, FreeformStrokes, StrokesBatch
+from utils import assert_util, hdf5_util, random_util, trace_util, manifest_util, resample_util
+from utils.hdf5_util import Codec
+from utils.trace_util import Tracer
 
 
 class StrokesGenerator:
@@ -30,6 +32,9 @@ class StrokesGenerator:
         logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(asctime)s - %(filename)s - %(message)s")
         self.__LOGGER__: logging.Logger = logging.getLogger()
         self.__generator_config__: Dict[str, Any] = {}
+        self.__config_file_path__: str = config_file_path
+        self.__tracer__: Tracer = trace_util.NULL_TRACER
+        self.__variants__: Dict[str, tuple[tuple | Generator, Mapping[str, Any], StrokesBatch, int]] = {}
 
         assert_util.is_not_none(re.match(r".*\.toml", config_file_path),
                                 "extension of config file name '{0}' is not 'toml'.", config_file_path)
@@ -50,7 +55,8 @@ class StrokesGenerator:
                             "can not find geometry config of '{0}'", geometry_name)
         geometry.set_config(self.__generator_config__[geometry_name])
 
-        geometry.validate()
+        geometry.compile()
+        geometry.set_tracer(self.__tracer__)
         self.__geometry_map__[geometry_name] = geometry
         self.__LOGGER__.info(f"loaded geometry: {geometry_name}.")
 
@@ -68,45 +74,180 @@ class StrokesGenerator:
         self.load_geometry(HipHandler())
         self.load_geometry(FreeformHandler())
 
+    def set_tracer(
+            self,
+            tracer: Tracer = None
+    ) -> None:
+        """
+        Set the tracer of generation stages for all geometries (disable tracing if None).
+        Only the stages of the current process are recorded, samples generated by worker processes are not traced.
+        :param tracer: Stage tracer.
+        """
+        self.__tracer__ = trace_util.NULL_TRACER if tracer is None else tracer
+        for geometry in self.__geometry_map__.values():
+            geometry.set_tracer(self.__tracer__)
+
+    def get_tracer(self) -> Tracer:
+        """
+        Get the tracer of generation stages.
+        :return: Stage tracer.
+        """
+        return self.__tracer__
+
     def get_geometry_strokes(
             self,
             geometry_name: str,
-            output_path: str = None
+            output_path: str = None,
+            writer: hdf5_util.FileWriter | hdf5_util.ShardWriter | hdf5_util.AsyncWriter = None,
+            file_name: str = None,
+            rng: Generator = None,
+            precision: str = "float64",
+            seed: int = None,
+            index: int = 0,
+            resample_nums: int = None,
+            resample_method: str = "arc_length"
     ) -> Strokes:
         """
         Get geometry strokes and save strokes.
+        If the geometry has k variants, each generated base shape is used by k strokes with their own rigid transform.
         :param geometry_name: Geometry handler builtin name.
         :param output_path: Output file path.
+        :param writer: Hdf5 writer (file, shard or async writer).
+        :param file_name: Sample name of writer.
+        :param rng: Random generator of sample (used if seed is None).
+        :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+        :param seed: Base seed, the strokes is seeded by (seed, geometry, index // variants) if it is not None.
+        :param index: Sample index of seeded strokes.
+        :param resample_nums: Point nums of strokes resampled to (not resampled if None).
+        :param resample_method: Resample method ('arc_length' or 'farthest_point').
         :return: Generated strokes.
         """
         geometry = self.get_geometry(geometry_name)
-        geometry.validate()
-        geometry.load_config()
-        strokes = geometry.generate_strokes()
+        tracer = self.__tracer__
+        with tracer.sample(geometry_name, file_name):
+            with tracer.stage("config"):
+                geometry.compile()
+            with tracer.stage("generate"):
+                strokes = self.__generate_strokes__(geometry, rng, seed, index)
+            if resample_nums is not None:
+                with tracer.stage("resample"):
+                    strokes = strokes.resample_points(resample_nums, resample_method)
 
-        if output_path is not None:
-            datas = [strokes.get_value()]
-            data_names = ["value"]
-            dtypes = ["float"]
-            if isinstance(strokes, FreeformStrokes):
-                datas.append(strokes.get_types())
-                data_names.append("types")
-                dtypes.append("int")
-            hdf5_util.save_file(output_path, datas, data_names, dtypes)
+            if output_path is not None or writer is not None:
+                with tracer.stage("write"):
+                    datas, data_names, dtypes = self.get_strokes_datas(strokes, precision)
+                    if output_path is not None:
+                        hdf5_util.save_file(output_path, datas, data_names, dtypes)
+                    if writer is not None:
+                        writer.write(datas, data_names, dtypes, file_name)
 
         self.__LOGGER__.info(f"generated geometry: {geometry_name}.")
 
         return strokes
 
+    def __generate_strokes__(
+            self,
+            geometry: BaseGeometryHandler,
+            rng: Generator = None,
+            seed: int = None,
+            index: int = 0
+    ) -> Strokes:
+        """
+        Generate strokes, or take the next variant of the last base shape of geometry (generated by the same seed or
+        generator, with the same compiled config).
+        Seeded strokes i is the variant (i % variants) of base shape seeded by (seed, geometry, i // variants),
+        so it is the same whichever order (or process) the samples are generated in.
+        :param geometry: Geometry handler.
+        :param rng: Random generator of sample (used if seed is None).
+        :param seed: Base seed.
+        :param index: Sample index of seeded strokes.
+        :return: Generated strokes.
+        """
+        geometry_name = geometry.prototype().get_name()
+        if geometry.variants == 1:
+            rng = rng if seed is None else random_util.get_sample_generator(seed, geometry_name, index)
+            return geometry.generate_strokes(rng)
+
+        # the cached base shape is only reused with the same compiled config (params are replaced on recompile)
+        params = geometry.compile()
+        cached = self.__variants__.get(geometry_name)
+        if seed is None:
+            # and only by the same generator, so a fresh generator never gets the variants of another one
+            rng = random_util.get_generator(rng)
+            if cached is None or cached[0] is not rng or cached[1] is not params or cached[3] >= len(cached[2]):
+                cached = (rng, params, geometry.generate_variants(rng=rng), 0)
+            source, params, batch, variant = cached
+            self.__variants__[geometry_name] = (source, params, batch, variant + 1)
+        else:
+            base_index, variant = divmod(index, geometry.variants)
+            key = (seed, base_index, geometry.variants)
+            if cached is None or cached[0] != key or cached[1] is not params:
+                rng = random_util.get_sample_generator(seed, geometry_name, base_index)
+                self.__variants__[geometry_name] = (key, params, geometry.generate_variants(rng=rng), 0)
+            batch = self.__variants__[geometry_name][2]
+        return batch.get_strokes(variant)
+
+    def get_geometry_batch(
+            self,
+            geometry_name: str,
+            k: int,
+            rng: Generator = None
+    ) -> StrokesBatch:
+        """
+        Get batch of k geometry strokes in one (vectorized, if the handler supports) pass.
+        :param geometry_name: Geometry handler builtin name.
+        :param k: Strokes nums.
+        :param rng: Random generator of batch.
+        :return: Strokes batch.
+        """
+        geometry = self.get_geometry(geometry_name)
+        geometry.compile()
+        batch = geometry.generate_batch(k, rng)
+
+        self.__LOGGER__.info(f"generated geometry batch: {geometry_name} (k: {k}).")
+
+        return batch
+
+    def get_sample_strokes(
+            self,
+            geometry_name: str,
+            seed: int,
+            index: int
+    ) -> Strokes:
+        """
+        Regenerate one sample of geometry strokes by its (base seed, geometry, sample index).
+        :param geometry_name: Geometry handler builtin name.
+        :param seed: Base seed.
+        :param index: Sample index.
+        :return: Generated strokes.
+        """
+        return self.get_geometry_strokes(geometry_name, file_name=str(index + 1), seed=seed, index=index)
+
     def get_all_geometries_strokes(
             self,
             output_path: str = None,
-            nums: int = 1
+            nums: int = 1,
+            output_format: str = "file",
+            shard_size: int = 1024,
+            queue_size: int = 0,
+            codec: Codec = None,
+            precision: str = "float64",
+            resample_nums: int = None,
+            resample_method: str = "arc_length"
     ) -> dict[str, list[Strokes]]:
         """
-        Get all geometries strokes and save all strokes.
+        Get all geometries strokes and save all strokes (saved as they are generated).
         :param output_path: Output file path.
         :param nums: Stroke nums of each geometry.
+        :param output_format: Output format ('file' for one file each sample, 'shard' or 'ragged').
+        :param shard_size: Sample nums of each shard.
+        :param queue_size: Queue size of background writer thread of each geometry (writing in place if 0, the traced
+            'write' stage only covers queueing if positive).
+        :param codec: Hdf5 dataset codec (gzip-4 if None).
+        :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+        :param resample_nums: Point nums of each strokes resampled to (not resampled if None), the fixed-shape
+            datas are stacked as dense tensors of shard in 'shard' and 'ragged' format.
+        :param resample_method: Resample method ('arc_length' or 'farthest_point').
         :return: A dict of all geometries strokes.
         """
         names = self.list_geometries_name()
@@ -114,30 +255,302 @@ class StrokesGenerator:
         for name in names:
             strokes_map[name] = []
 
-        for i in range(0, nums):
-            self.__LOGGER__.info(f"start to generate all strokes (turns: {i + 1})")
-            for name in names:
-                strokes_arr = strokes_map[name]
-                strokes_arr.append(self.get_geometry_strokes(name))
-                strokes_map[name] = strokes_arr
+        for name, _, strokes in self.iter_strokes(names, nums, output_path, output_format, shard_size,
+                                                queue_size=queue_size, codec=codec, precision=precision,
+                                                resample_nums=resample_nums, resample_method=resample_method):
+            strokes_map[name].append(strokes)
+
+        return strokes_map
+
+    def iter_strokes(
+            self,
+            geometry_names: list[str] = None,
+            count: int = 1,
+            output_path: str = None,
+            output_format: str = "file",
+            shard_size: int = 1024,
+            seed: int = None,
+            queue_size: int = 0,
+            codec: Codec = None,
+            precision: str = "float64",
+            resample_nums: int = None,
+            resample_method: str = "arc_length"
+    ) -> Iterator[tuple[str, int, Strokes]]:
+        """
+        Iterate geometries strokes turn by turn, and save each strokes as soon as it is generated.
+        Only the strokes of the current turn (and the unsaved shards) are held in memory.
+        :param geometry_names: Geometry handler builtin names (all geometries if None).
+        :param count: Stroke nums of each geometry.
+        :param output_path: Output directory path (strokes are saved into '{output_path}/{geometry name}').
+        :param output_format: Output format ('file' for one file each sample, 'shard' or 'ragged').
+        :param shard_size: Sample nums of each shard.
+        :param seed: Base seed, strokes are seeded by (seed, geometry, sample index) if it is not None.
+        :param queue_size: Queue size of background writer thread of each geometry (writing in place if 0, the traced
+            'write' stage only covers queueing if positive).
+        :param codec: Hdf5 dataset codec (gzip-4 if None).
+        :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+        :param resample_nums: Point nums of each strokes resampled to (not resampled if None), the fixed-shape
+            datas are stacked as dense tensors of shard in 'shard' and 'ragged' format.
+        :param resample_method: Resample method ('arc_length' or 'farthest_point').
+        :return: Iterator of (geometry name, sample index, strokes).
+        """
+        names = self.list_geometries_name() if geometry_names is None else list(geometry_names)
+        for name in names:
+            self.get_geometry(name)
 
+        writers = {}
+        try:
+            if output_path is not None:
+                hdf5_util.validate_directory_path(output_path)
+                if not os.path.exists(output_path):
+                    os.makedirs(output_path)
+                for name in names:
+                    writers[name] = hdf5_util.get_writer(output_format, os.path.join(output_path, name), shard_size,
+                                                         queue_size=queue_size, codec=codec,
+                                                         dense=resample_nums is not None)
+
+            for i in range(0, count):
+                self.__LOGGER__.info(f"start to generate all strokes (turns: {i + 1})")
+                for name in names:
+                    yield name, i, self.get_geometry_strokes(name, writer=writers.get(name), file_name=str(i + 1),
+                                                             precision=precision, seed=seed, index=i,
+                                                             resample_nums=resample_nums,
+                                                             resample_method=resample_method)
+        finally:
+            for name, writer in writers.items():
+                writer.close()
+                self.__LOGGER__.info(f"generated geometry saved: {name}.")
+
+    def generate_dataset(
+            self,
+            geometry_name: str,
+            count: int,
+            output_path: str = None,
+            workers: int = 1,
+            seed: int = None,
+            chunk_size: int = 64,
+            output_format: str = "file",
+            shard_size: int = 1024,
+            queue_size: int = 0,
+            codec: Codec = None,
+            precision: str = "float64",
+            resample_nums: int = None,
+            resample_method: str = "arc_length",
+            resume: bool = True,
+            verify: bool = False,
+            node_id: int = 0,
+            node_count: int = 1,
+            progress: Callable[[dict[str, int], int], None] = None
+    ) -> dict[str, int]:
+        """
+        Generate dataset of geometry strokes, and spread the samples across a process pool.
+        Each sample is seeded by (seed, geometry, sample index), so the dataset is identical to a serial run.
+        With k variants of geometry, sample i is a variant of base shape (i // k), a chunk size of multiple of k
+        avoids generating a base shape in two chunks.
+        Finished output files are appended to the manifest of output directory (with seed, checksum and size),
+        so that a restarted run skips them and regenerates the rest (including partially written files).
+        Across nodes, chunk c is generated by node (c % node count) into its own shards and node manifest,
+        and manifest_util.merge_manifests combines the node manifests into one dataset index.
+        :param geometry_name: Geometry handler builtin name.
+        :param count: Sample nums.
+        :param output_path: Output directory path (sample i is named '{i + 1}').
+        :param workers: Worker process nums (1 for serial).
+        :param seed: Base seed (a new one from system entropy if None).
+        :param chunk_size: Sample nums of each worker task (equals to shard size in 'shard' and 'ragged' format).
+        :param output_format: Output format ('file' for one file each sample, 'shard' or 'ragged').
+        :param shard_size: Sample nums of each shard.
+        :param queue_size: Queue size of background writer thread of each chunk (writing in place if 0, the traced
+            'write' stage only covers queueing if positive).
+        :param codec: Hdf5 dataset codec (gzip-4 if None).
+        :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+        :param resample_nums: Point nums of each strokes resampled to (not resampled if None), the fixed-shape
+            datas are stacked as dense tensors of shard in 'shard' and 'ragged' format.
+        :param resample_method: Resample method ('arc_length' or 'farthest_point').
+        :param resume: Whether skip the files finished in manifest (the seed of manifest is used if seed is None),
+            or start over with a new manifest. The manifest should be of the same codec, precision and resampling.
+        :param verify: Whether verify checksum (not only size) of finished files on resume.
+        :param node_id: Node id (from 0) of multi-node run.
+        :param node_count: Node nums of multi-node run (the seed should be given, or be recorded in node manifest).
+        :param progress: Callback of (stats, sample nums to generate) after each finished chunk.
+        :return: Generated, skipped sample nums (of the chunks of node), generated point nums and output file bytes.
+        """
+        self.get_geometry(geometry_name)
+        manifest_util.validate_node(node_id, node_count)
+        assert_util.is_true(count >= 0, "sample count '{0}' can not be negative.", count)
+        assert_util.is_true(workers >= 1, "worker nums '{0}' should be positive.", workers)
+        assert_util.is_true(output_format in hdf5_util.OUTPUT_FORMATS,
+                            "output format '{0}' is not supported.", output_format)
+        assert_util.is_true(precision in hdf5_util.PRECISIONS, "storage precision '{0}' is not supported.", precision)
+        assert_util.is_true(resample_method in resample_util.RESAMPLE_METHODS,
+                            "resample method '{0}' is not supported.", resample_method)
+        chunk_size = shard_size if output_format in hdf5_util.SHARD_FORMATS else chunk_size
+        assert_util.is_true(chunk_size >= 1, "chunk size '{0}' should be positive.", chunk_size)
+        completed = {}
         if output_path is not None:
             hdf5_util.validate_directory_path(output_path)
             if not os.path.exists(output_path):
                 os.makedirs(output_path)
-            for name in names:
-                datas = [[strokes.get_value(), strokes.get_types()] if isinstance(strokes, FreeformStrokes)
-                         else [strokes.get_value()] for strokes in strokes_map[name]]
-                data_names = [["value", "types"] if isinstance(strokes, FreeformStrokes)
-                              else ["value"] for strokes in strokes_map[name]]
-                dtypes = [["float", "int"] if isinstance(strokes, FreeformStrokes)
-                          else ["float"] for strokes in strokes_map[name]]
-                hdf5_util.save_files(directory_path=f"{output_path}\\{name}",
-                                     datas=datas, data_names=data_names, dtypes=dtypes)
+            if resume:
+                manifest_seed = manifest_util.get_manifest_seed(output_path, node_id, node_count)
+                assert_util.is_true(seed is None or manifest_seed is None or seed == manifest_seed,
+                                    "seed '{0}' is different from the seed '{1}' of manifest.", seed, manifest_seed)
+                seed = manifest_seed if seed is None else seed
+                options = _get_entry_options_(codec, precision, resample_nums, resample_method)
+                completed = manifest_util.get_completed_entries(output_path, geometry_name, output_format, verify,
+                                                                node_id, node_count, options)
+            elif os.path.exists(manifest_util.get_manifest_path(output_path, node_id, node_count)):
+                os.remove(manifest_util.get_manifest_path(output_path, node_id, node_count))
+        assert_util.is_true(seed is not None or node_count == 1, "seed of multi-node run can not be None.")
+        seed = random_util.new_base_seed() if seed is None else seed
+        self.__LOGGER__.info(f"start to generate dataset: {geometry_name} "
+                             f"(count: {count}, seed: {seed}, node: {node_id + 1}/{node_count}).")
 
-                self.__LOGGER__.info(f"generated geometry saved: {name}.")
+        tasks = []
+        node_samples = 0
+        for start in range(node_id * chunk_size, count, node_count * chunk_size):
+            end = min(start + chunk_size, count)
+            node_samples += end - start
+            if output_format in hdf5_util.SHARD_FORMATS:
+                entry = completed.get(hdf5_util.get_shard_file_name(output_format, start // chunk_size))
+                indices = None if entry is None or (entry["id"], entry["count"]) != (start + 1, end - start) else []
+            else:
+                indices = [i for i in range(start, end) if f"{i + 1}.hdf5" not in completed]
+            if indices != []:
+                tasks.append((start, end, indices))
 
-        return strokes_map
+        stats = {"samples": 0, "skipped": 0, "points": 0, "bytes": 0}
+        pending = sum(end - start if indices is None else len(indices) for start, end, indices in tasks)
+        if workers == 1:
+            for start, end, indices in tasks:
+                self.__record_chunk__(output_path, stats, self.__generate_chunk__(
+                    geometry_name, start, end, output_path, seed, output_format, start // chunk_size, queue_size,
+                    codec, precision, indices, resample_nums, resample_method), node_id, node_count)
+                if progress is not None:
+                    progress(stats, pending)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker_,
+                                     initargs=(self.__config_file_path__, self.__LOGGER__.level)) as executor:
+                futures = [executor.submit(_generate_chunk_, geometry_name, start, end, output_path, seed,
+                                           output_format, start // chunk_size, queue_size, codec, precision, indices,
+                                           resample_nums, resample_method)
+                           for start, end, indices in tasks]
+                for future in as_completed(futures):
+                    self.__record_chunk__(output_path, stats, future.result(), node_id, node_count)
+                    if progress is not None:
+                        progress(stats, pending)
+        stats["skipped"] = node_samples - stats["samples"]
+
+        self.__LOGGER__.info(f"generated dataset: {geometry_name} "
+                             f"(samples: {stats['samples']}, skipped: {stats['skipped']}).")
+        return stats
+
+    @classmethod
+    def __record_chunk__(
+            cls,
+            output_path: str | None,
+            stats: dict[str, int],
+            result: dict[str, Any],
+            node_id: int = 0,
+            node_count: int = 1
+    ) -> None:
+        """
+        Add the result of finished chunk into stats, and append its files into manifest (of node).
+        :param output_path: Output directory path.
+        :param stats: Generated sample, point nums and output file bytes.
+        :param result: Chunk result.
+        :param node_id: Node id (from 0).
+        :param node_count: Node nums.
+        """
+        stats["samples"] += result["samples"]
+        stats["points"] += result["points"]
+        stats["bytes"] += sum(entry["size"] for entry in result["entries"])
+        if output_path is not None:
+            manifest_util.append_manifest(output_path, result["entries"], node_id, node_count)
+
+    def __generate_chunk__(
+            self,
+            geometry_name: str,
+            start: int,
+            end: int,
+            output_path: str,
+            seed: int,
+            output_format: str = "file",
+            shard_index: int = 0,
+            queue_size: int = 0,
+            codec: Codec = None,
+            precision: str = "float64",
+            indices: list[int] = None,
+            resample_nums: int = None,
+            resample_method: str = "arc_length"
+    ) -> dict[str, Any]:
+        """
+        Generate samples [start, end) of geometry, seeded by sample index.
+        In 'shard' and 'ragged' format the chunk is saved as one shard.
+        :param geometry_name: Geometry handler builtin name.
+        :param start: Start sample index.
+        :param end: End sample index (excluded).
+        :param output_path: Output directory path.
+        :param seed: Base seed.
+        :param output_format: Output format ('file', 'shard' or 'ragged').
+        :param shard_index: Shard index of chunk.
+        :param queue_size: Queue size of background writer thread (writing in place if 0).
+        :param codec: Hdf5 dataset codec (gzip-4 if None).
+        :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+        :param indices: Sample indices of chunk to generate in 'file' format (all of [start, end) if None).
+        :param resample_nums: Point nums of each strokes resampled to (not resampled if None).
+        :param resample_method: Resample method ('arc_length' or 'farthest_point').
+        :return: Generated sample and point nums, and manifest entries of finished files.
+        """
+        indices = list(range(start, end)) if indices is None or output_format in hdf5_util.SHARD_FORMATS \
+            else indices
+        writer = None if output_path is None \
+            else hdf5_util.get_writer(output_format, output_path, max(end - start, 1), shard_index, queue_size, codec,
+                                      resample_nums is not None)
+        points = 0
+        try:
+            for i in indices:
+                strokes = self.get_geometry_strokes(geometry_name, writer=writer, file_name=str(i + 1),
+                                                    precision=precision, seed=seed, index=i,
+                                                    resample_nums=resample_nums, resample_method=resample_method)
+                points += len(strokes.get_value())
+        except BaseException:
+            # the incomplete shard of a failed chunk is not saved, so that it is never mistaken for a finished one
+            if writer is not None:
+                writer.abort()
+            raise
+        if writer is not None:
+            writer.close()
+
+        entries = []
+        options = _get_entry_options_(codec, precision, resample_nums, resample_method)
+        if output_path is not None and output_format in hdf5_util.SHARD_FORMATS and end > start:
+            file_name = hdf5_util.get_shard_file_name(output_format, shard_index)
+            entries.append(manifest_util.get_entry(output_path, file_name, geometry_name, seed, start, end - start,
+                                                   output_format, options))
+        elif output_path is not None:
+            entries += [manifest_util.get_entry(output_path, f"{i + 1}.hdf5", geometry_name, seed, i, 1, output_format,
+                                                options)
+                        for i in indices]
+        return {"samples": len(indices), "points": points, "entries": entries}
+
+    @classmethod
+    def get_strokes_datas(
+            cls,
+            strokes: Strokes,
+            precision: str = "float64"
+    ) -> tuple[list, list[str], list[str]]:
+        """
+        Get hdf5 datas, data names and dtypes of strokes.
+        :param strokes: Strokes or freeform strokes.
+        :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+        :return: Datas, data names and dtypes.
+        """
+        datas, data_names, dtypes = hdf5_util.encode_value(strokes.get_value(), precision)
+        if isinstance(strokes, FreeformStrokes):
+            datas.append(strokes.get_types())
+            data_names.append("types")
+            dtypes.append("int")
+        return datas, data_names, dtypes
 
     def get_geometry(
             self,
@@ -160,19 +573,86 @@ class StrokesGenerator:
         return list(self.__geometry_map__.keys())
 
 
+_worker_generator_: StrokesGenerator | None = None
+
+
+def _get_entry_options_(
+        codec: Codec = None,
+        precision: str = "float64",
+        resample_nums: int = None,
+        resample_method: str = "arc_length"
+) -> dict[str, Any]:
+    """
+    Get encoding options of output files recorded in manifest entries.
+    :param codec: Hdf5 dataset codec (gzip-4 if None).
+    :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+    :param resample_nums: Point nums of each strokes resampled to (not resampled if None).
+    :param resample_method: Resample method ('arc_length' or 'farthest_point').
+    :return: Encoding options (the resample method is None if not resampled).
+    """
+    return {
+        "codec": str(hdf5_util.DEFAULT_CODEC if codec is None else codec),
+        "precision": precision,
+        "resample_nums": resample_nums,
+        "resample_method": None if resample_nums is None else resample_method
+    }
+
+
+def _init_worker_(
+        config_file_path: str,
+        log_level: int = logging.INFO
+) -> None:
+    """
+    Init strokes generator (and its geometry handlers) of worker process.
+    :param config_file_path: Config file path.
+    :param log_level: Log level of worker process (the level of parent process).
+    """
+    global _worker_generator_
+    _worker_generator_ = StrokesGenerator(config_file_path)
+    logging.getLogger().setLevel(log_level)
+
+
+def _generate_chunk_(
+        geometry_name: str,
+        start: int,
+        end: int,
+        output_path: str,
+        seed: int,
+        output_format: str = "file",
+        shard_index: int = 0,
+        queue_size: int = 0,
+        codec: Codec = None,
+        precision: str = "float64",
+        indices: list[int] = None,
+        resample_nums: int = None,
+        resample_method: str = "arc_length"
+) -> dict[str, Any]:
+    """
+    Generate samples [start, end) of geometry in worker process.
+    :param geometry_name: Geometry handler builtin name.
+    :param start: Start sample index.
+    :param end: End sample index (excluded).
+    :param output_path: Output directory path.
+    :param seed: Base seed.
+    :param output_format: Output format ('file', 'shard' or 'ragged').
+    :param shard_index: Shard index of chunk.
+    :param queue_size: Queue size of background writer thread (writing in place if 0).
+    :param codec: Hdf5 dataset codec (gzip-4 if None).
+    :param precision: Storage precision of points ('float64', 'float32', 'float16' or 'int16').
+    :param indices: Sample indices of chunk to generate in 'file' format (all of [start, end) if None).
+    :param resample_nums: Point nums of each strokes resampled to (not resampled if None).
+    :param resample_method: Resample method ('arc_length' or 'farthest_point').
+    :return: Generated sample and point nums, and manifest entries of finished files.
+    """
+    return _worker_generator_.__generate_chunk__(geometry_name, start, end, output_path, seed, output_format,
+                                                 shard_index, queue_size, codec, precision, indices,
+                                                 resample_nums, resample_method)
+
+
 if __name__ == "__main__":
     # main demo
     strokes_generator = StrokesGenerator()
     points = strokes_generator.get_geometry_strokes("freeform").get_value()
 
-    # fig = plt.figure()
-    # ax = Axes3D(fig)
-    #
-    # ax.scatter(points[:, 0], points[:, 1], points[:, 2], s=1)
-    # ax.set_xlabel('X label')
-    # ax.set_ylabel('Y label')
-    # ax.set_zlabel('Z label')
-    #
-    # fig.add_axes(ax)
-    # plt.show()
-
+    # from utils import plot_util
+    # plot_util.show_points3d(points)
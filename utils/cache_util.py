@@ -0,0 +1,163 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from utils import assert_util
+
+
+class LRUCache:
+    """
+    Bounded cache with least recently used eviction. Count hits and misses for sizing the cache.
+    The bound is of item nums, or of item sizes (such as bytes) if the size function is given.
+    """
+
+    def __init__(
+            self,
+            max_size: int = 128,
+            get_size: Callable[[Any], int] = None,
+            on_evict: Callable[[Hashable, Any], None] = None
+    ) -> None:
+        """
+        Init LRU cache.
+        :param max_size: Max total size of items (no caching if 0).
+        :param get_size: Get size of item (1 of each item if None).
+        :param on_evict: Callback of evicted (or dropped) item, such as closing a handle.
+        """
+        self.__items__: OrderedDict = OrderedDict()
+        self.__sizes__: dict[Hashable, int] = {}
+        self.__lock__: threading.Lock = threading.Lock()
+        self.__get_size__: Callable[[Any], int] = (lambda item: 1) if get_size is None else get_size
+        self.__on_evict__: Callable[[Hashable, Any], None] | None = on_evict
+        self.max_size: int = 0
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.resize(max_size)
+
+    def __len__(self) -> int:
+        """
+        Get item nums of cache.
+        :return: Item nums.
+        """
+        return len(self.__items__)
+
+    def get(
+            self,
+            key: Hashable,
+            factory: Callable[[], Any]
+    ) -> Any:
+        """
+        Get item of key, or create it by factory (and cache it) if it is missed.
+        :param key: Item key.
+        :param factory: Item factory.
+        :return: Item.
+        """
+        with self.__lock__:
+            if key in self.__items__:
+                self.hits += 1
+                self.__items__.move_to_end(key)
+                return self.__items__[key]
+            self.misses += 1
+
+        return self.put(key, factory())
+
+    def get_if_present(
+            self,
+            key: Hashable
+    ) -> Any:
+        """
+        Get item of key if it is cached (counted as hit or miss).
+        :param key: Item key.
+        :return: Item, or None if it is missed.
+        """
+        with self.__lock__:
+            if key in self.__items__:
+                self.hits += 1
+                self.__items__.move_to_end(key)
+                return self.__items__[key]
+            self.misses += 1
+            return None
+
+    def put(
+            self,
+            key: Hashable,
+            item: Any
+    ) -> Any:
+        """
+        Cache item of key (not cached if its size is over max size), evicting least recently used items.
+        If the key is already cached (such as by another thread), the cached item is kept and the new one is dropped.
+        :param key: Item key.
+        :param item: Item.
+        :return: Cached item of key.
+        """
+        size = self.__get_size__(item)
+        with self.__lock__:
+            if key in self.__items__:
+                self.__items__.move_to_end(key)
+                existing = self.__items__[key]
+                self.__drop__(key, item)
+                return existing
+            if size > self.max_size:
+                return item
+            self.__items__[key] = item
+            self.__sizes__[key] = size
+            self.size += size
+            self.__evict__()
+        return item
+
+    def resize(
+            self,
+            max_size: int
+    ) -> None:
+        """
+        Resize cache, evicting least recently used items over max size.
+        :param max_size: Max total size of items (no caching if 0).
+        """
+        assert_util.is_true(max_size >= 0, "cache size '{0}' can not be negative.", max_size)
+        with self.__lock__:
+            self.max_size = max_size
+            self.__evict__()
+
+    def __evict__(self) -> None:
+        """
+        Evict least recently used items over max size.
+        """
+        while self.size > self.max_size:
+            key, item = self.__items__.popitem(last=False)
+            self.size -= self.__sizes__.pop(key)
+            self.__drop__(key, item)
+
+    def __drop__(
+            self,
+            key: Hashable,
+            item: Any
+    ) -> None:
+        """
+        Call back the evicted (or dropped) item.
+        :param key: Item key.
+        :param item: Item.
+        """
+        if self.__on_evict__ is not None:
+            self.__on_evict__(key, item)
+
+    def clear(self) -> None:
+        """
+        Clear (evict) cached items and counters.
+        """
+        with self.__lock__:
+            while len(self.__items__) > 0:
+                key, item = self.__items__.popitem(last=False)
+                self.__drop__(key, item)
+            self.__sizes__.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_info(self) -> dict[str, int]:
+        """
+        Get cache info.
+        :return: Hits, misses, items, size and max size of cache.
+        """
+        with self.__lock__:
+            return {"hits": self.hits, "misses": self.misses, "items": len(self.__items__), "size": self.size,
+                    "max_size": self.max_size}
@@ -0,0 +1,259 @@
+import os.path
+import re
+import threading
+from typing import Any, Hashable
+
+import h5py
+import numpy as np
+from numpy import ndarray
+from typing_extensions import Self
+
+from utils import assert_util, hdf5_util, manifest_util
+from utils.cache_util import LRUCache
+
+_SHARD_FILE_PATTERN_ = re.compile(r"^(shard|ragged)-\d+\.hdf5$")
+
+
+def _get_natural_key_(file_name: str) -> tuple:
+    """
+    Get natural sort key of file name (so that '2.hdf5' is before '10.hdf5').
+    :param file_name: File name.
+    :return: Sort key.
+    """
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", file_name))
+
+
+def _get_sample_size_(sample: dict[str, ndarray]) -> int:
+    """
+    Get bytes of decoded sample.
+    :param sample: Dict of data name -> data.
+    :return: Bytes of sample.
+    """
+    return sum(data.nbytes for data in sample.values())
+
+
+def _close_handle_(
+        key: Hashable,
+        handle: Any
+) -> None:
+    """
+    Close evicted file handle.
+    :param key: File index.
+    :param handle: Hdf5 file or ragged reader.
+    """
+    handle.close()
+
+
+def _decode_sample_(datas: dict[str, ndarray]) -> dict[str, ndarray]:
+    """
+    Decode sample datas, the (any precision) value datas are decoded into one float64 'value'.
+    :param datas: Dict of data name -> data.
+    :return: Dict of data name -> data.
+    """
+    sample = {"value": hdf5_util.decode_value(datas)}
+    for data_name, data in datas.items():
+        if data_name not in hdf5_util.VALUE_DATA_NAMES:
+            sample[data_name] = np.array(data)
+    return sample
+
+
+class DatasetReader:
+    """
+    Random-access reader of dataset directory (one file each sample, shard or ragged format).
+    The samples are indexed by the manifest of directory if it exists (such as the merged manifest of nodes),
+    or by the hdf5 files of directory in natural order.
+    Open files are kept in a bounded handle pool, decoded samples are kept in a LRU cache of memory budget,
+    and get_many reads the samples of one file together.
+    """
+
+    def __init__(
+            self,
+            directory_path: str,
+            max_handles: int = 32,
+            cache_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        """
+        Init dataset reader and index the samples of directory.
+        :param directory_path: Dataset directory path.
+        :param max_handles: Max open file nums.
+        :param cache_bytes: Memory budget (in bytes) of decoded samples cache (no caching if 0).
+        """
+        assert_util.is_true(os.path.isdir(directory_path), "could not find the directory path.")
+        assert_util.is_true(max_handles >= 1, "max handles '{0}' should be positive.", max_handles)
+        self.directory_path: str = directory_path
+        self.__handles__: LRUCache = LRUCache(max_handles, on_evict=_close_handle_)
+        self.__samples__: LRUCache = LRUCache(cache_bytes, get_size=_get_sample_size_)
+        self.__offsets__: dict[tuple[int, str], ndarray] = {}
+        self.__lock__: threading.RLock = threading.RLock()
+
+        entries = sorted({entry["file"]: entry for entry in manifest_util.load_manifest(directory_path)}.values(),
+                         key=lambda entry: entry["id"])
+        if len(entries) > 0:
+            self.__file_paths__: list[str] = [os.path.normpath(os.path.join(directory_path, entry["file"]))
+                                              for entry in entries]
+            self.__is_shard__: list[bool] = [entry["format"] in hdf5_util.SHARD_FORMATS for entry in entries]
+            self.__is_ragged__: list[bool] = [entry["format"] == "ragged" for entry in entries]
+            sample_nums = [entry["count"] for entry in entries]
+        else:
+            file_names = sorted((file_name for file_name in os.listdir(directory_path)
+                                 if os.path.splitext(file_name)[-1] == ".hdf5"), key=_get_natural_key_)
+            self.__file_paths__ = [os.path.join(directory_path, file_name) for file_name in file_names]
+            self.__is_shard__ = [_SHARD_FILE_PATTERN_.match(file_name) is not None for file_name in file_names]
+            self.__is_ragged__ = [file_name.startswith("ragged-") for file_name in file_names]
+            sample_nums = [self.__get_shard_sample_nums__(i) if self.__is_shard__[i] else 1
+                           for i in range(0, len(file_names))]
+        self.__file_index__: ndarray[int] = np.repeat(np.arange(len(sample_nums)), sample_nums)
+        self.__sample_index__: ndarray[int] = np.arange(len(self.__file_index__)) \
+            - np.repeat(np.cumsum(sample_nums) - sample_nums, sample_nums)
+
+    def __get_shard_sample_nums__(
+            self,
+            file_index: int
+    ) -> int:
+        """
+        Get sample nums of shard file.
+        :param file_index: File index.
+        :return: Sample nums.
+        """
+        handle = self.__get_handle__(file_index)
+        return len(handle) if self.__is_ragged__[file_index] else hdf5_util.get_shard_sample_nums(handle)
+
+    def __get_handle__(
+            self,
+            file_index: int
+    ) -> h5py.File | hdf5_util.RaggedReader:
+        """
+        Get open file of pool (ragged shard is memory-mapped).
+        :param file_index: File index.
+        :return: Hdf5 file or ragged reader.
+        """
+        file_path = self.__file_paths__[file_index]
+        factory = (lambda: hdf5_util.RaggedReader(file_path)) if self.__is_ragged__[file_index] \
+            else (lambda: hdf5_util.read_file(file_path))
+        return self.__handles__.get(file_index, factory)
+
+    def __get_shard_offsets__(
+            self,
+            file_index: int,
+            file: h5py.File,
+            data_name: str
+    ) -> ndarray[int]:
+        """
+        Get (cached) offsets of data in shard file.
+        :param file_index: File index.
+        :param file: Hdf5 shard file.
+        :param data_name: Data name.
+        :return: Offsets.
+        """
+        key = (file_index, data_name)
+        if key not in self.__offsets__:
+            self.__offsets__[key] = file.get(f"{data_name}_offsets")[()]
+        return self.__offsets__[key]
+
+    def __read_file__(
+            self,
+            file_index: int,
+            sample_indices: list[int]
+    ) -> list[dict[str, ndarray]]:
+        """
+        Read and decode samples of one file. Datas of shard (ragged or dense) are read in one slice of all samples.
+        :param file_index: File index.
+        :param sample_indices: Sorted sample indices in file.
+        :return: Decoded samples.
+        """
+        with self.__lock__:
+            handle = self.__get_handle__(file_index)
+            if self.__is_ragged__[file_index]:
+                return [_decode_sample_(handle.get_sample(i)) for i in sample_indices]
+            if not self.__is_shard__[file_index]:
+                return [_decode_sample_({data_name: handle.get(data_name)[()] for data_name in handle.keys()})]
+
+            datas = [{} for _ in sample_indices]
+            for data_name in hdf5_util.get_shard_data_names(handle):
+                if hdf5_util.is_dense_data(handle, data_name):
+                    data = handle.get(data_name)[sample_indices[0]: sample_indices[-1] + 1]
+                    for k, i in enumerate(sample_indices):
+                        datas[k][data_name] = data[i - sample_indices[0]]
+                    continue
+                offsets = self.__get_shard_offsets__(file_index, handle, data_name)
+                start, end = offsets[sample_indices[0]], offsets[sample_indices[-1] + 1]
+                data = handle.get(data_name)[start: end]
+                for k, i in enumerate(sample_indices):
+                    datas[k][data_name] = data[offsets[i] - start: offsets[i + 1] - start]
+            return [_decode_sample_(sample_datas) for sample_datas in datas]
+
+    def __len__(self) -> int:
+        """
+        Get sample nums of dataset.
+        :return: Sample nums.
+        """
+        return len(self.__file_index__)
+
+    def get(
+            self,
+            index: int
+    ) -> dict[str, ndarray]:
+        """
+        Get decoded sample (strokes 'value' of float64, and other datas such as 'types').
+        :param index: Sample index of dataset.
+        :return: Dict of data name -> data.
+        """
+        return self.get_many([index])[0]
+
+    def get_many(
+            self,
+            indices: list[int]
+    ) -> list[dict[str, ndarray]]:
+        """
+        Get decoded samples. Uncached samples are grouped by file, and the samples of one file are read together.
+        :param indices: Sample indices of dataset.
+        :return: Decoded samples in the order of indices.
+        """
+        indices = [int(index) for index in indices]
+        for index in indices:
+            assert_util.is_true(0 <= index < len(self), "sample index '{0}' is out of range.", index)
+
+        samples = {}
+        groups = {}
+        for index in dict.fromkeys(indices):
+            sample = self.__samples__.get_if_present(index)
+            if sample is not None:
+                samples[index] = sample
+            else:
+                groups.setdefault(int(self.__file_index__[index]), []).append(index)
+
+        for file_index, group in sorted(groups.items()):
+            group.sort(key=lambda i: self.__sample_index__[i])
+            decoded = self.__read_file__(file_index, [int(self.__sample_index__[i]) for i in group])
+            for index, sample in zip(group, decoded):
+                samples[index] = self.__samples__.put(index, sample)
+        return [samples[index] for index in indices]
+
+    def get_cache_info(self) -> dict[str, dict[str, int]]:
+        """
+        Get handle pool and sample cache info.
+        :return: Dict of 'handles' and 'samples' cache info.
+        """
+        return {"handles": self.__handles__.get_info(), "samples": self.__samples__.get_info()}
+
+    def close(self) -> None:
+        """
+        Close all open files and clear the sample cache.
+        """
+        with self.__lock__:
+            self.__handles__.clear()
+            self.__samples__.clear()
+            self.__offsets__.clear()
+
+    def __enter__(self) -> Self:
+        """
+        Enter reader context.
+        :return: Reader.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Exit reader context and close reader.
+        """
+        self.close()
@@ -1,22 +1,34 @@
 import math
-import random
 from typing import Tuple
 
 import numpy as np
 from numpy import ndarray, linalg
+from numpy.random import Generator
+
+from utils import random_util
+from utils.cache_util import LRUCache
+
+BERNSTEIN_CACHE_BYTES = 4 * 1024 * 1024
+ARC_LENGTH_GRID_CACHE_BYTES = 16 * 1024 * 1024
+_bernstein_cache_ = LRUCache(BERNSTEIN_CACHE_BYTES, get_size=lambda basis: basis.nbytes)
+# the arc-length time grids are much larger and rarely reused, so they do not evict the evaluation bases
+_arc_length_grid_cache_ = LRUCache(ARC_LENGTH_GRID_CACHE_BYTES, get_size=lambda basis: basis.nbytes)
 
 
 def _get_value_(
         value: float,
-        value_range: Tuple[float, float]
+        value_range: Tuple[float, float],
+        rng: Generator = None
 ) -> float:
     """
     Get random value from range.
     :param value: Fixed value.
     :param value_range: Range of value.
+    :param rng: Random generator.
     :return: Value from range or fixed.
     """
-    return random.uniform(*value_range) if value is None else value
+    rng = random_util.get_generator(rng)
+    return rng.uniform(*value_range) if value is None else value
 
 
 def get_point_distance_3d(endpoints: Tuple[ndarray, ndarray]) -> ndarray[ndarray]:
@@ -52,7 +64,8 @@ def get_point3d(
         x_range: Tuple[float, float] = (0, 0),
         z_range: Tuple[float, float] = (0, 0),
         y_range: Tuple[float, float] = (0, 0),
-        dithering: Tuple[float, float] = (0, 0)
+        dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
 ) -> ndarray[float] | ndarray:
     """
     Get point of generating in 3d.
@@ -63,48 +76,108 @@ def get_point3d(
     :param z_range: Z range of point.
     :param y_range: Y range of point.
     :param dithering: Point dithering.
+    :param rng: Random generator.
     :return: Generated point.
     """
+    rng = random_util.get_generator(rng)
+    values = np.array([x, z, y], dtype=float)
+    ranges = np.array([x_range, z_range, y_range], dtype=float)
+    point = np.where(np.isnan(values), rng.uniform(ranges[:, 0], ranges[:, 1]), values)
+    return dither_point3d(point, dithering, rng=rng)
+
+
+def get_points3d(
+        nums: int,
+        x: float = None,
+        z: float = None,
+        y: float = None,
+        x_range: Tuple[float, float] = (0, 0),
+        z_range: Tuple[float, float] = (0, 0),
+        y_range: Tuple[float, float] = (0, 0),
+        dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
+) -> ndarray[ndarray]:
+    """
+    Get points of generating in 3d in one pass, same as get_point3d of each point.
+    :param nums: Point nums.
+    :param x: X value of points.
+    :param z: Z value of points.
+    :param y: Y value of points.
+    :param x_range: X range of points.
+    :param z_range: Z range of points.
+    :param y_range: Y range of points.
+    :param dithering: Point dithering.
+    :param rng: Random generator.
+    :return: Generated points.
+    """
+    rng = random_util.get_generator(rng)
     values = [x, z, y]
     ranges = [x_range, z_range, y_range]
-    point = np.array([_get_value_(values[i], ranges[i]) for i, _ in enumerate(ranges)])
-    return dither_point3d(point, dithering)
+    points = np.column_stack([np.full(nums, float(values[i])) if values[i] is not None
+                              else rng.uniform(*ranges[i], nums) for i in range(0, 3)])
+    return points + _get_dithering_vectors_(nums, dithering, rng)
+
+
+def _get_dithering_vectors_(
+        nums: int,
+        dithering: Tuple[float, float],
+        rng: Generator
+) -> ndarray[ndarray]:
+    """
+    Get dithering vectors with radius in dithering range and uniform spherical angles.
+    :param nums: Vector nums.
+    :param dithering: Dithering range.
+    :param rng: Random generator.
+    :return: Dithering vectors.
+    """
+    r = rng.uniform(*dithering, nums)
+    th = rng.uniform(0, 2 * math.pi, nums)
+    phi = rng.uniform(0, 2 * math.pi, nums)
+    return np.column_stack((r * np.cos(phi) * np.cos(th), r * np.cos(phi) * np.sin(th), r * np.sin(phi)))
 
 
 def dither_point3d(
         point: ndarray[ndarray] | ndarray,
-        dithering: tuple = (0, 0)
+        dithering: tuple = (0, 0),
+        rng: Generator = None
 ) -> ndarray[ndarray]:
     """
     Dither point in 3d.
     :param point: Point of dithering.
     :param dithering: Dithering range.
+    :param rng: Random generator.
     :return: Dithered point.
     """
-    r = random.uniform(*dithering)
-    th = random.uniform(0, 2 * math.pi)
-    phi = random.uniform(0, 2 * math.pi)
+    rng = random_util.get_generator(rng)
+    r, th, phi = rng.uniform((dithering[0], 0, 0), (dithering[1], 2 * math.pi, 2 * math.pi))
     return point + spherical_2cartesian3d(r, th, phi)
 
 
 def dither_points3d(
         points: ndarray[ndarray] | ndarray,
-        dithering: Tuple[float, float] = (0, 0)
+        dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
 ) -> ndarray[ndarray] | ndarray:
     """
-    Dither point in 3d.
+    Dither points in 3d in one pass, same distribution as dither_point3d of each point.
     :param points: Points of dithering.
     :param dithering: Dithering range.
+    :param rng: Random generator.
     :return: Dithered points
     """
-    return np.array([dither_point3d(point, dithering) for point in points])
+    rng = random_util.get_generator(rng)
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        return points.copy()
+    return points + _get_dithering_vectors_(len(points), dithering, rng)
 
 
 def get_equinox3d(
         line: Tuple[ndarray, ndarray],
         equinox: float = None,
         equinox_range: Tuple[float, float] = (0, 1),
-        dithering: Tuple[float, float] = (0, 0)
+        dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
 ) -> ndarray[ndarray] | ndarray:
     """
     Get equinox point of line, and the division start from line[0].
@@ -112,25 +185,83 @@ def get_equinox3d(
     :param equinox：Equinox proportion.
     :param equinox_range: Equinox proportion of range.
     :param dithering: Dithering range.
+    :param rng: Random generator.
     :return: Equinox point.
     """
-    equinox = _get_value_(equinox, equinox_range)
+    equinox = _get_value_(equinox, equinox_range, rng=rng)
     point = np.array([line[0][i] * (1 - equinox) + line[1][i] * equinox for i in range(0, 3)])
-    return dither_point3d(point, dithering)
+    return dither_point3d(point, dithering, rng=rng)
+
+
+def get_bernstein_basis(
+        degree: int,
+        nums: int,
+        arc_length_grid: bool = False
+) -> ndarray[ndarray]:
+    """
+    Get (cached) bernstein basis matrix of degree on uniform times of [0, 1].
+    :param degree: Bézier degree.
+    :param nums: Time nums.
+    :param arc_length_grid: Whether the times are the grid of an arc-length table (cached apart from evaluation bases).
+    :return: Read-only basis matrix of shape (nums, degree + 1).
+    """
+
+    def get_basis() -> ndarray[ndarray]:
+        t_arr = np.linspace(0.0, 1.0, nums)
+        basis = np.column_stack([math.comb(degree, i) * t_arr ** (degree - i) * (1 - t_arr) ** i
+                                 for i in range(0, degree + 1)])
+        basis.setflags(write=False)
+        return basis
+
+    cache = _arc_length_grid_cache_ if arc_length_grid else _bernstein_cache_
+    return cache.get((degree, nums), get_basis)
+
+
+def get_bernstein_cache_info() -> dict[str, dict[str, int]]:
+    """
+    Get bernstein basis caches info.
+    :return: Hits, misses, items, size (in bytes) and max size of evaluation basis cache and arc-length grid cache.
+    """
+    return {"basis": _bernstein_cache_.get_info(), "arc_length_grid": _arc_length_grid_cache_.get_info()}
+
+
+def set_bernstein_cache_size(
+        max_bytes: int,
+        arc_length_grid_max_bytes: int = None
+) -> None:
+    """
+    Resize bernstein basis caches.
+    :param max_bytes: Max bytes of evaluation basis cache (no caching if 0).
+    :param arc_length_grid_max_bytes: Max bytes of arc-length grid cache (not resized if None).
+    """
+    _bernstein_cache_.resize(max_bytes)
+    if arc_length_grid_max_bytes is not None:
+        _arc_length_grid_cache_.resize(arc_length_grid_max_bytes)
+
+
+def clear_bernstein_cache() -> None:
+    """
+    Clear bernstein basis caches and their counters.
+    """
+    _bernstein_cache_.clear()
+    _arc_length_grid_cache_.clear()
 
 
 def get_bezier_curve3d(
         control_points: ndarray[ndarray] | ndarray,
-        t_arr: ndarray[float] | ndarray,
+        t_arr: ndarray[float] | ndarray | int,
         dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray:
     """
     Get Bézier curve with control points through bernstein poly. And can choose the uniform velocity features.
+    Uniform times (given as time nums) are evaluated through the cached bernstein basis.
     :param control_points: Bézier control points
-    :param t_arr: Bézier times array.
+    :param t_arr: Bézier times array, or time nums of uniform times of [0, 1].
     :param dithering: Dithering range.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Points of Bézier curve.
     """
 
@@ -148,84 +279,35 @@ def get_bezier_curve3d(
         """
         return math.comb(n, i) * (t ** (n - i)) * (1 - t) ** i
 
-    def get_bezier_velocity(
+    def get_bezier_arc_length_table(
             c_points: ndarray[ndarray] | ndarray,
-            t: float
-    ) -> float:
+            nums: int
+    ) -> Tuple[ndarray, ndarray]:
         """
-        Get Bézier velocity of time(t).
+        Get cumulative arc length table of Bézier, by trapezoidal integral of velocity on the time grid.
         :param c_points: Control points.
-        :param t: Bézier time.
-        :return: Velocity of Bézier(c_points, t).
+        :param nums: Time grid nums.
+        :return: Time grid and cumulative arc length of each time.
         """
         n = len(c_points) - 1
-        velocities = np.array([[
-            math.comb(n, j) * p[i] * ((j * t ** (j - 1) if t != 0 else 0)
-                                      + ((n - j) * (1 - t) ** (n - j - 1) if 1 - t != 0 else 0))
-            for j, p in enumerate(c_points)] for i in range(0, 3)
-        ])
-        return np.linalg.norm(velocities)
-
-    def get_bezier_length(
-            c_points: ndarray[ndarray] | ndarray,
-            t: float,
-            index: int
-    ) -> float:
-        """
-        Get Bézier length of time(t), by curvilinear integral.
-        :param c_points: Control points.
-        :param t: Bézier time.
-        :param index: Bézier index.
-        :return: Length of Bézier(c_points, t).
-        """
-        if index % 2 == 0:
-            index += 1
-        dt = t / index
-        half_index = index // 2
-        sum1 = np.sum([get_bezier_velocity(c_points, (2 * i + 1) * dt) for i in range(0, half_index)])
-        sum2 = np.sum([get_bezier_velocity(c_points, 2 * i * dt) for i in range(0, half_index)])
-        return (get_bezier_velocity(c_points, 0) + get_bezier_velocity(c_points, 1) + 4 * sum1 + 2 * sum2) * dt / 3
-
-    def get_bezier_real_time(
-            c_points: ndarray[ndarray] | ndarray,
-            arc_length: float,
-            index: int
-    ) -> float:
-        """
-        Get Bézier real time by arc length.
-        :param c_points: Control points.
-        :param arc_length: Arc length.
-        :param index: Bézier index.
-        :return: Real time of Bézier.
-        """
-        real_time = 0
-        low_time = 0
-        high_time = 1
-        d_time = 0
-        d_length = 0
-        epsilon = 0.001
-
-        start_flag = True
-        while start_flag or (math.fabs(d_length) > epsilon and math.fabs(d_time) > epsilon):
-            start_flag = False
-            d_time = - (real_time - low_time) / 2 if d_length > 0 else (high_time - real_time) / 2
-            real_time += d_time
-            real_time_length = get_bezier_length(c_points, real_time, index)
-            d_length = real_time_length - arc_length
-            if d_length > 0:
-                high_time = real_time
-            else:
-                low_time = real_time
-        return real_time
+        t_grid = np.linspace(0.0, 1.0, nums)
+        velocity_points = n * (c_points[:-1] - c_points[1:])
+        velocities = np.linalg.norm(np.matmul(get_bernstein_basis(n - 1, nums, True), velocity_points), axis=1)
+        lengths = np.concatenate(([0.0], np.cumsum((velocities[1:] + velocities[:-1]) * np.diff(t_grid) / 2)))
+        return t_grid, lengths
 
     control_nums = len(control_points)
-    if uniform_velocity:
-        t_nums = len(t_arr)
-        length = get_bezier_length(control_points, 1, t_nums - 1)
-        t_arr = np.array([get_bezier_real_time(control_points, i / t_nums * length, i) for i in range(0, t_nums)])
-    bernstein_arr = np.array([bernstein(i, control_nums - 1, t_arr) for i in range(0, control_nums)])
-    points = np.matmul(control_points.T, bernstein_arr).T
-    return dither_points3d(points, dithering)
+    if uniform_velocity and control_nums > 1:
+        t_nums = t_arr if isinstance(t_arr, (int, np.integer)) else len(t_arr)
+        t_grid, lengths = get_bezier_arc_length_table(control_points, max(16 * t_nums, 1024) + 1)
+        if lengths[-1] > 0:
+            t_arr = np.interp(np.linspace(0.0, lengths[-1], t_nums), lengths, t_grid)
+    if isinstance(t_arr, (int, np.integer)):
+        points = np.matmul(get_bernstein_basis(control_nums - 1, t_arr), control_points)
+    else:
+        bernstein_arr = np.array([bernstein(i, control_nums - 1, t_arr) for i in range(0, control_nums)])
+        points = np.matmul(control_points.T, bernstein_arr).T
+    return dither_points3d(points, dithering, rng=rng)
 
 
 def get_ellipse_curve3d(
@@ -236,7 +318,8 @@ def get_ellipse_curve3d(
         b_range: Tuple[float, float] = (1, 1),
         y_range: Tuple[float, float] = (0, 0),
         density: float = 1.0,
-        point_dithering: Tuple[float, float] = (0, 0)
+        point_dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
 ) -> ndarray:
     """
     Get standard elliptic curve。
@@ -248,14 +331,82 @@ def get_ellipse_curve3d(
     :param y_range: Range of Y.
     :param density: Ellipse line density.
     :param point_dithering: Dithering range.
+    :param rng: Random generator.
     :return: standard elliptic curve.
     """
-    a = _get_value_(a, a_range)
-    b = _get_value_(b, b_range)
-    y = _get_value_(y, y_range)
-    nums = math.floor(2 * math.pi * b + 4 * (a - b) / density)
-    points = [[a * math.cos(i / nums * 2 * math.pi), b * math.sin(i / nums * 2 * math.pi), y] for i in range(0, nums)]
-    return dither_point3d(np.array(points), point_dithering)
+    a = _get_value_(a, a_range, rng=rng)
+    b = _get_value_(b, b_range, rng=rng)
+    y = _get_value_(y, y_range, rng=rng)
+    nums = max(math.floor(2 * math.pi * b + 4 * (a - b) / density), 0)
+    angles = np.arange(nums) / nums * 2 * math.pi
+    points = np.column_stack((a * np.cos(angles), b * np.sin(angles), np.full(nums, y)))
+    return dither_point3d(points, point_dithering, rng=rng)
+
+
+def _get_values_(
+        nums: int,
+        value: float | ndarray | None,
+        value_range: Tuple[float, float],
+        rng: Generator
+) -> ndarray[float]:
+    """
+    Get random values from range, or the fixed value (of each, or of all).
+    :param nums: Value nums.
+    :param value: Fixed value (or values).
+    :param value_range: Range of value.
+    :param rng: Random generator.
+    :return: Values.
+    """
+    return rng.uniform(*value_range, nums) if value is None else np.broadcast_to(np.asarray(value, dtype=float), nums)
+
+
+def _get_ragged_index_(counts: ndarray[int]) -> Tuple[ndarray, ndarray, ndarray]:
+    """
+    Get offsets, owner index and local index of each element of ragged arrays.
+    :param counts: Element nums of each array.
+    :return: Offsets, array index of each element and element index in its array.
+    """
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(int)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    return offsets, owners, np.arange(offsets[-1]) - offsets[owners]
+
+
+def get_ellipse_curves3d(
+        nums: int,
+        a: float | ndarray = None,
+        b: float | ndarray = None,
+        y: float | ndarray = None,
+        a_range: Tuple[float, float] = (1, 1),
+        b_range: Tuple[float, float] = (1, 1),
+        y_range: Tuple[float, float] = (0, 0),
+        density: float = 1.0,
+        point_dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
+) -> Tuple[ndarray, ndarray]:
+    """
+    Get standard elliptic curves with their own A, B and Y in one pass, same as get_ellipse_curve3d of each curve.
+    :param nums: Curve nums.
+    :param a: A of ellipses (drawn from range of each if None).
+    :param b: B of ellipses (drawn from range of each if None).
+    :param y: Y of ellipses (drawn from range of each if None).
+    :param a_range: Range of A.
+    :param b_range: Range of B.
+    :param y_range: Range of Y.
+    :param density: Ellipse line density.
+    :param point_dithering: Dithering range.
+    :param rng: Random generator.
+    :return: Points of all curves (concatenated in order) and offsets of each curve.
+    """
+    rng = random_util.get_generator(rng)
+    a = _get_values_(nums, a, a_range, rng)
+    b = _get_values_(nums, b, b_range, rng)
+    y = _get_values_(nums, y, y_range, rng)
+    counts = np.maximum(np.floor(2 * math.pi * b + 4 * (a - b) / density), 0).astype(int)
+    offsets, owners, index = _get_ragged_index_(counts)
+    angles = index / counts[owners] * 2 * math.pi
+    points = np.column_stack((a[owners] * np.cos(angles), b[owners] * np.sin(angles), y[owners]))
+    # like get_ellipse_curve3d, the points of one ellipse share one dithering vector
+    return points + _get_dithering_vectors_(nums, point_dithering, rng)[owners], offsets
 
 
 def get_curve3d(
@@ -265,7 +416,8 @@ def get_curve3d(
         equinox_range: Tuple[float, float] = (0, 1),
         endpoint_dithering: Tuple[float, float] = (0, 0),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray[ndarray] | ndarray:
     """
     Get curve through bernstein poly.
@@ -276,18 +428,62 @@ def get_curve3d(
     :param endpoint_dithering: Range of dithering equinox endpoint.
     :param point_dithering: Range of dithering point.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Curve points.
     """
     control_points = np.array([get_equinox3d(line=endpoints,
                                              equinox_range=equinox_range,
-                                             dithering=endpoint_dithering) for _ in range(0, 3)])
+                                             dithering=endpoint_dithering,
+                                             rng=rng) for _ in range(0, 3)])
     control_points = sort_points3d(points=control_points,
                                    axis_arr=axis_arr,
                                    reverse_arr=tuple((endpoints[0] - endpoints[1]) < 0))
     control_points = np.insert(control_points, len(control_points), endpoints[0], axis=0)
     control_points = np.insert(control_points, 0, endpoints[1], axis=0)
-    t_arr = np.linspace(0.0, 1.0, int(get_point_distance_3d(endpoints) / density))
-    return get_bezier_curve3d(control_points, t_arr, point_dithering, uniform_velocity)
+    t_nums = int(get_point_distance_3d(endpoints) / density)
+    return get_bezier_curve3d(control_points, t_nums, point_dithering, uniform_velocity, rng=rng)
+
+
+def get_curves3d(
+        endpoints: Tuple[ndarray, ndarray],
+        axis_arr: Tuple[int, int, int] = (0, 1, 2),
+        density: float = 1.0,
+        equinox_range: Tuple[float, float] = (0, 1),
+        endpoint_dithering: Tuple[float, float] = (0, 0),
+        point_dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
+) -> Tuple[ndarray, ndarray]:
+    """
+    Get curves through bernstein poly in one pass, same as get_curve3d of each pair of endpoints.
+    :param endpoints: Curves start points and end points (both of shape (curve nums, 3)).
+    :param axis_arr: Sort axis.
+    :param density: Curve density.
+    :param equinox_range: Equinox range of curve.
+    :param endpoint_dithering: Range of dithering equinox endpoint.
+    :param point_dithering: Range of dithering point.
+    :param rng: Random generator.
+    :return: Points of all curves (concatenated in order) and offsets of each curve.
+    """
+    rng = random_util.get_generator(rng)
+    start_points, end_points = endpoints
+    curve_nums = len(start_points)
+
+    equinox = rng.uniform(*equinox_range, (curve_nums, 3, 1))
+    control_points = start_points[:, None] * (1 - equinox) + end_points[:, None] * equinox
+    control_points += _get_dithering_vectors_(curve_nums * 3, endpoint_dithering, rng).reshape(curve_nums, 3, 3)
+    control_points = sort_points3d_batch(points=control_points,
+                                         axis_arr=axis_arr,
+                                         reverse_arr=(start_points - end_points) < 0)
+    control_points = np.concatenate((end_points[:, None], control_points, start_points[:, None]), axis=1)
+
+    nums = (np.linalg.norm(start_points - end_points, axis=1) / density).astype(int)
+    offsets = np.concatenate(([0], np.cumsum(nums)))
+    curve_index = np.repeat(np.arange(curve_nums), nums)
+    t_arr = (np.arange(offsets[-1]) - offsets[curve_index]) / np.maximum(nums - 1, 1)[curve_index]
+    n = control_points.shape[1] - 1
+    bernstein_arr = np.column_stack([math.comb(n, i) * t_arr ** (n - i) * (1 - t_arr) ** i for i in range(0, n + 1)])
+    points = np.einsum("ti,tij->tj", bernstein_arr, control_points[curve_index])
+    return points + _get_dithering_vectors_(len(points), point_dithering, rng), offsets
 
 
 def get_line3d(
@@ -297,7 +493,8 @@ def get_line3d(
         equinox_range: Tuple[float, float] = (0, 1),
         endpoint_dithering: Tuple[float, float] = (0, 0),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray[ndarray]:
     """
     Get line through bernstein poly.
@@ -308,6 +505,7 @@ def get_line3d(
     :param endpoint_dithering: Range of dithering equinox endpoint.
     :param point_dithering: Range of dithering point.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Line points.
     """
     return get_curve3d(
@@ -317,7 +515,8 @@ def get_line3d(
         equinox_range=equinox_range,
         endpoint_dithering=endpoint_dithering,
         point_dithering=point_dithering,
-        uniform_velocity=uniform_velocity
+        uniform_velocity=uniform_velocity,
+        rng=rng
     )
 
 
@@ -328,7 +527,8 @@ def get_connect_line3d(
         equinox_range: Tuple[float, float] = (0, 1),
         endpoint_dithering: Tuple[float, float] = (0, 0),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray[ndarray] | ndarray:
     """
     Get connect line through bernstein poly.
@@ -339,10 +539,12 @@ def get_connect_line3d(
     :param endpoint_dithering: Range of dithering equinox endpoint.
     :param point_dithering: Range of dithering point.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Connect line points.
     """
-    index1 = random.randint(0, len(lines[0]) - 1)
-    index2 = random.randint(0, len(lines[1]) - 1)
+    rng = random_util.get_generator(rng)
+    index1 = rng.integers(0, len(lines[0]))
+    index2 = rng.integers(0, len(lines[1]))
     return get_line3d(
         endpoints=(lines[0][index1], lines[1][index2]),
         density=density,
@@ -350,7 +552,8 @@ def get_connect_line3d(
         equinox_range=equinox_range,
         endpoint_dithering=endpoint_dithering,
         point_dithering=point_dithering,
-        uniform_velocity=uniform_velocity
+        uniform_velocity=uniform_velocity,
+        rng=rng
     )
 
 
@@ -362,7 +565,8 @@ def _get_vertical_line3d_by_norm_vector(
         density: float = 1.0,
         equinox_range: Tuple[float, float] = (0, 1),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray[ndarray]:
     """
     Get vertical line by endpoint and normal vector through bernstein poly.
@@ -374,10 +578,12 @@ def _get_vertical_line3d_by_norm_vector(
     :param equinox_range: Equinox range of vertical line.
     :param point_dithering: Range of dithering point.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Points of vertical line.
     """
     radian_range = tuple(np.deg2rad(degree_range)) if radian_range is None else radian_range
-    dip = random.uniform(*radian_range)
+    rng = random_util.get_generator(rng)
+    dip = rng.uniform(*radian_range)
     bottom_point = endpoints[1] + np.multiply(normal_vector, math.tan(dip) * (endpoints[0][2] - endpoints[1][2]))
 
     return get_line3d(
@@ -386,7 +592,8 @@ def _get_vertical_line3d_by_norm_vector(
         axis_arr=(2, 1, 0),
         equinox_range=equinox_range,
         point_dithering=point_dithering,
-        uniform_velocity=uniform_velocity
+        uniform_velocity=uniform_velocity,
+        rng=rng
     )
 
 
@@ -398,7 +605,8 @@ def get_vertical_line3d_by_endpoint(
         equinox_range: Tuple[float, float] = (0, 1),
         endpoint_dithering: Tuple[float, float] = (0, 0),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray[ndarray] | ndarray:
     """
     Get vertical line by endpoint through bernstein poly.
@@ -410,20 +618,23 @@ def get_vertical_line3d_by_endpoint(
     :param endpoint_dithering: Range of equinox endpoint dithering.
     :param point_dithering: Range of point dithering.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Vertical line by endpoint.
     """
     point1 = get_point3d(
         x=float(endpoint[0]),
         z=float(endpoint[1]),
         y=float(endpoint[2]),
-        dithering=endpoint_dithering
+        dithering=endpoint_dithering,
+        rng=rng
     )
     point2 = get_point3d(
         x=float(point1[0]),
         z=float(point1[1]),
         y=bottom_y,
         y_range=bottom_y_range,
-        dithering=endpoint_dithering
+        dithering=endpoint_dithering,
+        rng=rng
     )
 
     return _get_vertical_line3d_by_norm_vector(
@@ -431,7 +642,8 @@ def get_vertical_line3d_by_endpoint(
         density=density,
         equinox_range=equinox_range,
         point_dithering=point_dithering,
-        uniform_velocity=uniform_velocity
+        uniform_velocity=uniform_velocity,
+        rng=rng
     )
 
 
@@ -446,7 +658,8 @@ def get_vertical_line3d_by_line(
         equinox_range: Tuple[float, float] = (0, 1),
         endpoint_dithering: Tuple[float, float] = (0, 0),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray:
     """
     Get vertical line by line through bernstein poly.
@@ -461,19 +674,22 @@ def get_vertical_line3d_by_line(
     :param endpoint_dithering: Range of equinox endpoint dithering.
     :param point_dithering: Range of point dithering.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Vertical line by line.
     """
     point1 = get_equinox3d(
         line=endpoints,
         equinox_range=endpoint_equinox_range,
-        dithering=endpoint_dithering
+        dithering=endpoint_dithering,
+        rng=rng
     )
     point2 = get_point3d(
         x=float(point1[0]),
         z=float(point1[1]),
         y=bottom_y,
         y_range=bottom_y_range,
-        dithering=endpoint_dithering
+        dithering=endpoint_dithering,
+        rng=rng
     )
 
     th = math.atan2(endpoints[1][1] - endpoints[0][1], endpoints[1][0] - endpoints[0][0])
@@ -488,7 +704,8 @@ def get_vertical_line3d_by_line(
         density=density,
         equinox_range=equinox_range,
         point_dithering=point_dithering,
-        uniform_velocity=uniform_velocity
+        uniform_velocity=uniform_velocity,
+        rng=rng
     )
 
 
@@ -502,7 +719,8 @@ def get_vertical_line3d_by_curve(
         equinox_range: Tuple[float, float] = (0, 1),
         endpoint_dithering: Tuple[float, float] = (0, 0),
         point_dithering: Tuple[float, float] = (0, 0),
-        uniform_velocity: bool = False
+        uniform_velocity: bool = False,
+        rng: Generator = None
 ) -> ndarray[ndarray]:
     """
     Get vertical line by line through bernstein poly.
@@ -516,6 +734,7 @@ def get_vertical_line3d_by_curve(
     :param endpoint_dithering: Range of equinox endpoint dithering.
     :param point_dithering: Range of point dithering.
     :param uniform_velocity: Whether uniform velocity of Bézier.
+    :param rng: Random generator.
     :return: Vertical line by curve.
     """
 
@@ -535,15 +754,17 @@ def get_vertical_line3d_by_curve(
 
         return np.insert(np.array([b[1], -a[1]]) / np.sqrt(a[1] ** 2. + b[1] ** 2.), 2, 0)
 
+    rng = random_util.get_generator(rng)
     point_length = len(points)
-    i = random.randint(0, point_length - 1)
-    point1 = dither_point3d(points[i], endpoint_dithering)
+    i = rng.integers(0, point_length)
+    point1 = dither_point3d(points[i], endpoint_dithering, rng=rng)
     point2 = get_point3d(
         x=float(point1[0]),
         z=float(point1[1]),
         y=bottom_y,
         y_range=bottom_y_range,
-        dithering=endpoint_dithering
+        dithering=endpoint_dithering,
+        rng=rng
     )
 
     fit_points = np.array([points[(i - 1 + point_length) % point_length], points[i], points[(i + 1) % point_length]])
@@ -557,7 +778,8 @@ def get_vertical_line3d_by_curve(
         density=density,
         equinox_range=equinox_range,
         point_dithering=point_dithering,
-        uniform_velocity=uniform_velocity
+        uniform_velocity=uniform_velocity,
+        rng=rng
     )
 
 
@@ -574,7 +796,8 @@ def get_vertical_arc(
         th: float = None,
         rot: float = None,
         y: float = None,
-        point_dithering: Tuple[float, float] = (0, 0)
+        point_dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
 ) -> ndarray:
     """
     Get vertical arc.
@@ -591,24 +814,81 @@ def get_vertical_arc(
     :param rot: Rotation radian.
     :param y: AxisY value.
     :param point_dithering: Range of point dithering.
+    :param rng: Random generator.
     :return: Points of Vertical arc.
     """
     th_radian_range = tuple(np.deg2rad(th_degree_range)) if th_radian_range is None else th_radian_range
     rot_radian_range = tuple(np.deg2rad(rot_degree_range)) if rot_radian_range is None else rot_radian_range
 
-    r = _get_value_(r, r_range)
-    th = _get_value_(th, th_radian_range)
-    rot = _get_value_(rot, rot_radian_range)
-    y = _get_value_(y, y_range)
+    r = _get_value_(r, r_range, rng=rng)
+    th = _get_value_(th, th_radian_range, rng=rng)
+    rot = _get_value_(rot, rot_radian_range, rng=rng)
+    y = _get_value_(y, y_range, rng=rng)
 
-    nums = math.floor(r * th / density)
+    nums = max(math.floor(r * th / density), 0)
     center = np.array([0, 0, -r * math.sin((math.pi - th) / 2)])
-    points = np.array([np.array([
-        r * math.cos(i / nums * th + (math.pi - th) / 2) * math.sin(rot),
-        r * math.cos(i / nums * th + (math.pi - th) / 2) * math.cos(rot),
-        r * math.sin(i / nums * th + (math.pi - th) / 2) + y]) + center + base
-                       for i in range(0, nums)])
-    return dither_points3d(points, point_dithering)
+    angles = np.arange(nums) / nums * th + (math.pi - th) / 2
+    points = np.column_stack((r * np.cos(angles) * math.sin(rot), r * np.cos(angles) * math.cos(rot),
+                              r * np.sin(angles) + y)) + center + base
+    return dither_points3d(points, point_dithering, rng=rng)
+
+
+def get_vertical_arcs(
+        nums: int,
+        density: float = 1.0,
+        r_range: Tuple[float, float] = (1, 1),
+        th_radian_range: Tuple[float, float] = None,
+        th_degree_range: Tuple[float, float] = (90, 90),
+        rot_radian_range: Tuple[float, float] = None,
+        rot_degree_range: Tuple[float, float] = (0, 0),
+        y_range: Tuple[float, float] = (0, 0),
+        base: ndarray[ndarray] = np.array([0, 0, 0]),
+        r: float | ndarray = None,
+        th: float | ndarray = None,
+        rot: float | ndarray = None,
+        y: float | ndarray = None,
+        point_dithering: Tuple[float, float] = (0, 0),
+        rng: Generator = None
+) -> Tuple[ndarray, ndarray]:
+    """
+    Get vertical arcs with their own radius, angles and base in one pass, same as get_vertical_arc of each arc.
+    :param nums: Arc nums.
+    :param density: Points of line density.
+    :param r_range: Range of radius.
+    :param th_radian_range: Range of inclination radian (theta).
+    :param th_degree_range: Range of inclination degree (theta).
+    :param rot_radian_range: Range of rotation radian.
+    :param rot_degree_range: Range of rotation degree.
+    :param y_range: Range of axisY value.
+    :param base: Base point (of all arcs), or base points of shape (nums, 3).
+    :param r: Radius of arcs (drawn from range of each if None).
+    :param th: Inclination radian (theta) of arcs (drawn from range of each if None).
+    :param rot: Rotation radian of arcs (drawn from range of each if None).
+    :param y: AxisY value of arcs (drawn from range of each if None).
+    :param point_dithering: Range of point dithering.
+    :param rng: Random generator.
+    :return: Points of all arcs (concatenated in order) and offsets of each arc.
+    """
+    rng = random_util.get_generator(rng)
+    th_radian_range = tuple(np.deg2rad(th_degree_range)) if th_radian_range is None else th_radian_range
+    rot_radian_range = tuple(np.deg2rad(rot_degree_range)) if rot_radian_range is None else rot_radian_range
+
+    r = _get_values_(nums, r, r_range, rng)
+    th = _get_values_(nums, th, th_radian_range, rng)
+    rot = _get_values_(nums, rot, rot_radian_range, rng)
+    y = _get_values_(nums, y, y_range, rng)
+    base = np.broadcast_to(np.asarray(base, dtype=float), (nums, 3))
+
+    counts = np.maximum(np.floor(r * th / density), 0).astype(int)
+    offsets, owners, index = _get_ragged_index_(counts)
+    start_angles = (math.pi - th) / 2
+    angles = index / counts[owners] * th[owners] + start_angles[owners]
+    r_points = r[owners]
+    points = np.column_stack((r_points * np.cos(angles) * np.sin(rot[owners]),
+                              r_points * np.cos(angles) * np.cos(rot[owners]),
+                              r_points * np.sin(angles) + y[owners] - r_points * np.sin(start_angles[owners])))
+    points += base[owners]
+    return points + _get_dithering_vectors_(len(points), point_dithering, rng), offsets
 
 
 def sort_points3d(
@@ -631,6 +911,27 @@ def sort_points3d(
     return np.array(point_list)
 
 
+def sort_points3d_batch(
+        points: ndarray,
+        axis_arr: Tuple[int, int, int] = (0, 1, 2),
+        reverse_arr: ndarray[bool] = None
+) -> ndarray:
+    """
+    Sort points of each group along axis(and choose reverse), same as sort_points3d of each group.
+    :param points: Points groups will be sorted (of shape (group nums, point nums, 3)).
+    :param axis_arr: Sort priority.
+    :param reverse_arr: Sort priority reversed flags of each group (of shape (group nums, len(axis_arr))).
+    :return: Sorted points groups.
+    """
+    if reverse_arr is None:
+        reverse_arr = np.zeros((len(points), len(axis_arr)), dtype=bool)
+    signs = np.where(reverse_arr, -1, 1)
+    # lexsort sorts by the last key first, key i is the i-th sort priority
+    keys = [signs[:, i, None] * points[:, :, axis_arr[i]] for i in reversed(range(0, len(axis_arr)))]
+    orders = np.lexsort(keys, axis=-1)
+    return np.take_along_axis(points, orders[:, :, None], axis=1)
+
+
 def concatenate_points(*points_arrs: ndarray[ndarray] | ndarray) -> ndarray[ndarray] | ndarray:
     """
     Concatenate all points
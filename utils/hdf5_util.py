@@ -1,10 +1,106 @@
 import os.path
+import queue
+import threading
 
 import h5py
+import numpy as np
 from h5py import File
 from numpy import ndarray
+from typing_extensions import Self
+
 from utils import assert_util
 
+OUTPUT_FORMATS = ("file", "shard", "ragged")
+SHARD_FORMATS = ("shard", "ragged")
+COMPRESSIONS = ("none", "lzf", "gzip")
+PRECISIONS = ("float64", "float32", "float16", "int16")
+STROKE_ID_DTYPE = "uint16"
+VALUE_DATA_NAMES = ("value", "points", "stroke_ids", "points_scale", "points_offset")
+DENSE_ATTRIBUTE = "dense"
+
+
+class Codec:
+    """
+    Hdf5 dataset filters: compression (none, lzf or gzip with level), byte shuffle and chunk rows.
+    Written as text by 'none', 'lzf', 'gzip' or 'gzip-{level}', and '+shuffle' suffix (such as 'gzip-1+shuffle').
+    """
+
+    def __init__(
+            self,
+            compression: str = "gzip",
+            level: int = 4,
+            shuffle: bool = False,
+            chunk_rows: int = None
+    ) -> None:
+        """
+        Init codec.
+        :param compression: Compression ('none', 'lzf' or 'gzip').
+        :param level: Gzip level (0 - 9).
+        :param shuffle: Whether shuffle bytes before compression.
+        :param chunk_rows: Row nums of each chunk (chunk shape is (chunk_rows, *data shape[1:]), auto if None).
+        """
+        assert_util.is_true(compression in COMPRESSIONS, "compression '{0}' is not supported.", compression)
+        assert_util.is_true(0 <= level <= 9, "gzip level '{0}' should be in [0, 9].", level)
+        assert_util.is_true(chunk_rows is None or chunk_rows >= 1, "chunk rows '{0}' should be positive.", chunk_rows)
+        self.compression: str = compression
+        self.level: int = level
+        self.shuffle: bool = shuffle
+        self.chunk_rows: int | None = chunk_rows
+
+    @classmethod
+    def parse(
+            cls,
+            text: str,
+            chunk_rows: int = None
+    ) -> Self:
+        """
+        Parse codec text.
+        :param text: Codec text (such as 'none', 'lzf', 'gzip-4' or 'gzip-1+shuffle').
+        :param chunk_rows: Row nums of each chunk.
+        :return: Codec.
+        """
+        name, _, suffix = text.partition("+")
+        assert_util.is_true(suffix in ("", "shuffle"), "codec filter '{0}' is not supported.", suffix)
+        compression, _, level = name.partition("-")
+        # only gzip has levels, such as 'lzf-4' is not a supported compression
+        assert_util.is_true(level == "" or compression == "gzip", "compression '{0}' is not supported.", name)
+        assert_util.is_true(level == "" or level.isdigit(), "codec level '{0}' is not an integer.", level)
+        return Codec(compression, int(level) if level != "" else 4, suffix == "shuffle", chunk_rows)
+
+    def get_dataset_options(
+            self,
+            shape: tuple
+    ) -> dict:
+        """
+        Get h5py create_dataset options of data shape.
+        :param shape: Data shape.
+        :return: Dataset options.
+        """
+        if len(shape) == 0 or 0 in shape:
+            return {}
+        options = {}
+        if self.compression == "gzip":
+            options.update(compression="gzip", compression_opts=self.level)
+        elif self.compression == "lzf":
+            options.update(compression="lzf")
+        if self.shuffle:
+            options.update(shuffle=True)
+        if self.chunk_rows is not None:
+            options.update(chunks=(min(self.chunk_rows, shape[0]), *shape[1:]))
+        return options
+
+    def __str__(self) -> str:
+        """
+        Get codec text.
+        :return: Codec text.
+        """
+        text = "none" if self.compression == "none" else \
+            "lzf" if self.compression == "lzf" else f"gzip-{self.level}"
+        return text + ("+shuffle" if self.shuffle else "")
+
+
+DEFAULT_CODEC = Codec()
+
 
 def validate_file_path(file_path: str) -> None:
     """
@@ -28,11 +124,25 @@ def validate_directory_path(directory_path: str) -> None:
     assert_util.is_true(os.path.splitext(directory_path)[-1] == "", "path is not a directory")
 
 
+def get_shard_file_name(
+        file_prefix: str,
+        shard_index: int
+) -> str:
+    """
+    Get shard file name.
+    :param file_prefix: Shard file name prefix.
+    :param shard_index: Shard index.
+    :return: Shard file name.
+    """
+    return f"{file_prefix}-{shard_index:05d}.hdf5"
+
+
 def save_file(
         file_path: str,
         datas: list,
         data_names: list[str],
-        dtypes: list[str]
+        dtypes: list[str],
+        codec: Codec = None
 ) -> None:
     """
     Save hdf5 file.
@@ -40,12 +150,20 @@ def save_file(
     :param datas: Hdf5 datas (of list).
     :param data_names: Hdf5 data names (of list).
     :param dtypes: Hdf5 dtypes (of list).
+    :param codec: Dataset codec (gzip-4 if None).
     """
     validate_file_path(file_path)
-    h5 = h5py.File(file_path, "w")
-    for i, _ in enumerate(datas):
-        h5.create_dataset(data_names[i], data=datas[i], compression='gzip', compression_opts=4, dtype=dtypes[i])
-    h5.close()
+    codec = DEFAULT_CODEC if codec is None else codec
+    try:
+        with h5py.File(file_path, "w") as h5:
+            for i, _ in enumerate(datas):
+                options = codec.get_dataset_options(np.shape(datas[i]))
+                h5.create_dataset(data_names[i], data=datas[i], dtype=dtypes[i], **options)
+    except BaseException:
+        # a partially written file is never left on disk
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
 
 
 def save_files(
@@ -68,13 +186,513 @@ def save_files(
         os.makedirs(directory_path)
 
     for i, _ in enumerate(data_names):
-        file_path = f"{directory_path}\\{i + 1 if file_names is None else file_names[i]}.hdf5"
+        file_path = os.path.join(directory_path, f"{i + 1 if file_names is None else file_names[i]}.hdf5")
         save_file(file_path, datas[i], data_names[i], dtypes[i])
 
 
+class FileWriter:
+    """
+    Hdf5 writer which saves each sample into one file.
+    """
+
+    def __init__(
+            self,
+            directory_path: str,
+            codec: Codec = None
+    ) -> None:
+        """
+        Init file writer.
+        :param directory_path: Hdf5 directory path.
+        :param codec: Dataset codec (gzip-4 if None).
+        """
+        validate_directory_path(directory_path)
+        if not os.path.exists(directory_path):
+            os.makedirs(directory_path)
+        self.directory_path: str = directory_path
+        self.codec: Codec = DEFAULT_CODEC if codec is None else codec
+
+    def write(
+            self,
+            datas: list,
+            data_names: list[str],
+            dtypes: list[str],
+            file_name: str
+    ) -> None:
+        """
+        Save sample as '{file_name}.hdf5'.
+        :param datas: Hdf5 datas (of list).
+        :param data_names: Hdf5 data names (of list).
+        :param dtypes: Hdf5 dtypes (of list).
+        :param file_name: Hdf5 file name of sample.
+        """
+        save_file(os.path.join(self.directory_path, f"{file_name}.hdf5"), datas, data_names, dtypes, self.codec)
+
+    def close(self) -> None:
+        """
+        Close file writer.
+        """
+        pass
+
+    def abort(self) -> None:
+        """
+        Abort file writer after a failure (every written file is already complete).
+        """
+        pass
+
+    def __enter__(self) -> Self:
+        """
+        Enter writer context.
+        :return: Writer.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Exit writer context and close writer (or abort it on error).
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ShardWriter:
+    """
+    Hdf5 writer which packs many samples into one shard file. Each data is concatenated along the first axis,
+    and the '{data_name}_offsets' index holds the start (and end) of every sample.
+    In dense mode, a data of the same shape in all samples (such as resampled points) is stacked as one
+    (sample nums, *shape) tensor marked by the 'dense' attribute, without offsets index.
+    """
+
+    def __init__(
+            self,
+            directory_path: str,
+            shard_size: int = 1024,
+            shard_index: int = 0,
+            file_prefix: str = "shard",
+            codec: Codec = None,
+            dense: bool = False
+    ) -> None:
+        """
+        Init shard writer.
+        :param directory_path: Hdf5 directory path.
+        :param shard_size: Sample nums of each shard.
+        :param shard_index: Index of the first shard.
+        :param file_prefix: Shard file name prefix.
+        :param codec: Dataset codec (gzip-4 if None).
+        :param dense: Whether stack the datas of the same shape in all samples as one tensor.
+        """
+        assert_util.is_true(shard_size >= 1, "shard size '{0}' should be positive.", shard_size)
+        validate_directory_path(directory_path)
+        if not os.path.exists(directory_path):
+            os.makedirs(directory_path)
+        self.directory_path: str = directory_path
+        self.shard_size: int = shard_size
+        self.shard_index: int = shard_index
+        self.file_prefix: str = file_prefix
+        self.codec: Codec = DEFAULT_CODEC if codec is None else codec
+        self.dense: bool = dense
+        self.__samples__: list[tuple[list, list[str], list[str], str]] = []
+
+    def get_shard_path(
+            self,
+            shard_index: int
+    ) -> str:
+        """
+        Get shard file path.
+        :param shard_index: Shard index.
+        :return: Shard file path.
+        """
+        return os.path.join(self.directory_path, get_shard_file_name(self.file_prefix, shard_index))
+
+    def write(
+            self,
+            datas: list,
+            data_names: list[str],
+            dtypes: list[str],
+            file_name: str
+    ) -> None:
+        """
+        Append sample into the current shard, and save the shard when it is full.
+        :param datas: Hdf5 datas (of list).
+        :param data_names: Hdf5 data names (of list).
+        :param dtypes: Hdf5 dtypes (of list).
+        :param file_name: Sample name.
+        """
+        if len(self.__samples__) > 0:
+            assert_util.is_true(data_names == self.__samples__[0][1],
+                                "data names {0} are different from the shard data names {1}.",
+                                data_names, self.__samples__[0][1])
+        self.__samples__.append((datas, data_names, dtypes, str(file_name)))
+        if len(self.__samples__) >= self.shard_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Save the buffered samples as one shard.
+        """
+        if len(self.__samples__) == 0:
+            return
+        file_path = self.get_shard_path(self.shard_index)
+        _, data_names, dtypes, _ = self.__samples__[0]
+        try:
+            with h5py.File(file_path, "w") as h5:
+                self.__write_shard__(h5, data_names, dtypes)
+        except BaseException:
+            # a partially written shard is never left on disk (its samples are regenerated on resume)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+
+        self.__samples__ = []
+        self.shard_index += 1
+
+    def __write_shard__(
+            self,
+            h5: File,
+            data_names: list[str],
+            dtypes: list[str]
+    ) -> None:
+        """
+        Write the buffered samples into shard file.
+        :param h5: Shard file.
+        :param data_names: Hdf5 data names (of list).
+        :param dtypes: Hdf5 dtypes (of list).
+        """
+        for i, data_name in enumerate(data_names):
+            datas = [np.asarray(sample[0][i]) for sample in self.__samples__]
+            if self.dense and len({data.shape for data in datas}) == 1:
+                data = np.stack(datas)
+                dataset = h5.create_dataset(data_name, data=data, dtype=dtypes[i],
+                                            **self.codec.get_dataset_options(data.shape))
+                dataset.attrs[DENSE_ATTRIBUTE] = True
+                continue
+            offsets = np.concatenate(([0], np.cumsum([len(data) for data in datas])))
+            data = np.concatenate(datas)
+            h5.create_dataset(data_name, data=data, dtype=dtypes[i], **self.codec.get_dataset_options(data.shape))
+            h5.create_dataset(f"{data_name}_offsets", data=offsets, dtype="int64")
+        h5.create_dataset("names", data=[sample[3] for sample in self.__samples__], dtype=h5py.string_dtype())
+
+    def close(self) -> None:
+        """
+        Save the last (not full) shard.
+        """
+        self.flush()
+
+    def abort(self) -> None:
+        """
+        Abort shard writer after a failure: drop the buffered samples instead of saving an incomplete shard.
+        """
+        self.__samples__ = []
+
+    def __enter__(self) -> Self:
+        """
+        Enter writer context.
+        :return: Writer.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Exit writer context and close writer (or abort it on error).
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class RaggedWriter(ShardWriter):
+    """
+    Shard writer of ragged format: every data is one contiguous uncompressed array (with its offsets index),
+    so that RaggedReader could memory-map the shard and get each sample as a zero-copy view.
+    """
+
+    def __init__(
+            self,
+            directory_path: str,
+            shard_size: int = 1024,
+            shard_index: int = 0,
+            file_prefix: str = "ragged",
+            dense: bool = False
+    ) -> None:
+        """
+        Init ragged writer.
+        :param directory_path: Hdf5 directory path.
+        :param shard_size: Sample nums of each shard.
+        :param shard_index: Index of the first shard.
+        :param file_prefix: Shard file name prefix.
+        :param dense: Whether stack the datas of the same shape in all samples as one tensor.
+        """
+        super().__init__(directory_path, shard_size, shard_index, file_prefix, Codec("none"), dense)
+
+
+class RaggedReader:
+    """
+    Reader of ragged shard. The contiguous datasets are memory-mapped, so getting a sample costs O(1) without
+    decompression or copy, and only the touched pages are read from disk.
+    """
+
+    def __init__(
+            self,
+            file_path: str
+    ) -> None:
+        """
+        Init ragged reader and map the datasets of shard.
+        :param file_path: Hdf5 ragged shard file path.
+        """
+        validate_file_path(file_path)
+        self.file_path: str = file_path
+        self.__arrays__: dict[str, ndarray] = {}
+        self.__offsets__: dict[str, ndarray] = {}
+        with h5py.File(file_path, "r") as h5:
+            self.__names__: list[str] = [name.decode("utf-8") if isinstance(name, bytes) else name
+                                         for name in h5.get("names")[()]]
+            for data_name in get_shard_data_names(h5):
+                dataset = h5.get(data_name)
+                offset = dataset.id.get_offset()
+                assert_util.is_true(offset is not None or dataset.size == 0,
+                                    "data '{0}' of '{1}' is not contiguous.", data_name, file_path)
+                if f"{data_name}_offsets" in h5:
+                    self.__offsets__[data_name] = h5.get(f"{data_name}_offsets")[()]
+                self.__arrays__[data_name] = np.empty(dataset.shape, dtype=dataset.dtype) if offset is None \
+                    else np.memmap(file_path, dtype=dataset.dtype, mode="r", offset=offset, shape=dataset.shape)
+
+    def __len__(self) -> int:
+        """
+        Get sample nums of shard.
+        :return: Sample nums.
+        """
+        return len(self.__names__)
+
+    def get_names(self) -> list[str]:
+        """
+        Get sample names of shard.
+        :return: Sample names.
+        """
+        return self.__names__
+
+    def get_data_names(self) -> list[str]:
+        """
+        Get data names of shard.
+        :return: Data names.
+        """
+        return list(self.__arrays__.keys())
+
+    def get_data(
+            self,
+            data_name: str,
+            index: int
+    ) -> ndarray:
+        """
+        Get data of one sample (a read-only view of the mapped shard).
+        :param data_name: Data name.
+        :param index: Sample index in shard.
+        :return: Data of sample.
+        """
+        if data_name not in self.__offsets__:
+            return self.__arrays__[data_name][index]
+        offsets = self.__offsets__[data_name]
+        return self.__arrays__[data_name][offsets[index]: offsets[index + 1]]
+
+    def get_sample(
+            self,
+            index: int
+    ) -> dict[str, ndarray]:
+        """
+        Get all datas of one sample (read-only views).
+        :param index: Sample index in shard.
+        :return: Dict of data name -> data.
+        """
+        return {data_name: self.get_data(data_name, index) for data_name in self.__arrays__.keys()}
+
+    def get_value(
+            self,
+            index: int
+    ) -> ndarray[ndarray]:
+        """
+        Get strokes value of one sample. It is a zero-copy view of float64 shard, or decoded from other precision.
+        :param index: Sample index in shard.
+        :return: Strokes value.
+        """
+        if "value" in self.__arrays__ and self.__arrays__["value"].dtype == np.float64:
+            return self.get_data("value", index)
+        return decode_value({data_name: self.get_data(data_name, index)
+                             for data_name in VALUE_DATA_NAMES if data_name in self.__arrays__})
+
+    def close(self) -> None:
+        """
+        Release the mapped datasets.
+        """
+        self.__arrays__ = {}
+        self.__offsets__ = {}
+
+    def __enter__(self) -> Self:
+        """
+        Enter reader context.
+        :return: Reader.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Exit reader context and close reader.
+        """
+        self.close()
+
+
+class AsyncWriter:
+    """
+    Hdf5 writer which hands samples to a background thread, so compression and file I/O of one sample overlap with
+    generating the next. The bounded queue blocks the caller when it is full (backpressure), close flushes all queued
+    samples, and errors of the writer thread are raised back to the caller on the next write or on close.
+    """
+
+    __END__ = object()
+
+    def __init__(
+            self,
+            writer: FileWriter | ShardWriter | RaggedWriter,
+            queue_size: int = 16
+    ) -> None:
+        """
+        Init async writer and start its writer thread.
+        :param writer: Wrapped hdf5 writer (file or shard writer).
+        :param queue_size: Max queued sample nums.
+        """
+        assert_util.is_true(queue_size >= 1, "queue size '{0}' should be positive.", queue_size)
+        self.writer: FileWriter | ShardWriter | RaggedWriter = writer
+        self.__queue__: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.__error__: BaseException | None = None
+        self.__raised__: bool = False
+        self.__closed__: bool = False
+        self.__aborted__: bool = False
+        self.__thread__: threading.Thread = threading.Thread(target=self.__run__, name="hdf5-writer", daemon=True)
+        self.__thread__.start()
+
+    def __run__(self) -> None:
+        """
+        Write queued samples until the end of queue, then close the wrapped writer (or abort it after an error or
+        abort, so that no incomplete shard is saved). After an error the rest samples are dropped, so that the caller
+        is never blocked by a full queue. The first error is kept.
+        """
+        try:
+            while True:
+                sample = self.__queue__.get()
+                if sample is AsyncWriter.__END__:
+                    break
+                if self.__error__ is None and not self.__aborted__:
+                    try:
+                        self.writer.write(*sample)
+                    except BaseException as error:
+                        self.__error__ = error
+        finally:
+            try:
+                if self.__error__ is None and not self.__aborted__:
+                    self.writer.close()
+                else:
+                    self.writer.abort()
+            except BaseException as error:
+                self.__error__ = error if self.__error__ is None else self.__error__
+
+    def __raise_error__(self) -> None:
+        """
+        Raise the error of writer thread (once).
+        """
+        if self.__error__ is not None and not self.__raised__:
+            self.__raised__ = True
+            raise self.__error__
+
+    def write(
+            self,
+            datas: list,
+            data_names: list[str],
+            dtypes: list[str],
+            file_name: str
+    ) -> None:
+        """
+        Queue sample (a copy of datas) for the writer thread, blocking while the queue is full.
+        :param datas: Hdf5 datas (of list).
+        :param data_names: Hdf5 data names (of list).
+        :param dtypes: Hdf5 dtypes (of list).
+        :param file_name: Hdf5 file (or sample) name.
+        """
+        assert_util.is_false(self.__closed__, "writer is closed.")
+        self.__raise_error__()
+        assert_util.is_true(self.__error__ is None, "writer is failed: {0}", self.__error__)
+        self.__queue__.put(([np.array(data) for data in datas], list(data_names), list(dtypes), file_name))
+
+    def close(self) -> None:
+        """
+        Write all queued samples, close the wrapped writer and stop the writer thread.
+        """
+        if not self.__closed__:
+            self.__closed__ = True
+            self.__queue__.put(AsyncWriter.__END__)
+            self.__thread__.join()
+        self.__raise_error__()
+
+    def abort(self) -> None:
+        """
+        Drop the queued samples, abort the wrapped writer and stop the writer thread (after a failure of caller).
+        """
+        if not self.__closed__:
+            self.__closed__ = True
+            self.__aborted__ = True
+            self.__queue__.put(AsyncWriter.__END__)
+            self.__thread__.join()
+
+    def __enter__(self) -> Self:
+        """
+        Enter writer context.
+        :return: Writer.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Exit writer context and close writer (or abort it on error).
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def get_writer(
+        output_format: str,
+        directory_path: str,
+        shard_size: int = 1024,
+        shard_index: int = 0,
+        queue_size: int = 0,
+        codec: Codec = None,
+        dense: bool = False
+) -> FileWriter | ShardWriter | RaggedWriter | AsyncWriter:
+    """
+    Get hdf5 writer of output format.
+    :param output_format: Output format ('file', 'shard' or 'ragged').
+    :param directory_path: Hdf5 directory path.
+    :param shard_size: Sample nums of each shard.
+    :param shard_index: Index of the first shard.
+    :param queue_size: Queue size of background writer thread (writing in the caller thread if 0).
+    :param codec: Dataset codec (gzip-4 if None, and always none in 'ragged' format).
+    :param dense: Whether stack the datas of the same shape in all samples of shard as one tensor.
+    :return: Hdf5 writer.
+    """
+    assert_util.is_true(output_format in OUTPUT_FORMATS, "output format '{0}' is not supported.", output_format)
+    assert_util.is_true(queue_size >= 0, "queue size '{0}' can not be negative.", queue_size)
+    if output_format == "shard":
+        writer = ShardWriter(directory_path, shard_size, shard_index, codec=codec, dense=dense)
+    elif output_format == "ragged":
+        writer = RaggedWriter(directory_path, shard_size, shard_index, dense=dense)
+    else:
+        writer = FileWriter(directory_path, codec)
+    return AsyncWriter(writer, queue_size) if queue_size > 0 else writer
+
+
 def read_file(file_path: str) -> File:
     """
-    Read hdf5 file
+    Read hdf5 file (the caller should close it, or use dataset_util.DatasetReader for pooled handles).
     :param file_path: Hdf5 file path.
     :return: Hdf5 file.
     """
@@ -93,3 +711,125 @@ def get_data_2ndarray(
     :return: Data instance.
     """
     return file.get(data_name)
+
+
+def encode_value(
+        value: ndarray[ndarray],
+        precision: str = "float64"
+) -> tuple[list, list[str], list[str]]:
+    """
+    Encode strokes value ([x, z, y, stroke id] of each point) as hdf5 datas of storage precision.
+    'float64' keeps the (N, 4) 'value' data. Other precisions store (N, 3) 'points' of the precision and (N,)
+    'stroke_ids' of small integer, and 'int16' quantizes points with the per-sample 'points_scale' and
+    'points_offset' (of shape (1, 3)), so that points = quantized points * scale + offset.
+    :param value: Strokes value.
+    :param precision: Storage precision ('float64', 'float32', 'float16' or 'int16').
+    :return: Datas, data names and dtypes.
+    """
+    assert_util.is_true(precision in PRECISIONS, "storage precision '{0}' is not supported.", precision)
+    if precision == "float64":
+        return [value], ["value"], ["float"]
+
+    value = np.asarray(value, dtype=float)
+    points = value[:, 0: 3]
+    stroke_ids = value[:, 3]
+    assert_util.is_true(len(stroke_ids) == 0 or 0 <= stroke_ids.min() and stroke_ids.max() <= np.iinfo(np.uint16).max,
+                        "stroke ids are out of the range of '{0}'.", STROKE_ID_DTYPE)
+    if precision != "int16":
+        return [points, stroke_ids], ["points", "stroke_ids"], [precision, STROKE_ID_DTYPE]
+
+    bound = np.iinfo(np.int16).max
+    lower = points.min(axis=0) if len(points) > 0 else np.zeros(3)
+    upper = points.max(axis=0) if len(points) > 0 else np.zeros(3)
+    offset = (lower + upper) / 2
+    scale = np.where(upper > lower, (upper - lower) / (2 * bound), 1.0)
+    quantized = np.clip(np.rint((points - offset) / scale), -bound, bound)
+    return [quantized, stroke_ids, scale[None], offset[None]], \
+        ["points", "stroke_ids", "points_scale", "points_offset"], ["int16", STROKE_ID_DTYPE, "float", "float"]
+
+
+def decode_value(datas: dict[str, ndarray]) -> ndarray[ndarray]:
+    """
+    Decode strokes value from hdf5 datas of any storage precision.
+    :param datas: Dict of data name -> data (of one sample).
+    :return: Strokes value of float64.
+    """
+    if "value" in datas:
+        return np.asarray(datas["value"], dtype=float)
+    points = np.asarray(datas["points"], dtype=float)
+    if "points_scale" in datas:
+        points = points * np.asarray(datas["points_scale"])[0] + np.asarray(datas["points_offset"])[0]
+    return np.column_stack((points, np.asarray(datas["stroke_ids"], dtype=float)))
+
+
+def get_value_2ndarray(file: File) -> ndarray[ndarray]:
+    """
+    Get strokes value of sample file (of any storage precision).
+    :param file: Hdf5 file.
+    :return: Strokes value.
+    """
+    return decode_value({data_name: file.get(data_name)[()] for data_name in VALUE_DATA_NAMES if data_name in file})
+
+
+def get_shard_sample_nums(file: File) -> int:
+    """
+    Get sample nums of shard file.
+    :param file: Hdf5 shard file.
+    :return: Sample nums.
+    """
+    return len(file.get("names"))
+
+
+def is_dense_data(
+        file: File,
+        data_name: str
+) -> bool:
+    """
+    Whether the data of shard file is a dense tensor (of sample nums, *data shape).
+    :param file: Hdf5 shard file.
+    :param data_name: Data name of hdf5 file.
+    :return: Whether the data is dense.
+    """
+    return bool(file.get(data_name).attrs.get(DENSE_ATTRIBUTE, False))
+
+
+def get_shard_data_names(file: File) -> list[str]:
+    """
+    Get names of the per-sample datas of shard file (with offsets index, or dense).
+    :param file: Hdf5 shard file.
+    :return: Data names.
+    """
+    return [data_name for data_name in file.keys()
+            if f"{data_name}_offsets" in file or is_dense_data(file, data_name)]
+
+
+def get_shard_data_2ndarray(
+        file: File,
+        data_name: str,
+        index: int
+) -> ndarray:
+    """
+    Get data_value of one sample in shard file through offsets index (or the index of dense tensor).
+    :param file: Hdf5 shard file.
+    :param data_name: Data name of hdf5 file.
+    :param index: Sample index in shard.
+    :return: Data value of sample.
+    """
+    if is_dense_data(file, data_name):
+        return file.get(data_name)[index]
+    offsets = file.get(f"{data_name}_offsets")
+    return file.get(data_name)[offsets[index]: offsets[index + 1]]
+
+
+def get_shard_value_2ndarray(
+        file: File,
+        index: int
+) -> ndarray[ndarray]:
+    """
+    Get strokes value of one sample in shard file (of any storage precision).
+    :param file: Hdf5 shard file.
+    :param index: Sample index in shard.
+    :return: Strokes value.
+    """
+    return decode_value({data_name: get_shard_data_2ndarray(file, data_name, index)
+                         for data_name in VALUE_DATA_NAMES if data_name in file})
@@ -0,0 +1,316 @@
+import hashlib
+import json
+import os.path
+import re
+from typing import Any
+
+from utils import assert_util
+
+MANIFEST_FILE_NAME = "manifest.jsonl"
+_NODE_MANIFEST_PATTERN_ = re.compile(r"^manifest-(\d+)-of-(\d+)\.jsonl$")
+# encoding options of output files, and their values of the entries written before they were recorded
+ENTRY_OPTIONS = {"codec": "gzip-4", "precision": "float64", "resample_nums": None, "resample_method": None}
+
+
+def validate_node(
+        node_id: int,
+        node_count: int
+) -> None:
+    """
+    Validate node id and node count of multi-node generation.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    """
+    assert_util.is_true(node_count >= 1, "node count '{0}' should be positive.", node_count)
+    assert_util.is_true(0 <= node_id < node_count, "node id '{0}' is out of range [0, {1}).", node_id, node_count)
+
+
+def get_manifest_file_name(
+        node_id: int = 0,
+        node_count: int = 1
+) -> str:
+    """
+    Get manifest file name of node. A single node run writes 'manifest.jsonl', so does the merge of node manifests.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    :return: Manifest file name ('manifest-{node id}-of-{node count}.jsonl' of multi-node run).
+    """
+    validate_node(node_id, node_count)
+    return MANIFEST_FILE_NAME if node_count == 1 else f"manifest-{node_id:05d}-of-{node_count:05d}.jsonl"
+
+
+def get_manifest_path(
+        directory_path: str,
+        node_id: int = 0,
+        node_count: int = 1
+) -> str:
+    """
+    Get manifest file path of output directory.
+    :param directory_path: Output directory path.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    :return: Manifest file path.
+    """
+    return os.path.join(directory_path, get_manifest_file_name(node_id, node_count))
+
+
+def get_file_checksum(file_path: str) -> str:
+    """
+    Get sha256 checksum of file.
+    :param file_path: File path.
+    :return: Checksum of 'sha256:{hex digest}'.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def get_entry(
+        directory_path: str,
+        file_name: str,
+        geometry_name: str,
+        seed: int,
+        start: int,
+        count: int,
+        output_format: str,
+        options: dict[str, Any] = None
+) -> dict[str, Any]:
+    """
+    Get manifest entry of one finished (and closed) output file.
+    :param directory_path: Output directory path.
+    :param file_name: Output file name.
+    :param geometry_name: Geometry name.
+    :param seed: Base seed (sample i is seeded by (seed, geometry, i)).
+    :param start: Sample index of the first sample of file.
+    :param count: Sample nums of file.
+    :param output_format: Output format ('file', 'shard' or 'ragged').
+    :param options: Encoding options of file (codec, precision, resample nums and method, default ones if None).
+    :return: Manifest entry.
+    """
+    file_path = os.path.join(directory_path, file_name)
+    return {
+        "id": start + 1,
+        "count": count,
+        "geometry": geometry_name,
+        "seed": seed,
+        "format": output_format,
+        **get_entry_options(ENTRY_OPTIONS if options is None else options),
+        "file": file_name,
+        "checksum": get_file_checksum(file_path),
+        "size": os.path.getsize(file_path)
+    }
+
+
+def get_entry_options(entry: dict[str, Any]) -> dict[str, Any]:
+    """
+    Get encoding options of manifest entry (or of an options dict), the missing ones are the default ones.
+    :param entry: Manifest entry.
+    :return: Encoding options (codec, precision, resample nums and method).
+    """
+    return {key: entry.get(key, value) for key, value in ENTRY_OPTIONS.items()}
+
+
+def load_manifest(
+        directory_path: str,
+        node_id: int = 0,
+        node_count: int = 1
+) -> list[dict[str, Any]]:
+    """
+    Load manifest entries of output directory. A partially written last line (of a crashed run) is dropped.
+    :param directory_path: Output directory path.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    :return: Manifest entries in order (empty if no manifest).
+    """
+    manifest_path = get_manifest_path(directory_path, node_id, node_count)
+    if not os.path.exists(manifest_path):
+        return []
+    with open(manifest_path, "r", encoding="utf-8") as file:
+        lines = file.read().split("\n")
+    # the text after the last line break is never a finished entry
+    return [json.loads(line) for line in lines[:-1] if line.strip() != ""]
+
+
+def _get_last_line_end_(
+        file: Any,
+        end: int
+) -> int:
+    """
+    Get the position after the last line break of file, by reading blocks backwards from the end.
+    :param file: Binary file.
+    :param end: File size.
+    :return: Position after the last line break (0 if there is no line break).
+    """
+    position = end
+    while position > 0:
+        start = max(position - 65536, 0)
+        file.seek(start)
+        index = file.read(position - start).rfind(b"\n")
+        if index >= 0:
+            return start + index + 1
+        position = start
+    return 0
+
+
+def append_manifest(
+        directory_path: str,
+        entries: list[dict[str, Any]],
+        node_id: int = 0,
+        node_count: int = 1
+) -> None:
+    """
+    Append entries to manifest (one json line each entry), after dropping a partially written last line.
+    :param directory_path: Output directory path.
+    :param entries: Manifest entries.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    """
+    if len(entries) == 0:
+        return
+    manifest_path = get_manifest_path(directory_path, node_id, node_count)
+    with open(manifest_path, "a+b") as file:
+        end = file.seek(0, os.SEEK_END)
+        if end > 0:
+            file.seek(end - 1)
+            if file.read(1) != b"\n":
+                file.truncate(_get_last_line_end_(file, end))
+        file.write("".join(json.dumps(entry) + "\n" for entry in entries).encode("utf-8"))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _get_complete_entries_(
+        directory_path: str,
+        entries: list[dict[str, Any]],
+        verify: bool = False
+) -> dict[str, dict[str, Any]]:
+    """
+    Get entries whose file is still complete (same size, and same checksum if verify), the last entry of each file.
+    :param directory_path: Directory path of entry files.
+    :param entries: Manifest entries in order.
+    :param verify: Whether verify checksum of files.
+    :return: Dict of file name -> (last) entry.
+    """
+    entries = {entry["file"]: entry for entry in entries}
+    completed = {}
+    for file_name, entry in entries.items():
+        file_path = os.path.join(directory_path, file_name)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != entry["size"]:
+            continue
+        if verify and get_file_checksum(file_path) != entry["checksum"]:
+            continue
+        completed[file_name] = entry
+    return completed
+
+
+def get_completed_entries(
+        directory_path: str,
+        geometry_name: str,
+        output_format: str,
+        verify: bool = False,
+        node_id: int = 0,
+        node_count: int = 1,
+        options: dict[str, Any] = None
+) -> dict[str, dict[str, Any]]:
+    """
+    Get manifest entries whose file is still complete (same size, and same checksum if verify).
+    The entries should be of the same geometry, format and encoding options as the run.
+    :param directory_path: Output directory path.
+    :param geometry_name: Geometry name.
+    :param output_format: Output format ('file', 'shard' or 'ragged').
+    :param verify: Whether verify checksum of files.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    :param options: Encoding options of run (codec, precision, resample nums and method, default ones if None).
+    :return: Dict of file name -> (last) entry.
+    """
+    entries = load_manifest(directory_path, node_id, node_count)
+    options = get_entry_options(ENTRY_OPTIONS if options is None else options)
+    for entry in entries:
+        assert_util.is_true(entry["geometry"] == geometry_name and entry["format"] == output_format,
+                            "manifest of '{0}' ({1}) does not match the run of '{2}' ({3}).",
+                            entry["geometry"], entry["format"], geometry_name, output_format)
+        assert_util.is_true(get_entry_options(entry) == options,
+                            "manifest options {0} do not match the options {1} of run.",
+                            get_entry_options(entry), options)
+    return _get_complete_entries_(directory_path, entries, verify)
+
+
+def get_manifest_seed(
+        directory_path: str,
+        node_id: int = 0,
+        node_count: int = 1
+) -> int | None:
+    """
+    Get base seed of the run recorded in manifest.
+    :param directory_path: Output directory path.
+    :param node_id: Node id (from 0).
+    :param node_count: Node nums.
+    :return: Base seed (None if no entry).
+    """
+    entries = load_manifest(directory_path, node_id, node_count)
+    seeds = {entry["seed"] for entry in entries}
+    assert_util.is_true(len(seeds) <= 1, "manifest holds entries of different seeds: {0}.", sorted(seeds))
+    return entries[0]["seed"] if len(entries) > 0 else None
+
+
+def list_node_manifests(directory_path: str) -> list[tuple[int, int]]:
+    """
+    List the (node id, node count) of node manifests in output directory.
+    :param directory_path: Output directory path.
+    :return: Sorted (node id, node count) of node manifests.
+    """
+    matches = [_NODE_MANIFEST_PATTERN_.match(file_name) for file_name in os.listdir(directory_path)]
+    return sorted((int(match.group(1)), int(match.group(2))) for match in matches if match is not None)
+
+
+def merge_manifests(
+        directory_paths: list[str],
+        output_path: str,
+        count: int = None,
+        verify: bool = False
+) -> list[dict[str, Any]]:
+    """
+    Merge the node manifests of output directories into one dataset index ('manifest.jsonl' of output path).
+    No data is copied, the files of merged entries are relative to output path. The merged entries should cover
+    the samples from id 1 without gap or overlap, and share the same geometry, seed, format and encoding options.
+    :param directory_paths: Output directory paths of nodes (a shared directory could hold all node manifests).
+    :param output_path: Directory path of merged manifest.
+    :param count: Sample nums of dataset (the missing samples at the end are found only if it is given).
+    :param verify: Whether verify checksum (not only size) of files.
+    :return: Merged entries in the order of sample id.
+    """
+    merged = []
+    node_counts = set()
+    for directory_path in dict.fromkeys(os.path.abspath(path) for path in directory_paths):
+        nodes = list_node_manifests(directory_path)
+        assert_util.is_true(len(nodes) > 0, "could not find node manifest in '{0}'.", directory_path)
+        for node_id, node_count in nodes:
+            node_counts.add(node_count)
+            entries = load_manifest(directory_path, node_id, node_count)
+            for entry in _get_complete_entries_(directory_path, entries, verify).values():
+                file_path = os.path.join(directory_path, entry["file"])
+                merged.append(dict(entry, file=os.path.relpath(file_path, output_path).replace(os.sep, "/")))
+    assert_util.is_true(len(node_counts) == 1, "node manifests of different node counts: {0}.", sorted(node_counts))
+
+    runs = {(entry["geometry"], entry["seed"], entry["format"], *get_entry_options(entry).values()) for entry in merged}
+    assert_util.is_true(len(runs) == 1, "node manifests of different runs (geometry, seed, format, options): {0}.",
+                        sorted(runs, key=str))
+    merged.sort(key=lambda entry: entry["id"])
+    next_id = 1
+    for entry in merged:
+        assert_util.is_true(entry["id"] == next_id,
+                            "samples from id '{0}' (to the id '{1}') are missing or overlapped.", next_id, entry["id"])
+        next_id += entry["count"]
+    assert_util.is_true(count is None or next_id - 1 == count, "samples from id '{0}' to '{1}' are missing.",
+                        next_id, count)
+
+    manifest_path = get_manifest_path(output_path)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as file:
+        file.write("".join(json.dumps(entry) + "\n" for entry in merged))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    return merged
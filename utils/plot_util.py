@@ -0,0 +1,21 @@
+from numpy import ndarray
+
+
+def show_points3d(
+        points: ndarray[ndarray],
+        size: float = 1
+) -> None:
+    """
+    Show points in 3d scatter. Matplotlib is imported on call, so generation never pays for it.
+    :param points: Points (or strokes value) of [x, z, y].
+    :param size: Marker size.
+    """
+    from matplotlib import pyplot as plt
+
+    fig = plt.figure()
+    ax = fig.add_subplot(projection="3d")
+    ax.scatter(points[:, 0], points[:, 1], points[:, 2], s=size)
+    ax.set_xlabel('X label')
+    ax.set_ylabel('Y label')
+    ax.set_zlabel('Z label')
+    plt.show()
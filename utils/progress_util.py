@@ -0,0 +1,100 @@
+import logging
+import time
+from typing import Any
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Format duration as 'hh:mm:ss'.
+    :param seconds: Duration (in seconds).
+    :return: Formatted duration ('--:--:--' if unknown).
+    """
+    if seconds != seconds or seconds == float("inf"):
+        return "--:--:--"
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_bytes(nbytes: float) -> str:
+    """
+    Format bytes with binary unit.
+    :param nbytes: Bytes.
+    :return: Formatted bytes (such as '1.5 MiB').
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(nbytes) < 1024:
+            return f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} TiB"
+
+
+class ProgressReporter:
+    """
+    Report throughput (samples, points and bytes per second) and ETA of dataset generation.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            interval: float = 1.0,
+            logger: logging.Logger = None
+    ) -> None:
+        """
+        Init progress reporter, and start timing.
+        :param name: Task name (such as geometry name).
+        :param interval: Min interval (in seconds) between two reports.
+        :param logger: Logger of reports (logger 'progress' if None).
+        """
+        self.name: str = name
+        self.interval: float = interval
+        self.__logger__: logging.Logger = logging.getLogger("progress") if logger is None else logger
+        self.__start__: float = time.perf_counter()
+        self.__reported__: float = float("-inf")
+        self.stats: dict[str, int] = {"samples": 0, "points": 0, "bytes": 0}
+        self.total: int = 0
+
+    def get_rates(self) -> dict[str, Any]:
+        """
+        Get throughput and ETA of the latest progress.
+        :return: Elapsed seconds, samples, points and bytes per second, and ETA seconds.
+        """
+        seconds = time.perf_counter() - self.__start__
+        samples_per_second = self.stats["samples"] / seconds if seconds > 0 else 0.0
+        remaining = max(self.total - self.stats["samples"], 0)
+        return {
+            "seconds": seconds,
+            "samples_per_second": samples_per_second,
+            "points_per_second": self.stats["points"] / seconds if seconds > 0 else 0.0,
+            "bytes_per_second": self.stats["bytes"] / seconds if seconds > 0 else 0.0,
+            "eta_seconds": 0.0 if remaining == 0 else remaining / samples_per_second if samples_per_second > 0
+            else float("inf")
+        }
+
+    def format(self) -> str:
+        """
+        Format the latest progress.
+        :return: Progress text.
+        """
+        rates = self.get_rates()
+        return (f"{self.name}: {self.stats['samples']}/{self.total} samples, "
+                f"{rates['samples_per_second']:.1f} samples/s, {rates['points_per_second']:.0f} points/s, "
+                f"{format_bytes(rates['bytes_per_second'])}/s, "
+                f"elapsed {format_duration(rates['seconds'])}, ETA {format_duration(rates['eta_seconds'])}")
+
+    def update(
+            self,
+            stats: dict[str, int],
+            total: int
+    ) -> None:
+        """
+        Update progress (as the progress callback of generate_dataset), reported at most once each interval
+        and when all samples are generated.
+        :param stats: Generated sample, point and byte nums.
+        :param total: Sample nums to generate.
+        """
+        self.stats = {key: stats.get(key, 0) for key in ("samples", "points", "bytes")}
+        self.total = total
+        now = time.perf_counter()
+        if now - self.__reported__ >= self.interval or self.stats["samples"] >= total:
+            self.__reported__ = now
+            self.__logger__.info(self.format())
@@ -0,0 +1,59 @@
+import zlib
+
+import numpy as np
+from numpy.random import Generator
+
+_default_generator_: Generator | None = None
+
+
+def get_sample_seed(
+        seed: int,
+        geometry_name: str,
+        index: int
+) -> int:
+    """
+    Get the seed of one sample, derived from (base seed, geometry, sample index).
+    :param seed: Base seed of generation.
+    :param geometry_name: Geometry name.
+    :param index: Sample index.
+    :return: Sample seed.
+    """
+    geometry_key = zlib.crc32(geometry_name.encode("utf-8"))
+    return int(np.random.SeedSequence([seed, geometry_key, index]).generate_state(1, dtype=np.uint64)[0])
+
+
+def get_sample_generator(
+        seed: int,
+        geometry_name: str,
+        index: int
+) -> Generator:
+    """
+    Get the random generator of one sample, so that any sample could be regenerated on its own.
+    :param seed: Base seed of generation.
+    :param geometry_name: Geometry name.
+    :param index: Sample index.
+    :return: Random generator of sample.
+    """
+    return np.random.default_rng(get_sample_seed(seed, geometry_name, index))
+
+
+def get_generator(rng: Generator = None) -> Generator:
+    """
+    Get the random generator, or the (unseeded) default generator if it is None.
+    :param rng: Random generator.
+    :return: Random generator.
+    """
+    global _default_generator_
+    if rng is not None:
+        return rng
+    if _default_generator_ is None:
+        _default_generator_ = np.random.default_rng()
+    return _default_generator_
+
+
+def new_base_seed() -> int:
+    """
+    Get a new base seed from system entropy.
+    :return: Base seed.
+    """
+    return int(np.random.SeedSequence().generate_state(1, dtype=np.uint32)[0])
@@ -0,0 +1,123 @@
+import numpy as np
+from numpy import ndarray
+
+from utils import assert_util
+
+RESAMPLE_METHODS = ("arc_length", "farthest_point")
+
+
+def _get_stroke_bounds_(stroke_ids: ndarray) -> tuple[ndarray, ndarray]:
+    """
+    Get the first and last point index of each stroke of value (sorted by stroke id).
+    :param stroke_ids: Stroke id of each point.
+    :return: First and last point indices of strokes.
+    """
+    starts = np.flatnonzero(np.concatenate(([True], stroke_ids[1:] != stroke_ids[:-1])))
+    ends = np.concatenate((starts[1:], [len(stroke_ids)])) - 1
+    return starts, ends
+
+
+def _get_allocation_(
+        weights: ndarray[float],
+        nums: int
+) -> ndarray[int]:
+    """
+    Allocate point nums to strokes in proportion to weights (largest remainder), at least one point of each stroke
+    if nums is not less than stroke nums.
+    :param weights: Weight (such as length) of each stroke.
+    :param nums: Total point nums.
+    :return: Point nums of each stroke.
+    """
+    base = np.ones(len(weights), dtype=int) if nums >= len(weights) else np.zeros(len(weights), dtype=int)
+    rest = nums - base.sum()
+    weights = weights if weights.sum() > 0 else np.ones(len(weights))
+    quotas = rest * weights / weights.sum()
+    counts = base + np.floor(quotas).astype(int)
+    remainders = np.argsort(-(quotas - np.floor(quotas)), kind="stable")[: nums - counts.sum()]
+    counts[remainders] += 1
+    return counts
+
+
+def resample_arc_length(
+        value: ndarray[ndarray],
+        nums: int
+) -> tuple[ndarray[ndarray], ndarray[int]]:
+    """
+    Resample strokes value to nums points, uniform along the arc length of each stroke (with both endpoints).
+    Point nums of strokes are in proportion to stroke length, and every stroke keeps at least one point
+    if nums is not less than stroke nums.
+    :param value: Strokes value ([x, z, y, stroke id] of each point, sorted by stroke id).
+    :param nums: Point nums of resampled value.
+    :return: Resampled strokes value of shape (nums, 4), and the (nearest) source point index of each point.
+    """
+    assert_util.is_true(nums >= 1, "resample nums '{0}' should be positive.", nums)
+    assert_util.is_true(len(value) > 0, "could not resample blank strokes.")
+    points = value[:, 0: 3]
+    starts, ends = _get_stroke_bounds_(value[:, 3])
+
+    # arc length of each point, without the gaps between strokes
+    lengths = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    lengths[starts[1:] - 1] = 0
+    arc = np.concatenate(([0], np.cumsum(lengths)))
+    stroke_lengths = arc[ends] - arc[starts]
+
+    counts = _get_allocation_(stroke_lengths, nums)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    index = np.arange(nums) - np.repeat(np.cumsum(counts) - counts, counts)
+    ratios = np.divide(index, counts[owners] - 1, out=np.zeros(nums), where=counts[owners] > 1)
+    targets = arc[starts[owners]] + ratios * stroke_lengths[owners]
+
+    # segment (left, left + 1) of each target, inside its own stroke
+    left = np.searchsorted(arc, targets, side="right") - 1
+    left = np.clip(left, starts[owners], np.maximum(ends[owners] - 1, starts[owners]))
+    right = np.minimum(left + 1, ends[owners])
+    segments = arc[right] - arc[left]
+    fractions = np.divide(targets - arc[left], segments, out=np.zeros(nums), where=segments > 0)
+    fractions = np.clip(fractions, 0, 1)[:, None]
+    resampled = points[left] * (1 - fractions) + points[right] * fractions
+    return np.column_stack((resampled, value[left, 3])), np.where(fractions[:, 0] < 0.5, left, right)
+
+
+def resample_farthest_point(
+        value: ndarray[ndarray],
+        nums: int
+) -> tuple[ndarray[ndarray], ndarray[int]]:
+    """
+    Resample strokes value to nums points by farthest point sampling (from the first point), kept in stroke order.
+    If nums is larger than point nums, every point is repeated (evenly) instead.
+    :param value: Strokes value ([x, z, y, stroke id] of each point, sorted by stroke id).
+    :param nums: Point nums of resampled value.
+    :return: Resampled strokes value of shape (nums, 4), and the source point index of each point.
+    """
+    assert_util.is_true(nums >= 1, "resample nums '{0}' should be positive.", nums)
+    assert_util.is_true(len(value) > 0, "could not resample blank strokes.")
+    if nums >= len(value):
+        indices = np.arange(nums) * len(value) // nums
+        return value[indices], indices
+
+    points = value[:, 0: 3]
+    indices = np.zeros(nums, dtype=int)
+    distances = np.full(len(points), np.inf)
+    for i in range(1, nums):
+        distances = np.minimum(distances, np.sum((points - points[indices[i - 1]]) ** 2, axis=1))
+        indices[i] = np.argmax(distances)
+    indices = np.sort(indices)
+    return value[indices], indices
+
+
+def resample_value(
+        value: ndarray[ndarray],
+        nums: int,
+        method: str = "arc_length"
+) -> tuple[ndarray[ndarray], ndarray[int]]:
+    """
+    Resample strokes value to exactly nums points, keeping the stroke id of points.
+    :param value: Strokes value ([x, z, y, stroke id] of each point, sorted by stroke id).
+    :param nums: Point nums of resampled value.
+    :param method: Resample method ('arc_length' or 'farthest_point').
+    :return: Resampled strokes value of shape (nums, 4), and the (nearest) source point index of each point.
+    """
+    assert_util.is_true(method in RESAMPLE_METHODS, "resample method '{0}' is not supported.", method)
+    if method == "arc_length":
+        return resample_arc_length(value, nums)
+    return resample_farthest_point(value, nums)
@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+import numpy as np
+
+_NULL_CONTEXT_ = nullcontext()
+
+
+class Tracer:
+    """
+    Record per-stage durations of each generated sample. Export as chrome trace or aggregated percentiles.
+    A disabled tracer returns a shared empty context for every stage, so its overhead is close to zero.
+    """
+
+    def __init__(
+            self,
+            enabled: bool = True
+    ) -> None:
+        """
+        Init tracer.
+        :param enabled: Whether record stages.
+        """
+        self.enabled: bool = enabled
+        self.__events__: list[tuple[str, str, str, int, int, int]] = []
+        self.__local__: threading.local = threading.local()
+        self.__lock__: threading.Lock = threading.Lock()
+
+    def sample(
+            self,
+            geometry_name: str,
+            sample_name: Any = None
+    ) -> ContextManager:
+        """
+        Label the stages recorded (in this thread) inside the context with geometry and sample.
+        :param geometry_name: Geometry name.
+        :param sample_name: Sample name.
+        :return: Sample context.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT_
+        return self.__sample__(geometry_name, sample_name)
+
+    @contextmanager
+    def __sample__(
+            self,
+            geometry_name: str,
+            sample_name: Any
+    ) -> Iterator[None]:
+        """
+        Sample context of enabled tracer.
+        :param geometry_name: Geometry name.
+        :param sample_name: Sample name.
+        """
+        labels = getattr(self.__local__, "labels", None)
+        self.__local__.labels = (geometry_name, "" if sample_name is None else str(sample_name))
+        try:
+            yield
+        finally:
+            self.__local__.labels = labels
+
+    def stage(
+            self,
+            name: str,
+            geometry_name: str = None,
+            sample_name: Any = None
+    ) -> ContextManager:
+        """
+        Record the duration of stage inside the context.
+        :param name: Stage name.
+        :param geometry_name: Geometry name (label of current sample if None).
+        :param sample_name: Sample name (label of current sample if None).
+        :return: Stage context.
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT_
+        return self.__stage__(name, geometry_name, sample_name)
+
+    @contextmanager
+    def __stage__(
+            self,
+            name: str,
+            geometry_name: str | None,
+            sample_name: Any
+    ) -> Iterator[None]:
+        """
+        Stage context of enabled tracer.
+        :param name: Stage name.
+        :param geometry_name: Geometry name.
+        :param sample_name: Sample name.
+        """
+        labels = getattr(self.__local__, "labels", None) or ("", "")
+        geometry_name = labels[0] if geometry_name is None else geometry_name
+        sample_name = labels[1] if sample_name is None else str(sample_name)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            with self.__lock__:
+                self.__events__.append((name, geometry_name, sample_name, start, duration, threading.get_ident()))
+
+    def clear(self) -> None:
+        """
+        Clear recorded stages.
+        """
+        with self.__lock__:
+            self.__events__ = []
+
+    def get_chrome_trace(self) -> dict[str, Any]:
+        """
+        Get recorded stages as chrome trace (complete events).
+        :return: Chrome trace.
+        """
+        pid = os.getpid()
+        with self.__lock__:
+            events = list(self.__events__)
+        return {
+            "traceEvents": [{
+                "name": name,
+                "cat": geometry_name,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {"geometry": geometry_name, "sample": sample_name}
+            } for name, geometry_name, sample_name, start, duration, tid in events],
+            "displayTimeUnit": "ms"
+        }
+
+    def export_chrome_trace(
+            self,
+            file_path: str
+    ) -> None:
+        """
+        Export recorded stages as chrome trace json file.
+        :param file_path: Json file path.
+        """
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.get_chrome_trace(), file)
+
+    def get_percentiles(
+            self,
+            percentiles: tuple = (50, 90, 99)
+    ) -> dict[str, dict[str, dict[str, float]]]:
+        """
+        Get aggregated stage durations (in milliseconds) of each geometry.
+        :param percentiles: Percentiles of durations.
+        :return: Dict of geometry -> stage -> (count, mean, total and percentiles).
+        """
+        durations = {}
+        with self.__lock__:
+            for name, geometry_name, _, _, duration, _ in self.__events__:
+                durations.setdefault(geometry_name, {}).setdefault(name, []).append(duration / 1e6)
+
+        aggregation = {}
+        for geometry_name, stages in durations.items():
+            aggregation[geometry_name] = {}
+            for name, values in stages.items():
+                values = np.array(values)
+                stats = {"count": len(values), "mean": float(np.mean(values)), "total": float(np.sum(values))}
+                for percentile in percentiles:
+                    stats[f"p{percentile}"] = float(np.percentile(values, percentile))
+                aggregation[geometry_name][name] = stats
+        return aggregation
+
+    def export_percentiles(
+            self,
+            file_path: str,
+            percentiles: tuple = (50, 90, 99)
+    ) -> None:
+        """
+        Export aggregated stage durations of each geometry as json file.
+        :param file_path: Json file path.
+        :param percentiles: Percentiles of durations.
+        """
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(self.get_percentiles(percentiles), file, indent=2)
+
+
+NULL_TRACER = Tracer(enabled=False)